@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_spend(apps, schema_editor):
+    ExpenseRollup = apps.get_model('expenses', 'ExpenseRollup')
+    BudgetSpend = apps.get_model('budgets', 'BudgetSpend')
+    rows = ExpenseRollup.objects.values('user_id', 'month', 'category').annotate(spent=Sum('total')).order_by()
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(BudgetSpend(**row))
+        if len(batch) >= 1000:
+            BudgetSpend.objects.bulk_create(batch)
+            batch = []
+    BudgetSpend.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budgets', '0001_initial'),
+        ('expenses', '0003_expenserollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetAlertEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('month', models.DateField()),
+                ('threshold', models.PositiveSmallIntegerField()),
+                ('spent', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('budget', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='budgets.budget')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budget_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['delivered_at', 'created_at'], name='budgets_bud_deliver_1a41ed_idx')],
+                'unique_together': {('budget', 'month', 'threshold')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BudgetSpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('month', models.DateField()),
+                ('spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budget_spends', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'category', 'month')},
+            },
+        ),
+        migrations.RunPython(populate_spend, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+BATCH_SIZE = 1000
+
+
+def normalize(name):
+    return ' '.join((name or '').split()).casefold()[:100]
+
+
+def link_budgets(apps, schema_editor):
+    """
+    Point budgets at their Category and adopt its canonical name. Where a
+    user had budgets for spellings of the same category ("Food", "food")
+    with the same amount and currency, the oldest one is kept and takes
+    over the others' alert history. Differing duplicates stop the
+    migration with a list to resolve by hand, since picking one would drop
+    a user's figure.
+    """
+    Budget = apps.get_model('budgets', 'Budget')
+    BudgetAlertEvent = apps.get_model('budgets', 'BudgetAlertEvent')
+    BudgetSpend = apps.get_model('budgets', 'BudgetSpend')
+    Category = apps.get_model('expenses', 'Category')
+    ExpenseRollup = apps.get_model('expenses', 'ExpenseRollup')
+
+    kept, duplicates, conflicts = {}, {}, []
+    budgets = Budget.objects.order_by('user_id', 'created_at', 'id').only('id', 'user_id', 'category', 'amount', 'currency')
+    for budget in budgets.iterator(chunk_size=BATCH_SIZE):
+        key = (budget.user_id, normalize(budget.category))
+        first = kept.setdefault(key, budget)
+        if first is budget:
+            continue
+        if (budget.amount, budget.currency) != (first.amount, first.currency):
+            conflicts.append(
+                f"user {budget.user_id}: {first.category!r} ({first.amount} {first.currency}, budget {first.pk}) "
+                f"and {budget.category!r} ({budget.amount} {budget.currency}, budget {budget.pk})"
+            )
+        duplicates[budget.pk] = first.pk
+    if conflicts:
+        raise RuntimeError(
+            "Budgets for differently spelled categories with different amounts or currencies; "
+            "rename or delete one of each pair and migrate again:\n" + '\n'.join(conflicts)
+        )
+
+    for (user_id, normalized), budget in kept.items():
+        name = ' '.join(budget.category.split())[:100]
+        category, _ = Category.objects.get_or_create(user_id=user_id, normalized=normalized, defaults={'name': name})
+        Budget.objects.filter(pk=budget.pk).update(category=category.name, category_ref=category)
+
+    # Alerts move to the kept budget unless it already has the same one
+    for event in BudgetAlertEvent.objects.filter(budget_id__in=list(duplicates)).iterator(chunk_size=BATCH_SIZE):
+        target = duplicates[event.budget_id]
+        if not BudgetAlertEvent.objects.filter(budget_id=target, month=event.month, threshold=event.threshold).exists():
+            BudgetAlertEvent.objects.filter(pk=event.pk).update(budget_id=target)
+    pks = list(duplicates)
+    for start in range(0, len(pks), BATCH_SIZE):
+        Budget.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).delete()
+
+    # Spend follows the merged rollup categories
+    BudgetSpend.objects.all().delete()
+    rows = ExpenseRollup.objects.values('user_id', 'month', 'category').annotate(spent=Sum('total')).order_by()
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(BudgetSpend(**row))
+        if len(batch) >= BATCH_SIZE:
+            BudgetSpend.objects.bulk_create(batch)
+            batch = []
+    BudgetSpend.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budgets', '0002_budgetspend_budgetalertevent'),
+        ('expenses', '0008_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='budgets', to='expenses.category'),
+        ),
+        migrations.RunPython(link_budgets, migrations.RunPython.noop),
+    ]
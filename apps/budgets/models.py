@@ -5,7 +5,11 @@ import uuid
 class Budget(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='budgets')
+    # Canonical category name, kept in step with category_ref on write
     category = models.CharField(max_length=100)
+    category_ref = models.ForeignKey(
+        'expenses.Category', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='budgets'
+    )
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     currency = models.CharField(max_length=3, default='USD')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -17,3 +21,47 @@ class Budget(models.Model):
 
     def __str__(self):
         return f"{self.category}: {self.amount}"
+
+
+class BudgetSpend(models.Model):
+    """
+    Money spent per user, category and month, maintained from expense
+    writes (see apps.budgets.spend). Kept for every category, with or
+    without a budget, so a budget created mid-month starts out accurate.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='budget_spends')
+    category = models.CharField(max_length=100, blank=True, default='')
+    month = models.DateField()  # first day of the month
+    spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ['user', 'category', 'month']
+
+    def __str__(self):
+        return f"{self.category} {self.month:%Y-%m}: {self.spent}"
+
+
+class BudgetAlertEvent(models.Model):
+    """
+    Outbox of budget threshold crossings, at most one per budget, month and
+    threshold. Consumers pick up rows with no delivered_at and set it once
+    the alert has been sent.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='alerts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='budget_alerts')
+    month = models.DateField()
+    threshold = models.PositiveSmallIntegerField()  # percent of the budget
+    # Both in settings.BASE_CURRENCY
+    spent = models.DecimalField(max_digits=14, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['budget', 'month', 'threshold']
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['delivered_at', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.budget.category} {self.month:%Y-%m}: {self.threshold}%"
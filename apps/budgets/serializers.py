@@ -1,16 +1,36 @@
 from rest_framework import serializers
+from apps.common.profiling import TimedSerializerMixin
+from apps.expenses import categories
+from . import spend
 from .models import Budget
 
-class BudgetSerializer(serializers.ModelSerializer):
+class BudgetSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    # Spend for the month in context['month'] (default: the current month).
+    # spent and remaining are in BASE_CURRENCY; remaining and percent are
+    # null for a budget in a currency without a known rate. Neither is
+    # bounded by the model's digits (a 0.01 budget can be 10^8 % spent).
+    spent = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    remaining = serializers.DecimalField(max_digits=None, decimal_places=2, read_only=True, allow_null=True)
+    percent = serializers.DecimalField(max_digits=None, decimal_places=1, read_only=True, allow_null=True)
+
     class Meta:
         model = Budget
-        fields = ['id', 'category', 'amount', 'currency', 'created_at']
+        fields = ['id', 'category', 'amount', 'currency', 'spent', 'remaining', 'percent', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    def to_representation(self, instance):
+        # BudgetViewSet annotates `spent`; freshly saved instances look it up
+        if getattr(instance, 'spent', None) is None:
+            instance.spent = spend.spent_for(instance.user_id, instance.category, self.context.get('month'))
+        amount = spend.budget_in_base(instance, self.context.get('month'))
+        instance.remaining = amount - instance.spent if amount is not None else None
+        instance.percent = instance.spent * 100 / amount if amount else None
+        return super().to_representation(instance)
+
     def validate_category(self, value):
         user = self.context['request'].user
         # Check if budget for this category already exists for this user (excluding current instance if update)
-        qs = Budget.objects.filter(user=user, category=value)
+        qs = Budget.objects.filter(user_id=user.pk, category_ref__normalized=categories.normalize(value))
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -0,0 +1,30 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.common.cache import invalidate_user
+from apps.expenses import categories
+from . import spend
+from .models import Budget
+
+
+@receiver(pre_save, sender=Budget)
+def assign_budget_category(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    categories.assign([instance])
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+def invalidate_cached_budget_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_user(instance.user_id, 'budgets')
+
+
+@receiver(post_save, sender=Budget)
+def check_budget_thresholds(sender, instance, raw=False, **kwargs):
+    # A new or lowered budget can already be over a threshold this month
+    if raw:
+        return
+    spend.check_budget(instance)
@@ -0,0 +1,143 @@
+"""
+Maintenance of BudgetSpend and the budget alert outbox.
+
+Expense rollup deltas (apps.expenses.rollups) are folded into one amount
+per (user_id, month, category) and applied here with single-row UPDATEs,
+so "spent so far" is read from one row instead of aggregating expenses.
+
+When a write pushes a category's spend for the current (or a later) month
+across one of BUDGET_ALERT_THRESHOLDS percent of its budget, a
+BudgetAlertEvent is inserted. The unique (budget, month, threshold)
+constraint makes that idempotent: each threshold fires at most once per
+month, however often spend goes up and down around it. Months already in
+the past never alert, so importing an old statement stays quiet.
+
+Spend is in settings.BASE_CURRENCY, so budgets are converted with
+apps.currencies.rates (at the rate for the month) before comparing; a
+budget in a currency without a known rate raises no alerts.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from apps.currencies.rates import to_base
+
+from .models import Budget, BudgetAlertEvent, BudgetSpend
+
+
+def current_month():
+    return timezone.localdate().replace(day=1)
+
+
+def month_deltas(rollup_deltas):
+    """Fold rollup deltas keyed by (user_id, day, category) into per-month amounts."""
+    deltas = defaultdict(Decimal)
+    for (user_id, day, category), (amount, count) in rollup_deltas.items():
+        deltas[(user_id, day.replace(day=1), category)] += amount
+    return deltas
+
+
+def apply_deltas(deltas):
+    """Apply per-month spend deltas and record any thresholds crossed."""
+    for (user_id, month, category), amount in deltas.items():
+        if not amount:
+            continue
+        with transaction.atomic():
+            spent = _apply_one(user_id, month, category, amount)
+            if amount > 0 and month >= current_month():
+                budget = Budget.objects.filter(user_id=user_id, category=category).first()
+                if budget is not None:
+                    record_alerts(budget, month, spent - amount, spent)
+
+
+def _apply_one(user_id, month, category, amount):
+    rows = BudgetSpend.objects.filter(user_id=user_id, month=month, category=category)
+    if not rows.update(spent=F('spent') + amount):
+        if amount <= 0:
+            # Nothing to subtract from; the table is out of sync and needs a rebuild.
+            return None
+        try:
+            with transaction.atomic():
+                BudgetSpend.objects.create(user_id=user_id, month=month, category=category, spent=amount)
+            return amount
+        except IntegrityError:
+            # Created concurrently by another writer
+            rows.update(spent=F('spent') + amount)
+    return rows.values_list('spent', flat=True).first()
+
+
+def spent_for(user_id, category, month=None):
+    month = month or current_month()
+    spent = (
+        BudgetSpend.objects
+        .filter(user_id=user_id, category=category, month=month)
+        .values_list('spent', flat=True)
+        .first()
+    )
+    return spent or Decimal('0')
+
+
+def budget_in_base(budget, month=None):
+    """The budget's amount in BASE_CURRENCY for `month`, or None when no rate is known."""
+    return to_base(budget.amount, budget.currency, month or current_month())
+
+
+def record_alerts(budget, month, previous, spent):
+    """
+    Insert an alert event for every threshold reached by `spent` but not by
+    `previous`. Pass previous=None to consider every threshold reached.
+    Returns the number of thresholds that qualified.
+    """
+    amount = budget_in_base(budget, month)
+    if amount is None or amount <= 0:
+        return 0
+    events = []
+    for threshold in settings.BUDGET_ALERT_THRESHOLDS:
+        limit = amount * threshold / 100
+        if spent >= limit and (previous is None or previous < limit):
+            events.append(BudgetAlertEvent(
+                budget=budget, user_id=budget.user_id, month=month,
+                threshold=threshold, spent=spent, amount=amount,
+            ))
+    BudgetAlertEvent.objects.bulk_create(events, ignore_conflicts=True)
+    return len(events)
+
+
+def check_budget(budget):
+    """Record alerts for a new or changed budget against this month's spend."""
+    month = current_month()
+    return record_alerts(budget, month, None, spent_for(budget.user_id, budget.category, month))
+
+
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recompute BudgetSpend from the expense rollup table. Returns the number
+    of rows written.
+    """
+    from apps.expenses.models import ExpenseRollup
+
+    written = 0
+    with transaction.atomic():
+        existing = BudgetSpend.objects.all()
+        rollups = ExpenseRollup.objects.all()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+            rollups = rollups.filter(user_id__in=user_ids)
+        existing.delete()
+
+        rows = rollups.values('user_id', 'month', 'category').annotate(spent=Sum('total')).order_by()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(BudgetSpend(**row))
+            if len(batch) >= batch_size:
+                BudgetSpend.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            BudgetSpend.objects.bulk_create(batch)
+            written += len(batch)
+    return written
@@ -0,0 +1,53 @@
+import importlib
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from apps.budgets.models import Budget, BudgetAlertEvent, BudgetSpend
+from apps.expenses.models import Expense
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+link_budgets = importlib.import_module('apps.budgets.migrations.0003_budget_category_ref').link_budgets
+
+@pytest.mark.django_db
+class TestLinkBudgets:
+    def setup_method(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password123')
+        Expense.objects.create(user=self.user, title='Lunch', amount=12, category='Food', expense_date=date(2023, 10, 1))
+
+    def budgets(self, *rows):
+        # bulk_create skips the signals that would link categories up front
+        return Budget.objects.bulk_create([
+            Budget(user=self.user, category=category, amount=Decimal(amount), currency=currency)
+            for category, amount, currency in rows
+        ])
+
+    def alert(self, budget, threshold):
+        return BudgetAlertEvent.objects.create(
+            budget=budget, user=self.user, month=date(2023, 10, 1), threshold=threshold, spent=12, amount=budget.amount,
+        )
+
+    def test_identical_duplicates_are_merged_with_their_alerts(self):
+        kept, duplicate = self.budgets(('Food', '100', 'USD'), (' food ', '100', 'USD'))
+        self.alert(kept, 50)
+        self.alert(duplicate, 50)
+        moved = self.alert(duplicate, 80)
+
+        link_budgets(apps, None)
+
+        assert list(Budget.objects.values_list('pk', 'category')) == [(kept.pk, 'Food')]
+        assert Budget.objects.get().category_ref.normalized == 'food'
+        assert sorted(kept.alerts.values_list('threshold', flat=True)) == [50, 80]
+        assert BudgetAlertEvent.objects.get(pk=moved.pk).budget_id == kept.pk
+        assert BudgetSpend.objects.get(user=self.user, category='Food').spent == Decimal('12')
+
+    def test_differing_duplicates_stop_the_migration(self):
+        self.budgets(('Food', '100', 'USD'), ('food', '250', 'USD'), ('Rent', '900', 'USD'), ('RENT', '900', 'EUR'))
+        with pytest.raises(RuntimeError) as excinfo:
+            link_budgets(apps, None)
+        message = str(excinfo.value)
+        assert "'Food' (100.00 USD" in message and "'food' (250.00 USD" in message
+        assert "'RENT' (900.00 EUR" in message
+        assert Budget.objects.count() == 4
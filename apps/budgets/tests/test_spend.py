@@ -0,0 +1,146 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.budgets.models import Budget, BudgetAlertEvent, BudgetSpend
+from apps.budgets import spend
+from apps.currencies.models import ExchangeRate
+from apps.currencies.rates import rate_cache
+from apps.expenses.models import Expense
+from apps.expenses import rollups
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestBudgetSpend:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.today = timezone.localdate()
+        self.month = self.today.replace(day=1)
+
+    def spent(self, category='Food', month=None):
+        return BudgetSpend.objects.get(user=self.user, category=category, month=month or self.month).spent
+
+    def add(self, amount, category='Food', expense_date=None):
+        return Expense.objects.create(
+            user=self.user, title='Item', amount=amount, category=category, expense_date=expense_date or self.today
+        )
+
+    def thresholds(self, budget):
+        return sorted(budget.alerts.values_list('threshold', flat=True))
+
+    def test_spend_follows_expense_writes(self):
+        lunch = self.add(10)
+        self.add('5.50')
+        assert self.spent() == Decimal('15.50')
+
+        lunch.category = 'Travel'
+        lunch.save()
+        assert self.spent() == Decimal('5.50')
+        assert self.spent('Travel') == Decimal('10.00')
+
+        lunch.delete()
+        assert self.spent('Travel') == Decimal('0.00')
+
+        # rebuild produces the same figures from the rollup table
+        rollups.rebuild()
+        assert not BudgetSpend.objects.filter(category='Travel').exists()
+        assert self.spent() == Decimal('5.50')
+
+    def test_budget_endpoints_expose_spent_remaining_and_percent(self):
+        budget = Budget.objects.create(user=self.user, category='Food', amount=200)
+        self.add(50)
+        self.add(30, expense_date=date(2020, 1, 15))
+
+        data = self.client.get(reverse('budget-list')).data[0]
+        assert (data['spent'], data['remaining'], data['percent']) == ('50.00', '150.00', '25.0')
+
+        data = self.client.get(reverse('budget-detail', args=[budget.pk]), {'month': '2020-01'}).data
+        assert (data['spent'], data['remaining'], data['percent']) == ('30.00', '170.00', '15.0')
+
+        assert self.client.get(reverse('budget-list'), {'month': 'January'}).status_code == status.HTTP_400_BAD_REQUEST
+
+        # Freshly created budgets report spend too
+        response = self.client.post(reverse('budget-list'), {'category': 'Food2', 'amount': '10.00'})
+        assert response.data['spent'] == '0.00'
+
+    def test_crossing_thresholds_records_alerts_once(self, settings):
+        settings.BUDGET_ALERT_THRESHOLDS = [50, 80, 100]
+        budget = Budget.objects.create(user=self.user, category='Food', amount=100)
+
+        self.add(40)
+        assert self.thresholds(budget) == []
+        expense = self.add(45)
+        assert self.thresholds(budget) == [50, 80]
+
+        # Dropping below and crossing again does not repeat an alert
+        expense.delete()
+        self.add(70)
+        assert self.thresholds(budget) == [50, 80, 100]
+        event = budget.alerts.get(threshold=100)
+        assert (event.month, event.spent, event.amount, event.delivered_at) == (self.month, Decimal('110.00'), Decimal('100.00'), None)
+
+        # Spend in past months never alerts
+        self.add(500, category='Travel', expense_date=date(2020, 1, 1))
+        travel = Budget.objects.create(user=self.user, category='Travel', amount=100)
+        assert self.thresholds(travel) == []
+
+    def test_budgets_in_another_currency_are_converted(self):
+        rate_cache.clear()
+        ExchangeRate.objects.create(currency='JPY', date=date(2020, 1, 1), rate=Decimal('0.01'))
+        budget = Budget.objects.create(user=self.user, category='Food', amount=10000, currency='JPY')
+        self.add(50)
+        assert self.thresholds(budget) == [50]
+        assert budget.alerts.get().amount == Decimal('100.00')
+
+        data = self.client.get(reverse('budget-detail', args=[budget.pk])).data
+        assert (data['amount'], data['spent'], data['remaining'], data['percent']) == ('10000.00', '50.00', '50.00', '50.0')
+
+        # Without a rate there is nothing to compare against
+        travel = Budget.objects.create(user=self.user, category='Travel', amount=100, currency='GBP')
+        self.add(500, category='Travel')
+        assert self.thresholds(travel) == []
+        data = self.client.get(reverse('budget-detail', args=[travel.pk])).data
+        assert (data['spent'], data['remaining'], data['percent']) == ('500.00', None, None)
+
+    def test_extreme_overspend_renders(self):
+        Budget.objects.create(user=self.user, category='Food', amount='0.01')
+        self.add('999999999999.99')
+
+        response = self.client.get(reverse('budget-list'))
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data[0]
+        assert (data['remaining'], data['percent']) == ('-999999999999.98', '9999999999999900.0')
+
+    def test_lowering_a_budget_can_cross_thresholds(self):
+        budget = Budget.objects.create(user=self.user, category='Food', amount=1000)
+        self.add(90)
+        assert self.thresholds(budget) == []
+
+        budget.amount = 100
+        budget.save()
+        assert self.thresholds(budget) == [50, 80]
+
+    def test_bulk_writes_update_spend_once_per_month(self):
+        Budget.objects.create(user=self.user, category='Food', amount=100)
+        rows = [{'title': f'Item {i}', 'amount': '10.00', 'expense_date': self.today.isoformat(), 'category': 'Food'} for i in range(12)]
+        response = self.client.post(reverse('expense-bulk'), rows, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert self.spent() == Decimal('120.00')
+        assert BudgetAlertEvent.objects.count() == 3
+        assert spend.spent_for(self.user.pk, 'Food') == Decimal('120.00')
+
+    def test_deleting_a_user_with_expenses_and_budgets(self):
+        Budget.objects.create(user=self.user, category='Food', amount=100)
+        self.add(60)
+        self.add(20, category='Travel')
+
+        self.user.delete()
+        assert not BudgetSpend.objects.exists()
+        assert not Expense.objects.exists()
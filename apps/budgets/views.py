@@ -1,16 +1,58 @@
+from decimal import Decimal
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from apps.common.cache import cached_response
+from apps.common.fieldsets import SparseFieldsMixin
 from apps.common.permissions import IsEmailVerified
-from .models import Budget
+from apps.expenses.summary import parse_month
+from apps.users.authentication import UserScopedJWTAuthentication
+from .models import Budget, BudgetSpend
 from .serializers import BudgetSerializer
+from .spend import current_month
 
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    """
+    Budgets with spend for the current month, or for ?month=YYYY-MM.
+    ?fields=... narrows the response to the named fields.
+    """
     serializer_class = BudgetSerializer
+    # BudgetSerializer derives remaining and percent from it
+    sparse_fields_required = ('amount',)
+    authentication_classes = [UserScopedJWTAuthentication]
     permission_classes = [IsAuthenticated, IsEmailVerified]
     pagination_class = None
-    
+
+    def get_month(self):
+        try:
+            return parse_month(self.request.query_params.get('month')) or current_month()
+        except ValueError:
+            raise ValidationError({'month': ['Invalid month format. Use YYYY-MM']})
+
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user)
+        spent = BudgetSpend.objects.filter(
+            user_id=OuterRef('user_id'), category=OuterRef('category'), month=self.get_month()
+        ).values('spent')[:1]
+        return Budget.objects.filter(user_id=self.request.user.pk).annotate(
+            spent=Coalesce(Subquery(spent), Value(Decimal('0')))
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if 'request' in context and self.request.user.is_authenticated:
+            context['month'] = self.get_month()
+        return context
+
+    # Spend changes with every expense write, so responses depend on both
+    @cached_response('budgets', 'expenses')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response('budgets', 'expenses')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
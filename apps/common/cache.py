@@ -0,0 +1,137 @@
+"""
+Per-user response caching with write-driven invalidation.
+
+Every user has a version stamp per namespace (e.g. "expenses",
+"budgets") kept in the RESPONSE_CACHE_ALIAS cache. Model signals bump the
+stamp on every write, which changes the ETag and cache key of every
+response depending on that namespace, so stale entries are never read
+and simply expire. Stamps are the bump time in nanoseconds. Responses
+carry only an ETag: a Last-Modified value has whole-second precision, so
+a write in the same second as a read would still look unmodified to a
+client revalidating with If-Modified-Since.
+
+The stamps must live in a cache shared by every process that writes
+(file or Redis). With a per-process backend such as locmem, a write in
+another worker or in a management command never reaches this process's
+stamps, and it serves stale responses (and 304s) for up to
+RESPONSE_CACHE_TIMEOUT; that is only safe with a single worker and no
+out-of-process writers, e.g. in tests.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import make_etag, not_modified, set_validators
+
+_deferred = ContextVar('user_cache_deferred', default=None)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _version_key(namespace, user_id):
+    return f'user-version:{namespace}:{user_id}'
+
+
+def get_versions(user_id, namespaces):
+    cache = get_cache()
+    keys = {namespace: _version_key(namespace, user_id) for namespace in namespaces}
+    found = cache.get_many(keys.values())
+    missing = [key for key in keys.values() if key not in found]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        found.update(cache.get_many(missing))
+    return {namespace: found.get(key, 0) for namespace, key in keys.items()}
+
+
+def _bump(pairs):
+    now = time.time_ns()
+    get_cache().set_many({_version_key(namespace, user_id): now for user_id, namespace in pairs}, timeout=None)
+
+
+def invalidate_user(user_id, *namespaces):
+    """
+    Bump the user's version for each namespace. The bump is repeated after
+    the surrounding transaction commits, so a response computed from
+    not-yet-committed data can't stay cached under the new version.
+    """
+    pairs = {(user_id, namespace) for namespace in namespaces}
+    pending = _deferred.get()
+    if pending is not None:
+        pending.update(pairs)
+        return
+    _bump(pairs)
+    transaction.on_commit(lambda: _bump(pairs))
+
+
+@contextmanager
+def deferred_invalidation():
+    """Coalesce invalidations issued inside the block into one bump per user and namespace."""
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    if pending:
+        _bump(pending)
+        transaction.on_commit(lambda: _bump(pending))
+
+
+def response_validators(user_id, namespaces, scope, path):
+    """
+    The ETag and cache key of a cached response for `user_id`, as used by
+    cached_response; `scope` names the view.
+    """
+    versions = get_versions(user_id, namespaces)
+    etag = make_etag(scope, path, sorted(versions.items()))
+    return etag, f'user-response:{user_id}:{etag}'
+
+
+def cached_response(*namespaces, timeout=None):
+    """
+    Cache a view method's successful response data per user, keyed by the
+    request path and the user's namespace versions. Conditional requests
+    (If-None-Match) get a 304 without touching the
+    database. The namespaces are kept on the wrapper as `cache_namespaces`.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            user_id = request.user.pk
+            etag, key = response_validators(
+                user_id, namespaces, f"{type(view).__name__}.{method.__name__}", request.get_full_path()
+            )
+
+            response = not_modified(request, etag)
+            if response is None:
+                cache = get_cache()
+                data = cache.get(key)
+                if data is not None:
+                    response = Response(data)
+                else:
+                    response = method(view, request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    cache.set(
+                        key, response.data,
+                        timeout=settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout,
+                    )
+
+            return set_validators(response, etag)
+        wrapper.cache_namespaces = namespaces
+        return wrapper
+    return decorator
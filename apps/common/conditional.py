@@ -0,0 +1,83 @@
+"""
+Conditional GET (ETag / Last-Modified) helpers.
+
+`ConditionalListMixin` and `ConditionalRetrieveMixin` derive validators
+for user-scoped querysets from max(updated_at) and the row count, using a
+single aggregate query and no serialization, so a client polling an
+unchanged resource gets a 304 for the cost of that query.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304 response if the request's validators match, else None."""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Per-user data: never share through proxies, always revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value is not None else None
+
+
+class ConditionalListMixin:
+    validator_field = 'updated_at'
+
+    def use_conditional_list(self, request):
+        return True
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_conditional_list(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.aggregate(last_modified=Max(self.validator_field), count=Count('pk'))
+        etag = make_etag(request.get_full_path(), stats['last_modified'], stats['count'])
+        last_modified = _timestamp(stats['last_modified'])
+
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+
+class ConditionalRetrieveMixin:
+    validator_field = 'updated_at'
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            changed = (
+                self.get_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list(self.validator_field, flat=True)
+                .first()
+            )
+        except (KeyError, TypeError, ValueError, ValidationError):
+            changed = None
+        if changed is None:
+            # Unknown or malformed id: let the regular path produce the error
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(request.get_full_path(), changed)
+        last_modified = _timestamp(changed)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
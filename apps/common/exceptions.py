@@ -6,11 +6,12 @@ def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
     if response is not None:
+        detail = response.data.get("detail") if isinstance(response.data, dict) else None
         custom_response_data = {
             "success": False,
             "error": {
                 "code": response.status_code,
-                "message": response.data.get("detail", "An error occurred"),
+                "message": detail or "An error occurred",
                 "details": response.data
             }
         }
@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets: `?fields=id,amount,expense_date` on list and retrieve.
+
+The response keeps only the named serializer fields, in the serializer's
+own order, and the query loads only the model columns behind them plus
+the view's `sparse_fields_required` (columns the view itself reads, such
+as pagination keys): through only() for model serializers, and through
+the column list of a ValuesSerializer. Unknown names are rejected with a
+400. Other actions ignore the parameter.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ('list', 'retrieve')
+
+
+def parse_fields(raw, serializer_class, param='fields'):
+    """Return the requested readable field names in serializer order, or None if `raw` is None."""
+    if raw is None:
+        return None
+    readable = [field.field_name for field in serializer_class()._readable_fields]
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = sorted(names.difference(readable))
+    if unknown:
+        raise ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(readable)}."]})
+    if not names:
+        raise ValidationError({param: ['Name at least one field.']})
+    return [name for name in readable if name in names]
+
+
+class SparseFieldsMixin:
+    fields_query_param = 'fields'
+    sparse_fields_required = ()
+
+    def get_sparse_fields(self):
+        """The field names requested with `fields=`, or None for all of them."""
+        if self.action not in SPARSE_ACTIONS or self.request is None:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = parse_fields(
+                self.request.query_params.get(self.fields_query_param),
+                self.get_serializer_class(),
+                self.fields_query_param,
+            )
+        return self._sparse_fields
+
+    def filter_queryset(self, queryset):
+        # Rather than get_queryset(), which views usually override themselves
+        queryset = super().filter_queryset(queryset)
+        names = self.get_sparse_fields()
+        if names is None:
+            return queryset
+        serializer_fields = self.get_serializer_class()().fields
+        columns = []
+        for source in [serializer_fields[name].source for name in names] + list(self.sparse_fields_required):
+            try:
+                queryset.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue  # annotations and computed fields
+            columns.append(source)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        names = self.get_sparse_fields()
+        if names is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in [name for name in fields if name not in names]:
+                del fields[name]
+        return serializer
+
+    def get_values_serializer(self):
+        values_serializer = super().get_values_serializer()
+        names = self.get_sparse_fields()
+        if names is None:
+            return values_serializer
+        return values_serializer.restrict(names, keep=self.sparse_fields_required)
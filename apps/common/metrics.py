@@ -0,0 +1,84 @@
+"""
+Prometheus metrics, exposed at /metrics.
+
+Request counts and latencies are labelled with the URL route pattern
+(e.g. "api/expenses/<pk>/"), never the raw path, so label cardinality
+stays bounded. Scrapes only read metric values: the endpoint doesn't
+authenticate through DRF or touch the database.
+
+Under gunicorn, every worker has its own values. Set
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers (see
+config/gunicorn.py). prometheus_client then keeps the values in
+mmap-backed files there, and any worker answering a scrape aggregates
+them all.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.utils.deprecation import MiddlewareMixin
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests by route, method and status.', ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route and method.', ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_CHECKOUT = Histogram(
+    'db_connection_checkout_seconds', 'Time to obtain a usable database connection for a request.',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+EXPORTS = Counter('expense_exports_total', 'CSV expense exports started.')
+SIGNUPS = Counter('user_signups_total', 'Accounts created through signup.')
+
+
+def exempt(view):
+    """Mark a view as not needing a database connection, so no checkout is timed for it."""
+    view.metrics_exempt = True
+    return view
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        request._metrics_start = time.perf_counter()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, 'metrics_exempt', False):
+            return None
+        # Opens the connection, or health-checks a persistent one; the view's queries reuse it
+        connection = connections['default']
+        start = time.perf_counter()
+        connection.ensure_connection()
+        DB_CHECKOUT.observe(time.perf_counter() - start)
+        return None
+
+    def process_response(self, request, response):
+        start = getattr(request, '_metrics_start', None)
+        if start is not None:
+            match = request.resolver_match
+            route = match.route if match is not None else 'unmatched'
+            REQUESTS.labels(route, request.method, response.status_code).inc()
+            REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - start)
+        return response
+
+
+@exempt
+def metrics_view(request):
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+            return HttpResponseForbidden()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
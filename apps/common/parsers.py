@@ -0,0 +1,37 @@
+"""
+JSON request parsing with orjson.
+
+`ORJSONParser` accepts and rejects the same documents as DRF's JSONParser
+in strict mode (STRICT_JSON: no NaN or Infinity) and raises the same
+ParseError; integers beyond 64 bits are read as floats. Bodies in a
+charset other than UTF-8, and the non-strict setting, are left to
+JSONParser.
+"""
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+def is_utf8(encoding):
+    try:
+        return codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or not is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
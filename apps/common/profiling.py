@@ -0,0 +1,226 @@
+"""
+Per-view request profiling.
+
+ProfilingMiddleware records, for every request that resolves to a view,
+the number of SQL queries, the time spent in SQL, the time spent in
+serializers using TimedSerializerMixin, and the total latency. Each
+metric goes into a fixed-bucket histogram per "METHOD view-name", so
+memory stays bounded whatever the traffic: at most
+REQUEST_PROFILING_MAX_VIEWS keys are tracked, and later ones are folded
+into "other". Streaming responses are measured until the response object
+is returned, not until the body is sent.
+
+SQL is timed by an execute wrapper that reports to the current request's
+profile. Under ASGI, views and ORM calls run in sync_to_async threads with
+their own connections, so the wrapper is installed from a request_started
+receiver, which Django runs in the same thread as the request's
+thread-sensitive work, rather than from the middleware itself.
+
+Figures are per process: each worker keeps its own histograms, read by
+the staff-only /api/health/profile/ endpoint. With
+REQUEST_PROFILING_SERVER_TIMING the same figures are also sent back in a
+Server-Timing header.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_started
+from django.db import connections
+
+# Histogram bucket upper bounds; values above the last one go in an overflow bucket
+MILLISECOND_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BOUNDS = (0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 100)
+
+_current = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper that times queries run for a profiled request."""
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_wrappers(**kwargs):
+    """Add record_query to this thread's connections, once each."""
+    for connection in connections.all():
+        if record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th value (the maximum for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            'mean': round(self.sum / self.count, 2) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': round(self.max, 2),
+        }
+
+
+class ViewStats:
+    def __init__(self):
+        self.latency_ms = Histogram(MILLISECOND_BOUNDS)
+        self.sql_ms = Histogram(MILLISECOND_BOUNDS)
+        self.serializer_ms = Histogram(MILLISECOND_BOUNDS)
+        self.queries = Histogram(QUERY_BOUNDS)
+
+    def observe(self, profile, seconds):
+        self.latency_ms.observe(seconds * 1000)
+        self.sql_ms.observe(profile.sql_seconds * 1000)
+        self.serializer_ms.observe(profile.serializer_seconds * 1000)
+        self.queries.observe(profile.queries)
+
+    def as_dict(self):
+        return {
+            'requests': self.latency_ms.count,
+            'latency_ms': self.latency_ms.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'serializer_ms': self.serializer_ms.as_dict(),
+            'queries': self.queries.as_dict(),
+        }
+
+
+class Registry:
+    def __init__(self, max_views=200):
+        self.max_views = max_views
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key, profile, seconds):
+        with self._lock:
+            stats = self._views.get(key)
+            if stats is None:
+                if len(self._views) >= self.max_views:
+                    key = 'other'
+                stats = self._views.setdefault(key, ViewStats())
+            stats.observe(profile, seconds)
+
+    def report(self):
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in sorted(self._views.items())}
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = Registry(settings.REQUEST_PROFILING_MAX_VIEWS)
+
+
+class TimedSerializerMixin:
+    """Add serializer time to the current request's profile. Nested and per-item calls are counted once."""
+
+    def to_representation(self, instance):
+        profile = _current.get()
+        if profile is None or profile._serializer_depth:
+            return super().to_representation(instance)
+        profile._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            profile.serializer_seconds += time.perf_counter() - start
+            profile._serializer_depth -= 1
+
+
+def server_timing(profile, seconds):
+    return ', '.join([
+        f'db;dur={profile.sql_seconds * 1000:.1f};desc="{profile.queries} queries"',
+        f'ser;dur={profile.serializer_seconds * 1000:.1f}',
+        f'total;dur={seconds * 1000:.1f}',
+    ])
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        request_started.connect(install_query_wrappers, dispatch_uid='profiling_query_wrappers')
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, profile, start)
+
+    async def __acall__(self, request):
+        profile, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, profile, start)
+
+    def start(self):
+        profile = RequestProfile()
+        return profile, _current.set(profile), time.perf_counter()
+
+    def finish(self, request, response, profile, start):
+        seconds = time.perf_counter() - start
+        match = request.resolver_match
+        if match is not None:
+            registry.observe(f'{request.method} {match.view_name}', profile, seconds)
+        if settings.REQUEST_PROFILING_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(profile, seconds)
+        return response
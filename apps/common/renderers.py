@@ -0,0 +1,37 @@
+"""
+JSON rendering with orjson.
+
+`ORJSONRenderer` produces the same bytes as DRF's JSONRenderer with this
+project's settings (compact, UTF-8, U+2028/U+2029 escaped, "Z" for UTC
+datetimes) several times faster. Types orjson has no native encoding for
+(Decimal, lazy strings, querysets, ...) go through DRF's own encoder.
+Indented output, non-compact or ASCII-only settings and values orjson
+rejects, such as integers beyond 64 bits, are rendered by JSONRenderer
+instead. One difference remains: a NaN or infinite float becomes null
+rather than an error.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class ORJSONRenderer(JSONRenderer):
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same as JSONRenderer: valid JSON, but not valid JavaScript unescaped
+        if b'\xe2\x80' in ret:
+            for raw, escaped in LINE_SEPARATORS:
+                ret = ret.replace(raw, escaped)
+        return ret
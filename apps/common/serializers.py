@@ -0,0 +1,148 @@
+"""
+Read-only fast path for listing through a ModelSerializer.
+
+`ValuesSerializer` reads rows with `values_list()` instead of building
+model instances, and converts each column with a function chosen once per
+serializer: `str` for UUIDs and text, a preset quantize for decimals and
+`isoformat()` for dates and datetimes, exactly as the DRF fields do.
+Its output is equal to `serializer_class(rows, many=True).data`, so the
+rendered JSON is byte-for-byte the same; fields it has no shortcut for
+fall back to their own `to_representation()`.
+
+Only serializers whose readable fields are plain model fields qualify.
+"""
+import copy
+import decimal
+from functools import cached_property, partial
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+
+def _fixed(convert):
+    return lambda: convert
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return _fixed(field.to_representation)
+
+    quantum = decimal.Decimal(1).scaleb(-field.decimal_places)
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+        return f'{value.quantize(quantum, rounding=rounding, context=context):f}'
+    return _fixed(convert)
+
+
+def _datetime_converter(field):
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT).lower() != ISO_8601:
+        return _fixed(field.to_representation)
+
+    def convert(value, field_timezone):
+        if field_timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(field_timezone)
+        else:
+            value = field.enforce_timezone(value)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    # Looking the timezone up per value (as enforce_timezone does) costs
+    # more than the conversion; it is fixed for the duration of a request
+    return lambda: partial(
+        convert, field_timezone=field.timezone if hasattr(field, 'timezone') else field.default_timezone(),
+    )
+
+
+def converter_for(field):
+    """
+    Return a function that gives the converter for one batch of rows: a
+    function turning a non-null database value into `field`'s representation.
+    """
+    kind = type(field)
+    if kind is serializers.CharField:
+        return _fixed(str)
+    if kind is serializers.UUIDField and field.uuid_format == 'hex_verbose':
+        return _fixed(str)
+    if kind is serializers.DecimalField:
+        return _decimal_converter(field)
+    if kind is serializers.DateField and getattr(field, 'format', api_settings.DATE_FORMAT).lower() == ISO_8601:
+        return _fixed(lambda value: value.isoformat())
+    if kind is serializers.DateTimeField:
+        return _datetime_converter(field)
+    return _fixed(field.to_representation)
+
+
+class ValuesSerializer:
+    serializer_class = None
+    # Columns fetched for the caller's own use (e.g. pagination), not serialized
+    extra_sources = ()
+
+    def __init__(self, serializer_class=None):
+        if serializer_class is not None:
+            self.serializer_class = serializer_class
+
+    @cached_property
+    def columns(self):
+        """(name, source, converter_for(field)) for each readable field, in output order."""
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        columns = []
+        for field in serializer._readable_fields:
+            try:
+                model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f'{self.serializer_class.__name__}.{field.field_name} is not a plain model field; '
+                    f'it cannot be listed with {type(self).__name__}.'
+                )
+            columns.append((field.field_name, field.source, converter_for(field)))
+        return columns
+
+    def restrict(self, names, keep=()):
+        """A copy serializing only the fields in `names`, that still fetches the `keep` columns."""
+        restricted = copy.copy(self)
+        restricted.columns = [column for column in self.columns if column[0] in names]
+        sources = {source for _, source, _ in restricted.columns}
+        restricted.extra_sources = [source for source in keep if source not in sources]
+        return restricted
+
+    def values(self, queryset):
+        """Rows of `queryset` as named tuples of the serialized columns, then `extra_sources`."""
+        sources = [source for _, source, _ in self.columns]
+        return queryset.values_list(*sources, *self.extra_sources, named=True)
+
+    def to_representation(self, rows):
+        converters = [(name, converter()) for name, _, converter in self.columns]
+        # zip() stops at the last serialized column, before any extra sources
+        return [
+            {name: None if value is None else convert(value) for (name, convert), value in zip(converters, row)}
+            for row in rows
+        ]
+
+
+class ValuesListMixin:
+    """`list()` for a viewset, paginated as usual but serialized through `values_serializer`."""
+    values_serializer = None
+
+    def get_values_serializer(self):
+        return self.values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        rows = values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.to_representation(page))
+        return Response(values_serializer.to_representation(rows))
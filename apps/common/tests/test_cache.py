@@ -0,0 +1,63 @@
+import time
+import pytest
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.budgets.models import Budget
+from apps.expenses.models import Expense
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestUserResponseCache:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.summary_url = reverse('expense-summary')
+        self.budgets_url = reverse('budget-list')
+
+    def test_summary_is_served_from_cache_until_a_write(self, django_assert_num_queries):
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1), category='Food')
+        first = self.client.get(self.summary_url)
+        assert first.data['total_spend'] == Decimal('10')
+
+        with django_assert_num_queries(0):
+            cached = self.client.get(self.summary_url)
+        assert cached.data == first.data
+        assert cached['ETag'] == first['ETag']
+
+        Expense.objects.create(user=self.user, title='Dinner', amount=5, expense_date=date(2023, 10, 1), category='Food')
+        fresh = self.client.get(self.summary_url)
+        assert fresh.data['total_spend'] == Decimal('15')
+        assert fresh['ETag'] != first['ETag']
+
+        # Budget writes invalidate the summary too
+        Budget.objects.create(user=self.user, category='Travel', amount=100)
+        assert self.client.get(self.summary_url)['ETag'] != fresh['ETag']
+
+    def test_conditional_requests_get_304(self):
+        first = self.client.get(self.budgets_url)
+        assert first.status_code == status.HTTP_200_OK
+        assert 'private' in first['Cache-Control']
+
+        response = self.client.get(self.budgets_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # No whole-second Last-Modified, so a write in the same second can't be missed
+        assert 'Last-Modified' not in first
+        Budget.objects.create(user=self.user, category='Food', amount=100)
+        response = self.client.get(self.budgets_url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(self.budgets_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_cache_is_per_user(self):
+        other = User.objects.create_user(email='other@example.com', password='password123', is_email_verified=True)
+        Budget.objects.create(user=other, category='Food', amount=100)
+        assert self.client.get(self.budgets_url).data == []
@@ -0,0 +1,64 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.budgets.models import Budget
+from apps.expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse('expense-list')
+        self.expense = Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1))
+
+    def test_expense_list_304_costs_one_query(self, django_assert_num_queries):
+        first = self.client.get(self.list_url)
+        assert first.status_code == status.HTTP_200_OK
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # Validators are per query string
+        response = self.client.get(self.list_url, {'category': 'Food'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_expense_list_validator_changes_on_update_and_delete(self):
+        first = self.client.get(self.list_url)
+        self.expense.title = 'Brunch'
+        self.expense.save()
+        updated = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert updated.status_code == status.HTTP_200_OK
+
+        self.expense.delete()
+        deleted = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=updated['ETag'])
+        assert deleted.status_code == status.HTTP_200_OK
+        assert deleted.data['count'] == 0
+
+    def test_detail_endpoints(self):
+        url = reverse('expense-detail', args=[self.expense.pk])
+        first = self.client.get(url)
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == status.HTTP_304_NOT_MODIFIED
+        assert self.client.get(reverse('expense-detail', args=['nope'])).status_code == status.HTTP_404_NOT_FOUND
+
+        budget = Budget.objects.create(user=self.user, category='Food', amount=100)
+        url = reverse('budget-detail', args=[budget.pk])
+        first = self.client.get(url)
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_me(self):
+        url = reverse('me')
+        first = self.client.get(url)
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.user.theme_preference = 'dark'
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code == status.HTTP_200_OK
@@ -0,0 +1,73 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.budgets.models import Budget
+from apps.expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+
+def selected_columns(queries, table):
+    """SELECT lists of the captured queries reading `table`."""
+    return [
+        query['sql'].split(' FROM ')[0] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        for day in range(1, 4):
+            Expense.objects.create(user=self.user, title=f'Item {day}', amount=day * 10, expense_date=date(2023, 10, day),
+                                   category='Food', notes='x' * 2000)
+        self.expense = Expense.objects.get(title='Item 1')
+        Budget.objects.create(user=self.user, category='Food', amount=100)
+
+    def test_expense_list_selects_and_returns_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('expense-list'), {'fields': 'expense_date,amount,id'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0] == {'id': str(Expense.objects.get(title='Item 3').pk), 'amount': '30.00', 'expense_date': '2023-10-03'}
+        page_query = selected_columns(queries, 'expenses_expense')[-1]
+        assert '"amount"' in page_query and '"notes"' not in page_query and '"title"' not in page_query
+
+    def test_keyset_pages_work_without_the_cursor_fields(self):
+        url = reverse('expense-list')
+        first = self.client.get(url, {'fields': 'amount', 'pagination': 'cursor', 'limit': 2})
+        second = self.client.get(first.data['next'])
+        assert [row['amount'] for row in first.data['results'] + second.data['results']] == ['30.00', '20.00', '10.00']
+        assert second.data['results'] == [{'amount': '10.00'}]
+
+    def test_expense_retrieve_defers_other_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('expense-detail', args=[self.expense.pk]), {'fields': 'title'})
+        assert response.data == {'title': 'Item 1'}
+        assert all('"notes"' not in columns for columns in selected_columns(queries, 'expenses_expense'))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse('expense-list'), {'fields': 'amount,password'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'password' in str(response.data)
+        response = self.client.get(reverse('budget-list'), {'fields': ','})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post(f"{reverse('expense-list')}?fields=id", {
+            'title': 'Taxi', 'amount': '12.00', 'expense_date': '2023-10-02',
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['title'] == 'Taxi'
+
+    def test_budget_fields_keep_computed_values(self):
+        response = self.client.get(reverse('budget-list'), {'fields': 'category,percent', 'month': '2023-10'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'category': 'Food', 'percent': '60.0'}]
@@ -0,0 +1,93 @@
+import pytest
+from django.urls import reverse
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from prometheus_client import REGISTRY
+from apps.common import views
+from apps.expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+@pytest.mark.django_db
+class TestMetrics:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1))
+
+    def test_requests_and_exports_are_counted(self):
+        route = {'route': 'api/expenses/export/$', 'method': 'GET'}
+        requests = sample('http_requests_total', status='200', **route)
+        exports = sample('expense_exports_total')
+        checkouts = sample('db_connection_checkout_seconds_count')
+
+        response = self.client.get(reverse('expense-export'))
+        b''.join(response.streaming_content)
+
+        assert sample('http_requests_total', status='200', **route) == requests + 1
+        assert sample('http_request_duration_seconds_count', **route) == requests + 1
+        assert sample('expense_exports_total') == exports + 1
+        assert sample('db_connection_checkout_seconds_count') == checkouts + 1
+
+    def test_scrape_makes_no_queries(self):
+        self.client.get(reverse('expense-list'))
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('metrics'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(captured.captured_queries) == 0
+        assert b'http_requests_total{method="GET",route="api/expenses/$",status="200"}' in response.content
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_scrape_token(self):
+        assert self.client.get(reverse('metrics')).status_code == status.HTTP_403_FORBIDDEN
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_signups_are_counted(self, django_capture_on_commit_callbacks):
+        self.client.logout()
+        signups = sample('user_signups_total')
+        with django_capture_on_commit_callbacks(execute=True):
+                response = self.client.post(reverse('signup'), {'email': 'new@example.com', 'password': 'Password123!'})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sample('user_signups_total') == signups + 1
+
+@pytest.mark.django_db
+class TestHealthCheck:
+    def setup_method(self):
+        views._last_check = None
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=60)
+    def test_cached_mode_reuses_the_last_check(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(connection, 'ensure_connection', lambda: calls.append(1))
+        client = APIClient()
+        for _ in range(3):
+            response = client.get(reverse('health_check'))
+            assert response.data['database'] == 'connected'
+        assert len(calls) == 1
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=0)
+    def test_uncached_mode_checks_every_time(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(connection, 'ensure_connection', lambda: calls.append(1))
+        client = APIClient()
+        client.get(reverse('health_check'))
+        client.get(reverse('health_check'))
+        assert len(calls) == 2
+
+    def test_reports_connection_settings(self):
+        response = APIClient().get(reverse('health_check'))
+        assert response.data['connections'] == {
+            'pooled': False,
+            'max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        }
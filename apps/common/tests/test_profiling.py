@@ -0,0 +1,83 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from apps.common.profiling import Histogram, Registry, RequestProfile, registry
+from apps.expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+class TestHistogram:
+    def test_quantiles_use_bucket_upper_bounds(self):
+        histogram = Histogram((1, 5, 10))
+        for value in [0.5, 2, 3, 4, 7, 50]:
+            histogram.observe(value)
+        assert histogram.quantile(0.5) == 5
+        assert histogram.quantile(0.8) == 10
+        assert histogram.quantile(1) == 50
+        assert histogram.as_dict()['max'] == 50
+
+    def test_registry_is_bounded(self):
+        views = Registry(max_views=2)
+        for key in ['GET a', 'GET b', 'GET c', 'GET d']:
+            views.observe(key, RequestProfile(), 0.01)
+        report = views.report()
+        assert set(report) == {'GET a', 'GET b', 'other'}
+        assert report['other']['requests'] == 2
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    def setup_method(self):
+        registry.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1))
+        self.report_url = reverse('profile_report')
+
+    def test_records_queries_per_view(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('expense-list'))
+        queries = len(captured.captured_queries)
+
+        admin = User.objects.create_user(email='admin@example.com', password='password123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        report = self.client.get(self.report_url).data
+        stats = report['GET expense-list']
+        assert stats['requests'] == 1
+        assert stats['queries']['max'] == queries
+        assert stats['serializer_ms']['max'] > 0
+
+    def test_records_queries_under_asgi(self):
+        # Queries run in a sync_to_async thread with its own connection
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = async_to_sync(AsyncClient().get)(reverse('expense-list'), headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        stats = registry.report()['GET expense-list']
+        assert stats['sql_ms']['max'] > 0
+
+        with CaptureQueriesContext(connection) as captured:
+            Client().get(reverse('expense-list'), headers=headers)
+        assert stats['queries']['max'] == len(captured.captured_queries)
+
+    def test_report_is_staff_only_and_resettable(self):
+        self.client.get(reverse('expense-list'))
+        assert self.client.get(self.report_url).status_code == status.HTTP_403_FORBIDDEN
+
+        admin = User.objects.create_user(email='admin@example.com', password='password123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        assert self.client.delete(self.report_url).status_code == status.HTTP_204_NO_CONTENT
+        assert 'GET expense-list' not in self.client.get(self.report_url).data
+
+    @override_settings(REQUEST_PROFILING_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('expense-list'))
+        assert response['Server-Timing'].startswith('db;dur=')
+        assert 'total;dur=' in response['Server-Timing']
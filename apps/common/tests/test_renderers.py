@@ -0,0 +1,88 @@
+import io
+import uuid
+import zoneinfo
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.common.parsers import ORJSONParser
+from apps.common.renderers import ORJSONRenderer
+from apps.expenses.models import Expense
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+User = get_user_model()
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'amount': Decimal('10.50'),
+    'date': date(2024, 2, 29),
+    'utc': datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=dt_timezone.utc),
+    'london_winter': datetime(2024, 1, 1, tzinfo=zoneinfo.ZoneInfo('Europe/London')),
+    'offset': datetime(2024, 6, 1, 8, 30, tzinfo=dt_timezone(timedelta(hours=-3))),
+    'naive': datetime(2024, 1, 1, 1, 2, 3),
+    'time': time(9, 15),
+    'duration': timedelta(minutes=90),
+    'lazy': gettext_lazy('This field is required.'),
+    'text': 'Café ☕ \u2028 \u2029',
+    'nested': [{'count': 3, 'share': 0.25, 'ok': True, 'missing': None}],
+    1: 'integer key',
+}
+
+
+class TestORJSONRenderer:
+    def test_output_is_byte_identical(self):
+        assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+    def test_falls_back_for_indent_and_big_integers(self):
+        context = {'indent': 2}
+        assert ORJSONRenderer().render(PAYLOAD, renderer_context=context) == JSONRenderer().render(PAYLOAD, renderer_context=context)
+        assert ORJSONRenderer().render({'big': 2 ** 70}) == b'{"big":1180591620717411303424}'
+
+    def test_none_renders_empty(self):
+        assert ORJSONRenderer().render(None) == b''
+
+
+class TestORJSONParser:
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_parses_like_json_parser(self):
+        body = '{"title": "Café", "amount": "10.50", "ids": [1, 2.5, null, true]}'.encode()
+        assert self.parse(ORJSONParser(), body) == self.parse(JSONParser(), body)
+
+    @pytest.mark.parametrize('body', [b'{"a": 1', b'{"a": NaN}', b''])
+    def test_rejects_what_json_parser_rejects(self, body):
+        with pytest.raises(ParseError):
+            self.parse(JSONParser(), body)
+        with pytest.raises(ParseError):
+            self.parse(ORJSONParser(), body)
+
+    def test_other_charsets_go_to_json_parser(self):
+        body = '{"title": "Café"}'.encode('latin-1')
+        assert self.parse(ORJSONParser(), body, encoding='latin-1') == {'title': 'Café'}
+
+
+@pytest.mark.django_db
+class TestFastJSONSetting:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Café', amount=Decimal('3.20'), expense_date=date(2023, 10, 1))
+
+    def test_api_renders_and_parses_with_orjson(self):
+        response = self.client.get(reverse('expense-list'))
+        assert isinstance(response.accepted_renderer, ORJSONRenderer)
+        assert response.content == JSONRenderer().render(response.data)
+
+        response = self.client.post(reverse('expense-list'), {
+            'title': 'Taxi', 'amount': '12.00', 'expense_date': '2023-10-02',
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.content == JSONRenderer().render(response.data)
@@ -0,0 +1,75 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.common.serializers import ValuesSerializer
+from apps.expenses.models import Expense
+from apps.expenses.serializers import ExpenseSerializer, ExpenseValuesSerializer
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class ExpenseWithUserSerializer(serializers.ModelSerializer):
+    owner = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Expense
+        fields = ['id', 'owner']
+
+    def get_owner(self, expense):
+        return expense.user_id
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+    def setup_method(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        Expense.objects.create(user=self.user, title='Lunch', amount=Decimal('10.5'), expense_date=date(2023, 10, 1),
+                               category='Food', notes='paid by card')
+        Expense.objects.create(user=self.user, title='Taxi ☂', amount=Decimal('0.01'), currency='EUR',
+                               expense_date=date(2024, 2, 29), category=None, notes=None)
+        Expense.objects.create(user=self.user, title='Rent', amount=Decimal('9999999999.99'), expense_date=date(2023, 1, 31))
+        # A timestamp with microseconds and one on a whole second
+        Expense.objects.filter(title='Rent').update(updated_at=datetime(2023, 6, 1, 12, 0, tzinfo=dt_timezone.utc))
+        self.queryset = Expense.objects.order_by('expense_date')
+        self.fast = ExpenseValuesSerializer()
+
+    def render_both(self):
+        expected = JSONRenderer().render(ExpenseSerializer(self.queryset, many=True).data)
+        actual = JSONRenderer().render(self.fast.to_representation(self.fast.values(self.queryset)))
+        return expected, actual
+
+    def test_json_is_byte_identical(self):
+        expected, actual = self.render_both()
+        assert actual == expected
+
+    def test_json_is_byte_identical_in_another_timezone(self):
+        with timezone.override('America/Sao_Paulo'):
+            expected, actual = self.render_both()
+        assert b'-03:00' in actual
+        assert actual == expected
+
+    def test_rejects_fields_that_are_not_model_fields(self):
+        with pytest.raises(ImproperlyConfigured):
+            ValuesSerializer(ExpenseWithUserSerializer).columns
+
+    def test_expense_list_pages_match_the_model_serializer(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse('expense-list')
+        expected = JSONRenderer().render(ExpenseSerializer(Expense.objects.order_by('-expense_date'), many=True).data)
+
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert JSONRenderer().render(response.data['results']) == expected
+
+        response = client.get(url, {'pagination': 'cursor', 'limit': 2})
+        second = client.get(response.data['next'])
+        rendered = JSONRenderer().render(response.data['results'] + second.data['results'])
+        assert rendered == expected
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class SharedScopedRateThrottle(ScopedRateThrottle):
+    """
+    ScopedRateThrottle keeping its request history in the
+    THROTTLE_CACHE_ALIAS cache, so limits hold across workers when that
+    cache is shared (Redis, Memcached, database). Rates are read from
+    DEFAULT_THROTTLE_RATES on every request; a scope without a rate is not
+    throttled.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    @property
+    def THROTTLE_RATES(self):
+        return api_settings.DEFAULT_THROTTLE_RATES
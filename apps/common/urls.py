@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import health_check
+from .views import health_check, profile_report
 
 urlpatterns = [
     path('', health_check, name='health_check'),
+    path('profile/', profile_report, name='profile_report'),
 ]
@@ -1,18 +1,65 @@
+import time
+
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
+from rest_framework import status
+from django.conf import settings
 from django.db import connection
+from . import metrics
+from .profiling import registry
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def health_check(request):
+# Last database check of this process: (monotonic time, connected)
+_last_check = None
+
+def database_connected():
+    global _last_check
+    ttl = settings.HEALTH_CHECK_CACHE_SECONDS
+    now = time.monotonic()
+    if ttl and _last_check is not None and now - _last_check[0] < ttl:
+        return _last_check[1]
     try:
         connection.ensure_connection()
         db_valid = connection.is_usable()
     except Exception:
         db_valid = False
-        
+    _last_check = (now, db_valid)
+    return db_valid
+
+def connection_stats():
+    # Django only creates `pool` on the PostgreSQL backend, and it is None unless DB_POOL is set
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return {
+            "pooled": False,
+            "max_age": connection.settings_dict['CONN_MAX_AGE'],
+            "health_checks": connection.settings_dict['CONN_HEALTH_CHECKS'],
+        }
+    stats = pool.get_stats()
+    return {
+        "pooled": True,
+        "size": stats.get('pool_size', 0),
+        "available": stats.get('pool_available', 0),
+        "waiting": stats.get('requests_waiting', 0),
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+    }
+
+@metrics.exempt
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_check(request):
     return Response({
         "status": "ok",
-        "database": "connected" if db_valid else "disconnected"
+        "database": "connected" if database_connected() else "disconnected",
+        "connections": connection_stats(),
     })
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def profile_report(request):
+    # Histograms of this worker process only; DELETE starts them afresh
+    if request.method == 'DELETE':
+        registry.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(registry.report())
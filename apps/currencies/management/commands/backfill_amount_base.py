@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.common.cache import deferred_invalidation, invalidate_user
+from apps.currencies.rates import rate_cache
+from apps.expenses import rollups
+from apps.expenses.models import Expense
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute Expense.amount_base for rows missing it (or all rows with --all), in primary key "
+        "batches, then rebuild the rollups of the affected users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute every row, e.g. after correcting rates.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rate_cache.clear()
+        queryset = Expense.objects.order_by('pk').only('pk', 'user_id', 'amount', 'currency', 'expense_date', 'amount_base')
+        if not options['all']:
+            queryset = queryset.filter(amount_base__isnull=True)
+
+        updated, missing, user_ids = 0, 0, set()
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(page[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            changed = []
+            for expense in batch:
+                previous = expense.amount_base
+                expense.set_amount_base()
+                if expense.amount_base is None:
+                    missing += 1
+                if expense.amount_base != previous:
+                    changed.append(expense)
+                    user_ids.add(expense.user_id)
+            # Plain UPDATEs: no signals, the rollups are rebuilt below
+            with transaction.atomic():
+                Expense.objects.bulk_update(changed, ['amount_base'])
+            updated += len(changed)
+
+        if user_ids:
+            rollups.rebuild(sorted(user_ids))
+            with deferred_invalidation():
+                for user_id in user_ids:
+                    invalidate_user(user_id, 'expenses')
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {updated} expense(s) for {len(user_ids)} user(s); {missing} still without a rate."
+        ))
@@ -0,0 +1,56 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from apps.currencies.models import ExchangeRate
+from apps.currencies.rates import rate_cache
+
+
+def read_rows(path):
+    """Yield (date, currency, rate) strings from a CSV with those columns, or a JSON list of objects."""
+    with open(path, newline='', encoding='utf-8') as fileobj:
+        if Path(path).suffix.lower() == '.json':
+            for item in json.load(fileobj):
+                # Also accepts Django fixtures (dumpdata currencies.ExchangeRate)
+                item = item.get('fields', item)
+                yield item['date'], item['currency'], item['rate']
+        else:
+            for row in csv.DictReader(fileobj):
+                yield row['date'], row['currency'], row['rate']
+
+
+class Command(BaseCommand):
+    help = "Load or update exchange rates (value in BASE_CURRENCY of one unit) from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV with date,currency,rate columns, or a JSON list of such objects.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch, loaded = [], 0
+        try:
+            with transaction.atomic():
+                for line, (raw_date, currency, raw_rate) in enumerate(read_rows(options['path']), start=1):
+                    on_date, rate = parse_date(str(raw_date).strip()), Decimal(str(raw_rate).strip())
+                    if on_date is None or rate <= 0 or len(currency.strip()) != 3:
+                        raise CommandError(f"Row {line}: invalid rate {raw_date!r}, {currency!r}, {raw_rate!r}")
+                    batch.append(ExchangeRate(currency=currency.strip().upper(), date=on_date, rate=rate))
+                    if len(batch) >= options['batch_size']:
+                        loaded += self.save(batch)
+                        batch = []
+                loaded += self.save(batch)
+        except (OSError, KeyError, ValueError, InvalidOperation) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc!r}")
+        rate_cache.clear()
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} exchange rate(s)."))
+
+    def save(self, batch):
+        ExchangeRate.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=['currency', 'date'], update_fields=['rate']
+        )
+        return len(batch)
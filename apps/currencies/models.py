@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class ExchangeRate(models.Model):
+    """
+    Value of one unit of `currency` in settings.BASE_CURRENCY, effective
+    from `date` until the currency's next rate.
+    """
+    currency = models.CharField(max_length=3)
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+
+    class Meta:
+        unique_together = ['currency', 'date']
+        ordering = ['currency', '-date']
+
+    def __str__(self):
+        return f"{self.currency} {self.date}: {self.rate}"
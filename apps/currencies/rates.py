@@ -0,0 +1,76 @@
+"""
+Conversion of amounts into settings.BASE_CURRENCY.
+
+An amount dated D in currency C converts at C's ExchangeRate with the
+latest date on or before D. Lookups go through a per-process LRU cache of
+(currency, date) -> rate, so converting a batch of expenses costs one
+small query per distinct currency and day rather than one per row.
+Misses are not cached: a rate loaded later is picked up by the next
+write. Every ExchangeRate save or delete in this process clears the
+cache; `load_exchange_rates` does too, but other running processes keep
+their cached rates until they restart or hit the size limit.
+"""
+import threading
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import models
+
+from .models import ExchangeRate
+
+CENT = Decimal('0.01')
+
+
+class RateCache:
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, currency, on_date):
+        key = (currency, on_date)
+        with self._lock:
+            rate = self._entries.get(key)
+            if rate is not None:
+                self._entries.move_to_end(key)
+                return rate
+
+        rate = (
+            ExchangeRate.objects
+            .filter(currency=currency, date__lte=on_date)
+            .order_by('-date')
+            .values_list('rate', flat=True)
+            .first()
+        )
+        if rate is not None:
+            with self._lock:
+                self._entries[key] = rate
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return rate
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+rate_cache = RateCache(settings.EXCHANGE_RATE_CACHE_SIZE)
+
+
+def rate_for(currency, on_date):
+    """Return the BASE_CURRENCY value of one unit of `currency` on `on_date`, or None if unknown."""
+    currency = (currency or settings.BASE_CURRENCY).upper()
+    if currency == settings.BASE_CURRENCY:
+        return Decimal('1')
+    return rate_cache.get(currency, models.DateField().to_python(on_date))
+
+
+def to_base(amount, currency, on_date):
+    """Convert `amount` into BASE_CURRENCY, rounded to cents; None when no rate is known."""
+    if amount is None:
+        return None
+    rate = rate_for(currency, on_date)
+    if rate is None:
+        return None
+    return (Decimal(amount) * rate).quantize(CENT, rounding=ROUND_HALF_UP)
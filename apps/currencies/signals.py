@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ExchangeRate
+from .rates import rate_cache
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def clear_cached_rates(sender, **kwargs):
+    rate_cache.clear()
@@ -0,0 +1,113 @@
+import importlib
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.budgets.models import BudgetSpend
+from apps.currencies.models import ExchangeRate
+from apps.currencies.rates import rate_cache, rate_for, to_base
+from apps.expenses.models import Expense, ExpenseRollup
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+backfill_migration = importlib.import_module('apps.expenses.migrations.0009_backfill_amount_base')
+
+@pytest.mark.django_db
+class TestExchangeRates:
+    def setup_method(self):
+        rate_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        ExchangeRate.objects.create(currency='EUR', date=date(2023, 10, 1), rate=Decimal('1.10'))
+        ExchangeRate.objects.create(currency='EUR', date=date(2023, 11, 1), rate=Decimal('1.20'))
+
+    def add(self, amount, currency, expense_date='2023-10-15'):
+        return Expense.objects.create(
+            user=self.user, title='Item', amount=amount, currency=currency, expense_date=expense_date, category='Food'
+        )
+
+    def test_rate_lookup_uses_latest_rate_on_or_before_date(self, django_assert_num_queries):
+        assert rate_for('usd', date(2023, 10, 1)) == Decimal('1')
+        assert rate_for('EUR', date(2023, 10, 31)) == Decimal('1.10')
+        assert rate_for('eur', '2023-11-02') == Decimal('1.20')
+        assert rate_for('EUR', date(2023, 9, 30)) is None
+        assert to_base('10.005', 'EUR', date(2023, 10, 1)) == Decimal('11.01')
+
+        with django_assert_num_queries(0):
+            rate_for('EUR', date(2023, 10, 31))
+
+        # Writing a rate clears the cache
+        ExchangeRate.objects.create(currency='EUR', date=date(2023, 10, 20), rate=Decimal('1.15'))
+        assert rate_for('EUR', date(2023, 10, 31)) == Decimal('1.15')
+
+    def test_amount_base_is_set_on_write_and_drives_rollups(self):
+        eur = self.add('10.00', 'EUR')
+        self.add('5.00', 'USD')
+        unknown = self.add('100.00', 'GBP')
+        assert Expense.objects.get(pk=eur.pk).amount_base == Decimal('11.00')
+        assert Expense.objects.get(pk=unknown.pk).amount_base is None
+
+        rollup = ExpenseRollup.objects.get(user=self.user, day=date(2023, 10, 15))
+        assert rollup.total == Decimal('116.00')  # GBP counted as entered until a rate exists
+
+        eur.expense_date = date(2023, 11, 5)
+        eur.save()
+        assert ExpenseRollup.objects.get(user=self.user, day=date(2023, 11, 5)).total == Decimal('12.00')
+
+        response = self.client.patch(reverse('expense-bulk'), [{'id': str(eur.pk), 'amount': '20.00'}], format='json')
+        assert response.status_code == 200
+        assert Expense.objects.get(pk=eur.pk).amount_base == Decimal('24.00')
+
+        summary = self.client.get(reverse('expense-summary')).data
+        assert summary['currency'] == 'USD'
+        assert Decimal(str(summary['total_spend'])) == Decimal('129.00')
+
+    def test_load_and_backfill_commands(self, tmp_path, settings):
+        gbp = self.add('100.00', 'GBP')
+        path = tmp_path / 'rates.csv'
+        path.write_text('date,currency,rate\n2023-10-01,gbp,1.25\n2023-10-01,EUR,1.12\n')
+        call_command('load_exchange_rates', str(path))
+        assert ExchangeRate.objects.get(currency='EUR', date=date(2023, 10, 1)).rate == Decimal('1.12')
+
+        call_command('backfill_amount_base', '--batch-size', '1')
+        assert Expense.objects.get(pk=gbp.pk).amount_base == Decimal('125.00')
+        assert ExpenseRollup.objects.get(user=self.user, day=date(2023, 10, 15)).total == Decimal('125.00')
+
+        path.write_text('date,currency,rate\nyesterday,EUR,1\n')
+        with pytest.raises(CommandError):
+            call_command('load_exchange_rates', str(path))
+
+    def test_partial_saves_keep_amount_base_and_rollups_in_step(self):
+        gbp = self.add('100.00', 'GBP')
+        ExchangeRate.objects.create(currency='GBP', date=date(2023, 10, 1), rate=Decimal('1.25'))
+        day = date(2023, 10, 15)
+
+        # A rate loaded since doesn't leak into a save that leaves the amount alone
+        gbp.title = 'Renamed'
+        gbp.save(update_fields=['title'])
+        assert Expense.objects.get(pk=gbp.pk).amount_base is None
+        assert ExpenseRollup.objects.get(user=self.user, day=day).total == Decimal('100.00')
+
+        gbp.amount = Decimal('80.00')
+        gbp.save(update_fields=['amount'])
+        assert Expense.objects.get(pk=gbp.pk).amount_base == Decimal('100.00')
+        assert ExpenseRollup.objects.get(user=self.user, day=day).total == Decimal('100.00')
+
+    def test_migration_backfills_amount_base_and_rebuilds_totals(self):
+        eur, usd, gbp = self.add('10.00', 'EUR'), self.add('5.00', 'USD'), self.add('100.00', 'GBP')
+        # As left by migration 0007, with the rollups counting amounts as entered
+        Expense.objects.update(amount_base=None)
+        ExpenseRollup.objects.filter(user=self.user).update(total=Decimal('115.00'))
+
+        backfill_migration.backfill_amount_base(apps, None)
+
+        bases = dict(Expense.objects.values_list('pk', 'amount_base'))
+        assert (bases[eur.pk], bases[usd.pk], bases[gbp.pk]) == (Decimal('11.00'), Decimal('5.00'), None)
+        assert ExpenseRollup.objects.get(user=self.user, day=date(2023, 10, 15)).total == Decimal('116.00')
+        assert BudgetSpend.objects.get(user=self.user, category='Food').spent == Decimal('116.00')
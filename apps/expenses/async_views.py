@@ -0,0 +1,169 @@
+"""
+Async (ASGI) implementations of the read-heavy expense endpoints.
+
+With EXPENSES_ASYNC_VIEWS enabled, GET requests for the list, summary and
+export paths are routed here instead of to ExpenseViewSet. Queries run
+through Django's async ORM, so a slow query waits on the event loop
+instead of occupying a whole sync worker. Anything these views don't
+handle themselves (writes on the list path, keyset pages) is passed on
+to the viewset.
+
+Responses mirror the viewset: same authentication, permissions, filters,
+ordering, pagination, validators and JSON rendering; the summary shares
+the viewset's per-user response cache entries. Only enable this
+when serving config.asgi; under WSGI Django has to buffer async
+streaming responses in memory.
+"""
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from django_filters.utils import translate_validation
+from rest_framework import exceptions
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.common import metrics
+from apps.common.cache import get_cache, response_validators
+from apps.common.conditional import make_etag, not_modified, set_validators
+from apps.common.fieldsets import parse_fields
+from apps.common.permissions import IsEmailVerified
+from apps.users.authentication import UserScopedJWTAuthentication
+from .exports import aiter_csv
+from .filters import ExpenseFilter
+from .models import Expense
+from .pagination import ExpensePagination
+from .search import ExpenseSearchFilter
+from .summary import TOTALS, SummaryQueries, build_summary, parse_month
+from .views import ExpenseViewSet
+
+sync_list_view = ExpenseViewSet.as_view({'get': 'list', 'post': 'create'})
+
+
+def render(data, status=200):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type='application/json')
+
+
+def render_exception(exc):
+    response = api_settings.EXCEPTION_HANDLER(exc, {})
+    rendered = render(response.data, status=response.status_code)
+    for header, value in response.headers.items():
+        if header.lower() != 'content-type':
+            rendered[header] = value
+    return rendered
+
+
+async def authenticate(request):
+    """Return a DRF request with an authenticated, verified user, or raise an APIException."""
+    authenticator = UserScopedJWTAuthentication()
+    result = await sync_to_async(authenticator.authenticate)(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+
+    drf_request = Request(request)
+    drf_request.user, drf_request.auth = result
+    if not IsEmailVerified().has_permission(drf_request, None):
+        raise exceptions.PermissionDenied(IsEmailVerified.message)
+    return drf_request
+
+
+def filtered_queryset(drf_request):
+    # Sync: the category filter resolves the category id with a query
+    queryset = Expense.objects.filter(user_id=drf_request.user.pk)
+    filterset = ExpenseFilter(drf_request.query_params, queryset=queryset, request=drf_request)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    queryset = OrderingFilter().filter_queryset(drf_request, filterset.qs, ExpenseViewSet)
+    return ExpenseSearchFilter().filter_queryset(drf_request, queryset, ExpenseViewSet)
+
+
+@csrf_exempt
+async def expense_list(request):
+    paginator = ExpensePagination()
+    if request.method != 'GET' or paginator.use_keyset(Request(request)):
+        return await sync_to_async(sync_list_view)(request)
+
+    try:
+        drf_request = await authenticate(request)
+        queryset = await sync_to_async(filtered_queryset)(drf_request)
+        names = parse_fields(request.GET.get(ExpenseViewSet.fields_query_param), ExpenseViewSet.serializer_class)
+    except exceptions.APIException as exc:
+        return render_exception(exc)
+
+    stats = await queryset.aaggregate(last_modified=Max(ExpenseViewSet.validator_field), count=Count('pk'))
+    etag = make_etag(request.get_full_path(), stats['last_modified'], stats['count'])
+    last_modified = int(stats['last_modified'].timestamp()) if stats['last_modified'] else None
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return set_validators(response, etag, last_modified)
+
+    paginator.request = drf_request
+    paginator.keyset = False
+    paginator.limit = paginator.get_limit(drf_request)
+    paginator.offset = paginator.get_offset(drf_request)
+    paginator.count = stats['count']
+    values_serializer = ExpenseViewSet.values_serializer
+    if names is not None:
+        values_serializer = values_serializer.restrict(names)
+    page = values_serializer.values(queryset)[paginator.offset:paginator.offset + paginator.limit]
+    rows = [row async for row in page]
+
+    data = values_serializer.to_representation(rows)
+    return set_validators(render(paginator.get_paginated_response(data).data), etag, last_modified)
+
+
+@csrf_exempt
+@require_GET
+async def expense_summary(request):
+    try:
+        drf_request = await authenticate(request)
+    except exceptions.APIException as exc:
+        return render_exception(exc)
+
+    try:
+        month = parse_month(request.GET.get('month'))
+    except ValueError:
+        return render({"error": "Invalid month format. Use YYYY-MM"}, status=400)
+
+    # Same versions, validators and cache entry as ExpenseViewSet.summary
+    etag, key = await sync_to_async(response_validators)(
+        drf_request.user.pk, ExpenseViewSet.summary.cache_namespaces,
+        f'{ExpenseViewSet.__name__}.summary', request.get_full_path(),
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return set_validators(response, etag)
+
+    cache = get_cache()
+    data = await cache.aget(key)
+    if data is None:
+        queries = SummaryQueries(drf_request.user.pk, month)
+        data = build_summary(
+            totals=await queries.rollups.aaggregate(**TOTALS),
+            by_category=[row async for row in queries.by_category],
+            budgets=[row async for row in queries.budgets],
+            timeline=[row async for row in queries.timeline],
+        )
+        await cache.aset(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+    return set_validators(render(data), etag)
+
+
+@csrf_exempt
+@require_GET
+async def expense_export(request):
+    try:
+        drf_request = await authenticate(request)
+        queryset = await sync_to_async(filtered_queryset)(drf_request)
+    except exceptions.APIException as exc:
+        return render_exception(exc)
+
+    metrics.EXPORTS.inc()
+    response = StreamingHttpResponse(aiter_csv(queryset), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="expenses_{datetime.now().strftime("%Y%m%d")}.csv"'
+    return response
@@ -0,0 +1,91 @@
+"""
+Batched expense writes shared by the bulk endpoints and importers.
+
+Each call runs in a single transaction, writes in EXPENSE_BULK_BATCH_SIZE
+chunks and folds the rollup changes into one `rollups.batch()` so every
+affected rollup row is updated once per call rather than once per expense.
+Response-cache invalidation is likewise coalesced to one bump per user,
+and the search index is written in batches alongside the rows.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.cache import deferred_invalidation, invalidate_user
+from . import categories, rollups, search
+from .models import CONVERSION_FIELDS, Expense
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def create_expenses(rows, batch_size=None):
+    """Insert validated rows (each including `user` or `user_id`) and return the new expenses."""
+    batch_size = batch_size or settings.EXPENSE_BULK_BATCH_SIZE
+    expenses = [Expense(**attrs) for attrs in rows]
+    categories.assign(expenses)
+    for expense in expenses:
+        expense.set_amount_base()
+
+    with transaction.atomic(), rollups.batch() as deltas, deferred_invalidation():
+        for chunk in _chunks(expenses, batch_size):
+            Expense.objects.bulk_create(chunk)
+        for expense in expenses:
+            rollups.add_expense(
+                deltas, expense.user_id, expense.expense_date, expense.category, expense.reporting_amount
+            )
+            invalidate_user(expense.user_id, 'expenses')
+        search.index_expenses(expenses, batch_size)
+    return expenses
+
+
+def update_expenses(instances, rows, batch_size=None):
+    """Apply validated partial updates; `rows[i]` holds the changes for `instances[i]`."""
+    batch_size = batch_size or settings.EXPENSE_BULK_BATCH_SIZE
+    now = timezone.now()
+    fields = {'updated_at'}
+
+    with transaction.atomic(), rollups.batch() as deltas, deferred_invalidation():
+        recategorized = []
+        for instance, attrs in zip(instances, rows):
+            rollups.add_expense(
+                deltas, instance.user_id, instance.expense_date, instance.category, instance.reporting_amount,
+                sign=-1,
+            )
+            for field, value in attrs.items():
+                setattr(instance, field, value)
+            instance.updated_at = now
+            fields.update(attrs)
+            if 'category' in attrs:
+                recategorized.append(instance)
+            if CONVERSION_FIELDS & attrs.keys():
+                instance.set_amount_base()
+                fields.add('amount_base')
+        if recategorized:
+            categories.assign(recategorized)
+            fields.add('category_ref')
+        for instance in instances:
+            rollups.add_expense(
+                deltas, instance.user_id, instance.expense_date, instance.category, instance.reporting_amount
+            )
+            invalidate_user(instance.user_id, 'expenses')
+        Expense.objects.bulk_update(instances, sorted(fields), batch_size=batch_size)
+        if {'title', 'notes'} & fields:
+            search.index_expenses(instances, batch_size)
+    return instances
+
+
+def delete_expenses(user_id, ids, batch_size=None):
+    """Delete the given expenses owned by `user_id`. Returns the number deleted."""
+    batch_size = batch_size or settings.EXPENSE_BULK_BATCH_SIZE
+    ids = list(ids)
+    deleted = 0
+
+    # Deletion signals submit their deltas and invalidations to the surrounding blocks
+    with transaction.atomic(), rollups.batch(), deferred_invalidation():
+        for chunk in _chunks(ids, batch_size):
+            _, per_model = Expense.objects.filter(user_id=user_id, pk__in=chunk).delete()
+            deleted += per_model.get(Expense._meta.label, 0)
+    return deleted
@@ -0,0 +1,78 @@
+"""
+Per-user category normalization.
+
+Category names are matched case-insensitively and with runs of
+whitespace collapsed, so "Food", "food" and " FOOD " are one Category.
+On every write an expense's or budget's `category` string is replaced by
+the Category's canonical name and `category_ref` points at it. Grouping
+by the canonical string (rollups, budget spend, the summary) is
+therefore equivalent to grouping by category id, and filters resolve the
+id once through the (user, normalized) unique index instead of scanning
+with case-folded comparisons.
+"""
+from .models import Category
+
+NAME_MAX_LENGTH = Category._meta.get_field('name').max_length
+
+
+def normalize(name):
+    """The key categories are matched on; '' for blank names."""
+    return ' '.join((name or '').split()).casefold()[:NAME_MAX_LENGTH]
+
+
+def resolve(user_id, names):
+    """
+    Return {normalized: Category} for the non-blank `names`, creating the
+    missing ones. The first spelling seen becomes the canonical name.
+    """
+    wanted = {}
+    for name in names:
+        key = normalize(name)
+        if key and key not in wanted:
+            wanted[key] = ' '.join(name.split())[:NAME_MAX_LENGTH]
+    if not wanted:
+        return {}
+
+    found = {
+        category.normalized: category
+        for category in Category.objects.filter(user_id=user_id, normalized__in=wanted)
+    }
+    missing = [
+        Category(user_id=user_id, name=name, normalized=key)
+        for key, name in wanted.items() if key not in found
+    ]
+    if missing:
+        # Concurrent writers may create the same categories: ignore and re-read
+        Category.objects.bulk_create(missing, ignore_conflicts=True)
+        found.update(
+            (category.normalized, category)
+            for category in Category.objects.filter(user_id=user_id, normalized__in=[c.normalized for c in missing])
+        )
+    return found
+
+
+def category_id(user_id, name):
+    """Return the id of the user's category matching `name`, or None, without creating it."""
+    key = normalize(name)
+    if not key:
+        return None
+    return Category.objects.filter(user_id=user_id, normalized=key).values_list('id', flat=True).first()
+
+
+def assign(objects):
+    """
+    Point each object's `category_ref` at its Category and replace its
+    `category` with the canonical name. Objects may belong to several
+    users; one lookup is made per user.
+    """
+    by_user = {}
+    for obj in objects:
+        by_user.setdefault(obj.user_id, []).append(obj)
+
+    for user_id, items in by_user.items():
+        categories = resolve(user_id, [obj.category for obj in items if obj.category])
+        for obj in items:
+            category = categories.get(normalize(obj.category))
+            obj.category_ref = category
+            if category is not None:
+                obj.category = category.name
@@ -1,4 +1,5 @@
 import django_filters
+from . import categories
 from .models import Expense
 
 class ExpenseFilter(django_filters.FilterSet):
@@ -6,9 +7,16 @@ class ExpenseFilter(django_filters.FilterSet):
     to_date = django_filters.DateFilter(field_name='expense_date', lookup_expr='lte')
     min_amount = django_filters.NumberFilter(field_name='amount', lookup_expr='gte')
     max_amount = django_filters.NumberFilter(field_name='amount', lookup_expr='lte')
-    category = django_filters.CharFilter(lookup_expr='iexact')
+    category = django_filters.CharFilter(method='filter_category')
     currency = django_filters.CharFilter(lookup_expr='iexact')
 
     class Meta:
         model = Expense
         fields = ['category', 'currency', 'from_date', 'to_date', 'min_amount', 'max_amount']
+
+    def filter_category(self, queryset, name, value):
+        # Case-insensitive: resolve the user's category once, then use the (user, category_ref) index
+        category_id = categories.category_id(self.request.user.pk, value)
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_ref_id=category_id)
@@ -0,0 +1,308 @@
+"""
+Streaming bank statement import (CSV and OFX).
+
+Statements are parsed incrementally from the uploaded file object and
+imported in EXPENSE_IMPORT_BATCH_SIZE batches, so memory use does not
+depend on file size. Every row is validated with ExpenseSerializer's
+rules and tagged with a content fingerprint; rows whose fingerprint
+already exists for the user are skipped, which makes re-importing an
+overlapping statement a no-op for the overlap. Note that identical rows
+(same date, amount, currency and title, and no bank reference) collapse
+into one.
+
+Only money out is imported. A signed CSV amount column is read with
+`amount_sign`: 'negative' (the bank convention, and OFX's) treats
+negative amounts as spend and skips positive ones as credits; 'positive'
+is the reverse, for exports that list spend as positive numbers. A CSV
+with a debit column instead imports the debit cells and skips rows
+without one. `decimal_separator` ('.' or ',') says how CSV amounts are
+written; the other character is taken as a thousands separator.
+"""
+import csv
+import hashlib
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from rest_framework import serializers
+
+from . import bulk
+from .models import Expense
+from .serializers import ExpenseSerializer
+
+FORMATS = ('csv', 'ofx')
+DECIMAL_SEPARATORS = ('.', ',')
+AMOUNT_SIGNS = ('negative', 'positive')
+MAX_REPORTED_ERRORS = 100
+TITLE_MAX_LENGTH = Expense._meta.get_field('title').max_length
+DEFAULT_CURRENCY = Expense._meta.get_field('currency').default
+
+# Lower-cased CSV header names recognised for each field, in order of preference
+COLUMN_ALIASES = {
+    'expense_date': ('expense_date', 'date', 'transaction date', 'posted date', 'posting date', 'booking date'),
+    'amount': ('amount', 'value', 'transaction amount'),
+    'debit': ('debit', 'paid out', 'withdrawal', 'withdrawals'),
+    'title': ('title', 'description', 'payee', 'merchant', 'name', 'details'),
+    'currency': ('currency', 'ccy'),
+    'category': ('category',),
+    'notes': ('notes', 'memo'),
+    'reference': ('reference', 'transaction id', 'id', 'fitid'),
+}
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+
+class StatementError(ValueError):
+    """Raised when a statement cannot be read at all (unknown format, missing columns...)."""
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'duplicates': self.duplicates,
+            'skipped': self.skipped,
+            'invalid': self.invalid,
+            'errors': self.errors,
+        }
+
+
+def detect_format(filename, requested=None):
+    fmt = (requested or filename.rsplit('.', 1)[-1]).lower()
+    if fmt == 'qfx':
+        fmt = 'ofx'
+    if fmt not in FORMATS:
+        raise StatementError(f"Unsupported statement format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+    return fmt
+
+
+def fingerprint(user_id, expense_date, amount, currency, title, reference=''):
+    content = '|'.join([
+        str(user_id),
+        expense_date.isoformat(),
+        str(Decimal(amount).quantize(Decimal('0.01'))),
+        currency.upper(),
+        ' '.join(title.lower().split()),
+        reference or '',
+    ])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _text(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8-sig', errors='replace', newline='')
+
+
+def _parse_amount(raw, decimal_separator='.'):
+    cleaned = re.sub(r'[^\d.,\-()]', '', raw or '')
+    negative = cleaned.startswith('(') or '-' in cleaned
+    thousands = ',' if decimal_separator == '.' else '.'
+    cleaned = cleaned.strip('()-').replace(thousands, '').replace(decimal_separator, '.')
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        return None
+    return -amount if negative else amount
+
+
+def _parse_date(raw, date_formats):
+    raw = (raw or '').strip()
+    for fmt in date_formats:
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def iter_csv(fileobj, mapping=None):
+    """
+    Yield (line_number, raw_row) from a CSV statement, where raw_row maps
+    Expense field names (plus 'reference', and 'debit' when the statement
+    has a debit column rather than a signed amount) to cell strings.
+    `mapping` overrides the header used for a field, e.g. {'title': 'Payee'}.
+    """
+    reader = csv.reader(_text(fileobj))
+    rows = _csv_rows(reader)
+    try:
+        header = [name.strip().lower() for name in next(rows)]
+    except StopIteration:
+        return
+
+    columns = {}
+    for field_name, aliases in COLUMN_ALIASES.items():
+        wanted = [mapping[field_name].strip().lower()] if mapping and field_name in mapping else aliases
+        for alias in wanted:
+            if alias in header:
+                columns[field_name] = header.index(alias)
+                break
+    if 'amount' in columns:
+        # A signed amount column takes precedence over a debit column
+        columns.pop('debit', None)
+    elif 'debit' in columns:
+        columns['amount'] = columns['debit']
+    missing = {'expense_date', 'amount', 'title'} - set(columns)
+    if missing:
+        raise StatementError(f"Missing column(s) for: {', '.join(sorted(missing))}.")
+
+    for cells in rows:
+        if not any(cell.strip() for cell in cells):
+            continue
+        yield reader.line_num, {
+            name: (cells[index].strip() if index < len(cells) else '')
+            for name, index in columns.items()
+        }
+
+
+def _csv_rows(reader):
+    # Malformed input (a NUL byte, an oversized field...) fails the whole statement
+    try:
+        yield from reader
+    except csv.Error as exc:
+        raise StatementError(f"Line {reader.line_num}: {exc}.") from exc
+
+
+def iter_ofx(fileobj, read_size=64 * 1024):
+    """
+    Yield (transaction_number, raw_row) for each debit <STMTTRN> of an OFX
+    (SGML or XML) statement. Credits are yielded as None so callers can
+    count them as skipped.
+    """
+    text = _text(fileobj)
+    currency, current, number, pending = '', None, 0, ''
+    while True:
+        chunk = text.read(read_size)
+        pending += chunk
+        # Keep a possibly incomplete trailing tag for the next read
+        cut = len(pending) if not chunk else pending.rfind('<')
+        for closing, tag, value in OFX_TAG.findall(pending[:max(cut, 0)]):
+            tag, value = tag.upper(), value.strip()
+            if tag == 'CURDEF' and not closing:
+                currency = value
+            elif tag == 'STMTTRN':
+                if not closing:
+                    current = {}
+                elif current is not None:
+                    number += 1
+                    yield number, _ofx_row(current, currency)
+                    current = None
+            elif current is not None and not closing and value:
+                current[tag] = value
+        pending = pending[max(cut, 0):]
+        if not chunk:
+            break
+
+
+def _ofx_row(transaction, currency):
+    amount = _parse_amount(transaction.get('TRNAMT'))
+    if amount is not None and amount > 0:
+        return None
+    return {
+        'expense_date': transaction.get('DTPOSTED', '')[:8],
+        'amount': transaction.get('TRNAMT', ''),
+        'title': transaction.get('NAME') or transaction.get('MEMO', ''),
+        'notes': transaction.get('MEMO', '') if transaction.get('NAME') else '',
+        'currency': transaction.get('CURRENCY', currency),
+        'reference': transaction.get('FITID', ''),
+    }
+
+
+class StatementImporter:
+    def __init__(self, user_id, batch_size=None, date_formats=None, default_currency=DEFAULT_CURRENCY,
+                 decimal_separator='.', amount_sign='negative'):
+        self.user_id = user_id
+        self.batch_size = batch_size or settings.EXPENSE_IMPORT_BATCH_SIZE
+        self.date_formats = date_formats or settings.EXPENSE_IMPORT_DATE_FORMATS
+        self.default_currency = default_currency
+        self.decimal_separator = decimal_separator
+        self.amount_sign = amount_sign
+        self.validator = ExpenseSerializer()
+        self.result = ImportResult()
+
+    def run(self, rows):
+        batch = []
+        for number, raw in rows:
+            if raw is None or self.is_credit(raw):
+                self.result.skipped += 1
+                continue
+            attrs = self.clean(number, raw)
+            if attrs is not None:
+                batch.append(attrs)
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        self.flush(batch)
+        return self.result
+
+    def error(self, number, detail):
+        self.result.invalid += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append({'row': number, 'errors': detail})
+
+    def is_credit(self, raw):
+        """Whether a row is money in: an empty debit cell, or a signed amount of the other sign."""
+        amount = _parse_amount(raw.get('amount'), self.decimal_separator)
+        if 'debit' in raw:
+            return not raw['debit'] or amount == 0
+        return bool(amount) and (amount > 0) == (self.amount_sign == 'negative')
+
+    def clean(self, number, raw):
+        formats = ['%Y%m%d'] if re.fullmatch(r'\d{8}', raw.get('expense_date', '')) else self.date_formats
+        expense_date = _parse_date(raw.get('expense_date'), formats)
+        amount = _parse_amount(raw.get('amount'), self.decimal_separator)
+        data = {
+            'title': raw.get('title', '')[:TITLE_MAX_LENGTH],
+            'amount': abs(amount) if amount is not None else raw.get('amount'),
+            'currency': (raw.get('currency') or self.default_currency).upper(),
+            'category': raw.get('category') or None,
+            'expense_date': expense_date.isoformat() if expense_date else raw.get('expense_date'),
+            'notes': raw.get('notes') or None,
+        }
+        try:
+            attrs = self.validator.run_validation(data)
+        except serializers.ValidationError as exc:
+            self.error(number, exc.detail)
+            return None
+        attrs['user_id'] = self.user_id
+        attrs['fingerprint'] = fingerprint(
+            self.user_id, attrs['expense_date'], attrs['amount'], attrs['currency'], attrs['title'],
+            raw.get('reference', ''),
+        )
+        return attrs
+
+    def flush(self, batch):
+        if not batch:
+            return
+        unique = {}
+        for attrs in batch:
+            unique.setdefault(attrs['fingerprint'], attrs)
+        existing = set(
+            Expense.objects
+            .filter(user_id=self.user_id, fingerprint__in=list(unique))
+            .values_list('fingerprint', flat=True)
+        )
+        rows = [attrs for fp, attrs in unique.items() if fp not in existing]
+        bulk.create_expenses(rows, batch_size=self.batch_size)
+        self.result.created += len(rows)
+        self.result.duplicates += len(batch) - len(rows)
+
+
+def import_statement(user_id, fileobj, fmt, mapping=None, **options):
+    if fmt == 'ofx':
+        # OFX amounts are always signed, with a '.' decimal point
+        options.update(decimal_separator='.', amount_sign='negative')
+        rows = iter_ofx(fileobj)
+    else:
+        rows = iter_csv(fileobj, mapping)
+    return StatementImporter(user_id, **options).run(rows)
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import HttpRequest, QueryDict
+from rest_framework.request import Request
+
+from apps.jobs import queue
+from apps.users.models import User
+from .exports import iter_csv
+
+
+@queue.register('expenses.export_csv')
+def export_csv(user_id, query, name):
+    """
+    Write the user's expenses, filtered by the export query string `query`,
+    to `name` in default storage. Reruns overwrite the same file.
+    """
+    from .views import ExpenseViewSet
+
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.GET = QueryDict(query)
+    request = Request(http_request)
+    request.user = User.objects.get(pk=user_id)
+    view = ExpenseViewSet(request=request, action='export', format_kwarg=None, kwargs={})
+    queryset = view.filter_queryset(view.get_queryset())
+
+    with tempfile.TemporaryFile('w+b') as buffer:
+        for chunk in iter_csv(queryset):
+            buffer.write(chunk.encode())
+            queue.renew_lease()
+        size = buffer.tell()
+        buffer.seek(0)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        stored = default_storage.save(name, File(buffer))
+    return {'file': stored, 'filename': os.path.basename(name), 'bytes': size}
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.expenses import rollups
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuild (default) or verify the expense rollup table from raw Expense rows; rebuilding also refreshes budget spend."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Only report mismatches, do not write.')
+        parser.add_argument('--user', action='append', dest='emails', metavar='EMAIL',
+                            help='Limit to this user (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['emails']:
+            users = dict(User.objects.filter(email__in=options['emails']).values_list('email', 'id'))
+            missing = set(options['emails']) - set(users)
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+            user_ids = list(users.values())
+
+        if options['verify']:
+            mismatches = rollups.verify(user_ids)
+            for key, expected, actual in mismatches:
+                self.stdout.write(f"{key}: expected {expected}, found {actual}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} rollup row(s) out of sync.")
+            self.stdout.write(self.style.SUCCESS("Rollups are in sync."))
+            return
+
+        written = rollups.rebuild(user_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup row(s)."))
@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.expenses import search
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuild the expense search token index (not needed on PostgreSQL, which uses a generated tsvector)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='emails', metavar='EMAIL',
+                            help='Limit to this user (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if search.uses_tsvector():
+            self.stdout.write("PostgreSQL keeps search_vector up to date itself; nothing to rebuild.")
+            return
+
+        user_ids = None
+        if options['emails']:
+            users = dict(User.objects.filter(email__in=options['emails']).values_list('email', 'id'))
+            missing = set(options['emails']) - set(users)
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+            user_ids = list(users.values())
+
+        written = search.rebuild(user_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} search token(s)."))
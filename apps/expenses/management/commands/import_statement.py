@@ -0,0 +1,61 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.expenses import importers
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import a CSV or OFX bank statement into a user's expenses."
+
+    def add_arguments(self, parser):
+        parser.add_argument('email')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=importers.FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--date-format', help='strptime pattern for CSV dates.')
+        parser.add_argument('--decimal-separator', choices=importers.DECIMAL_SEPARATORS, default='.',
+                            help='Decimal separator of CSV amounts.')
+        parser.add_argument('--amount-sign', choices=importers.AMOUNT_SIGNS, default='negative',
+                            help='Sign of spend in a signed CSV amount column; other rows are skipped as credits.')
+        parser.add_argument('--currency', help='Currency for rows that do not specify one.')
+        parser.add_argument('--map', action='append', default=[], metavar='FIELD=COLUMN',
+                            help='Use COLUMN for FIELD (repeatable), e.g. --map title=Payee.')
+        parser.add_argument('--batch-size', type=int)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['email']}")
+
+        mapping = {}
+        for item in options['map']:
+            field_name, sep, column = item.partition('=')
+            if not sep:
+                raise CommandError(f"Invalid --map value '{item}', expected FIELD=COLUMN.")
+            mapping[field_name] = column
+
+        importer_options = {
+            'batch_size': options['batch_size'],
+            'decimal_separator': options['decimal_separator'],
+            'amount_sign': options['amount_sign'],
+        }
+        if options['date_format']:
+            importer_options['date_formats'] = [options['date_format']]
+        if options['currency']:
+            importer_options['default_currency'] = options['currency']
+
+        try:
+            fmt = importers.detect_format(options['path'], options['format'])
+            with open(options['path'], 'rb') as fileobj:
+                result = importers.import_statement(user.id, fileobj, fmt, mapping, **importer_options)
+        except (OSError, importers.StatementError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(json.dumps(result.as_dict(), indent=2, default=str))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} expense(s), skipped {result.duplicates} duplicate(s)."
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_rollups(apps, schema_editor):
+    Expense = apps.get_model('expenses', 'Expense')
+    ExpenseRollup = apps.get_model('expenses', 'ExpenseRollup')
+    rows = (
+        Expense.objects
+        .annotate(rollup_category=Coalesce('category', Value('')))
+        .values('user_id', 'expense_date', 'rollup_category')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        day = row['expense_date']
+        batch.append(ExpenseRollup(
+            user_id=row['user_id'], month=day.replace(day=1), day=day,
+            category=row['rollup_category'], total=row['total'], count=row['count'],
+        ))
+        if len(batch) >= 1000:
+            ExpenseRollup.objects.bulk_create(batch)
+            batch = []
+    ExpenseRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('day', models.DateField()),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expense_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'month'], name='expenses_ex_user_id_0670d8_idx')],
+                'unique_together': {('user', 'day', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
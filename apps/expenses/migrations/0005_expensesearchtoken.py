@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_tokens(apps, schema_editor):
+    # PostgreSQL searches the generated tsvector column (0006) instead
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    from apps.expenses.search import expense_tokens
+
+    Expense = apps.get_model('expenses', 'Expense')
+    ExpenseSearchToken = apps.get_model('expenses', 'ExpenseSearchToken')
+    batch = []
+    for pk, user_id, title, notes in Expense.objects.values_list('pk', 'user_id', 'title', 'notes').iterator(chunk_size=1000):
+        batch.extend(
+            ExpenseSearchToken(expense_id=pk, user_id=user_id, token=token, weight=weight)
+            for token, weight in expense_tokens(title, notes).items()
+        )
+        if len(batch) >= 1000:
+            ExpenseSearchToken.objects.bulk_create(batch)
+            batch = []
+    ExpenseSearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0004_expense_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField()),
+                ('expense', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='expenses.expense')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'token'], name='expenses_ex_user_id_e2aeaf_idx')],
+                'unique_together': {('expense', 'token')},
+            },
+        ),
+        migrations.RunPython(populate_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# A stored generated column needs no triggers or application code to stay
+# current. 'simple' keeps words as typed (lowercased, no stemming), which
+# matches the tokenizer used by the ExpenseSearchToken fallback.
+ADD_SEARCH_VECTOR = """
+ALTER TABLE expenses_expense ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(notes, '')), 'B')
+) STORED;
+CREATE INDEX expenses_expense_search_vector_idx ON expenses_expense USING GIN (search_vector);
+"""
+
+DROP_SEARCH_VECTOR = """
+DROP INDEX IF EXISTS expenses_expense_search_vector_idx;
+ALTER TABLE expenses_expense DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ADD_SEARCH_VECTOR)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_VECTOR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0005_expensesearchtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
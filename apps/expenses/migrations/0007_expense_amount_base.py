@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0006_expense_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='amount_base',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def normalize(name):
+    return ' '.join((name or '').split()).casefold()[:100]
+
+
+def _merge_user(apps, user_id, spellings):
+    """Create one Category per normalized name and point that user's expenses at it."""
+    Category = apps.get_model('expenses', 'Category')
+    Expense = apps.get_model('expenses', 'Expense')
+    groups = defaultdict(Counter)
+    for spelling, count in spellings:
+        key = normalize(spelling)
+        if key:
+            groups[key][spelling] += count
+
+    merged = False
+    for key, counts in groups.items():
+        # The most used spelling wins, preferring ones without stray whitespace
+        best = max(counts, key=lambda spelling: (counts[spelling], spelling == ' '.join(spelling.split())))
+        name = ' '.join(best.split())[:100]
+        category, _ = Category.objects.get_or_create(user_id=user_id, normalized=key, defaults={'name': name})
+        Expense.objects.filter(user_id=user_id, category__in=list(counts)).update(
+            category=category.name, category_ref=category
+        )
+        merged = merged or len(counts) > 1 or name not in counts
+    return merged
+
+
+def _rebuild_rollups(apps, user_ids):
+    Expense = apps.get_model('expenses', 'Expense')
+    ExpenseRollup = apps.get_model('expenses', 'ExpenseRollup')
+    ExpenseRollup.objects.filter(user_id__in=user_ids).delete()
+    rows = (
+        Expense.objects.filter(user_id__in=user_ids)
+        .annotate(rollup_category=Coalesce('category', Value('')))
+        .values('user_id', 'expense_date', 'rollup_category')
+        .annotate(total=Sum(Coalesce('amount_base', 'amount')), count=Count('id'))
+        .order_by()
+    )
+    ExpenseRollup.objects.bulk_create([
+        ExpenseRollup(
+            user_id=row['user_id'], month=row['expense_date'].replace(day=1), day=row['expense_date'],
+            category=row['rollup_category'], total=row['total'], count=row['count'],
+        )
+        for row in rows.iterator(chunk_size=BATCH_SIZE)
+    ], batch_size=BATCH_SIZE)
+
+
+def populate_categories(apps, schema_editor):
+    """
+    Dedupe existing category strings per user, in batches of distinct
+    (user, spelling) pairs, and re-aggregate the rollups of users whose
+    spellings were merged.
+    """
+    Expense = apps.get_model('expenses', 'Expense')
+    pairs = (
+        Expense.objects.exclude(category__isnull=True).exclude(category='')
+        .values_list('user_id', 'category')
+        .annotate(n=Count('id'))
+        .order_by('user_id', 'category')
+    )
+    merged_users = []
+    current_user, spellings = None, []
+    for user_id, spelling, count in pairs.iterator(chunk_size=BATCH_SIZE):
+        if user_id != current_user and spellings:
+            if _merge_user(apps, current_user, spellings):
+                merged_users.append(current_user)
+            spellings = []
+        current_user = user_id
+        spellings.append((spelling, count))
+    if spellings and _merge_user(apps, current_user, spellings):
+        merged_users.append(current_user)
+
+    for start in range(0, len(merged_users), BATCH_SIZE):
+        _rebuild_rollups(apps, merged_users[start:start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0007_expense_amount_base'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='expenses', to='expenses.category'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'category_ref'], name='expenses_ex_user_id_dcaa0f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='category',
+            unique_together={('user', 'normalized')},
+        ),
+        migrations.RunPython(populate_categories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+CENT = Decimal('0.01')
+
+
+def _rebuild_totals(apps, user_ids):
+    """Rebuild the rollups and budget spend of `user_ids` from their expenses."""
+    Expense = apps.get_model('expenses', 'Expense')
+    ExpenseRollup = apps.get_model('expenses', 'ExpenseRollup')
+    BudgetSpend = apps.get_model('budgets', 'BudgetSpend')
+
+    ExpenseRollup.objects.filter(user_id__in=user_ids).delete()
+    rows = (
+        Expense.objects.filter(user_id__in=user_ids)
+        .annotate(rollup_category=Coalesce('category', Value('')))
+        .values('user_id', 'expense_date', 'rollup_category')
+        .annotate(total=Sum(Coalesce('amount_base', 'amount')), count=Count('id'))
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(ExpenseRollup(
+            user_id=row['user_id'], month=row['expense_date'].replace(day=1), day=row['expense_date'],
+            category=row['rollup_category'], total=row['total'], count=row['count'],
+        ))
+        if len(batch) >= BATCH_SIZE:
+            ExpenseRollup.objects.bulk_create(batch)
+            batch = []
+    ExpenseRollup.objects.bulk_create(batch)
+
+    BudgetSpend.objects.filter(user_id__in=user_ids).delete()
+    rows = (
+        ExpenseRollup.objects.filter(user_id__in=user_ids)
+        .values('user_id', 'month', 'category').annotate(spent=Sum('total')).order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(BudgetSpend(**row))
+        if len(batch) >= BATCH_SIZE:
+            BudgetSpend.objects.bulk_create(batch)
+            batch = []
+    BudgetSpend.objects.bulk_create(batch)
+
+
+def backfill_amount_base(apps, schema_editor):
+    """
+    Fill amount_base on expenses saved before it existed: base-currency
+    rows in one UPDATE, others at the rate effective on their date where
+    one is loaded. Rows in a currency without a rate yet stay NULL and are
+    counted at `amount`; run `backfill_amount_base` after loading rates.
+    Users with converted rows get their rollups and budget spend rebuilt.
+    """
+    Expense = apps.get_model('expenses', 'Expense')
+    ExchangeRate = apps.get_model('currencies', 'ExchangeRate')
+    base = settings.BASE_CURRENCY
+
+    missing = Expense.objects.filter(amount_base__isnull=True)
+    missing.filter(currency__iexact=base).update(amount_base=F('amount'))
+    if not ExchangeRate.objects.exists():
+        return
+
+    rates = {}
+
+    def rate_for(currency, on_date):
+        key = (currency.upper(), on_date)
+        if key not in rates:
+            rates[key] = (
+                ExchangeRate.objects.filter(currency=key[0], date__lte=on_date)
+                .order_by('-date').values_list('rate', flat=True).first()
+            )
+        return rates[key]
+
+    queryset = missing.order_by('pk').only('pk', 'user_id', 'amount', 'currency', 'expense_date')
+    user_ids, last_pk = set(), None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        changed = []
+        for expense in batch:
+            rate = rate_for(expense.currency, expense.expense_date)
+            if rate is not None:
+                expense.amount_base = (expense.amount * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+                changed.append(expense)
+                user_ids.add(expense.user_id)
+        Expense.objects.bulk_update(changed, ['amount_base'])
+
+    user_ids = sorted(user_ids)
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        _rebuild_totals(apps, user_ids[start:start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0008_category'),
+        ('currencies', '0001_initial'),
+        # Runs after budget spend is first rebuilt from the rollups
+        ('budgets', '0003_budget_category_ref'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_amount_base, migrations.RunPython.noop),
+    ]
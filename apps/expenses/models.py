@@ -2,15 +2,48 @@ from django.db import models
 from django.conf import settings
 import uuid
 
+from apps.currencies.rates import to_base
+
+# Fields whose change requires recomputing amount_base
+CONVERSION_FIELDS = frozenset({'amount', 'currency', 'expense_date'})
+
+class Category(models.Model):
+    """
+    A user's category. `normalized` (case-folded, single-spaced) is unique
+    per user; `name` keeps the spelling it was first created with and is
+    what expenses and budgets display (see apps.expenses.categories).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='categories')
+    name = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['user', 'normalized']
+        ordering = ['name']
+        verbose_name_plural = 'categories'
+
+    def __str__(self):
+        return self.name
+
+
 class Expense(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='expenses')
     title = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     currency = models.CharField(max_length=3, default='USD')
+    # `amount` in settings.BASE_CURRENCY, set on write; null while no rate is known
+    amount_base = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    # Canonical category name, kept in step with category_ref on write
     category = models.CharField(max_length=100, blank=True, null=True)
+    category_ref = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='expenses'
+    )
     expense_date = models.DateField()
     notes = models.TextField(blank=True, null=True)
+    # Content hash set by statement imports, used to skip already-imported rows
+    fingerprint = models.CharField(max_length=64, blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,7 +52,72 @@ class Expense(models.Model):
         indexes = [
             models.Index(fields=['user', 'expense_date']),
             models.Index(fields=['user', 'category']),
+            models.Index(fields=['user', 'category_ref']),
+            models.Index(fields=['user', 'fingerprint']),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.amount} {self.currency}"
+
+    def save(self, *args, update_fields=None, **kwargs):
+        # A partial save also writes what the pre_save signal derives from the fields it names
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if CONVERSION_FIELDS & update_fields:
+                update_fields.add('amount_base')
+            if 'category' in update_fields:
+                update_fields.add('category_ref')
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    def set_amount_base(self):
+        self.amount_base = to_base(self.amount, self.currency, self.expense_date)
+
+    @property
+    def reporting_amount(self):
+        """The amount counted in rollups and summaries: `amount_base`, else `amount` as entered."""
+        return self.amount if self.amount_base is None else self.amount_base
+
+
+class ExpenseRollup(models.Model):
+    """
+    Per-(user, day, category) spend totals, maintained incrementally from
+    Expense writes (see apps.expenses.rollups). Uncategorised expenses are
+    stored under the empty category.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='expense_rollups')
+    month = models.DateField()
+    day = models.DateField()
+    category = models.CharField(max_length=100, blank=True, default='')
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'day', 'category']
+        indexes = [
+            models.Index(fields=['user', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.category or '-'}: {self.total} ({self.count})"
+
+
+class ExpenseSearchToken(models.Model):
+    """
+    Inverted index of the words in an expense's title and notes, used for
+    search on databases without PostgreSQL full-text search (see
+    apps.expenses.search). `user` is denormalised so lookups stay within
+    one user's (user, token) index range.
+    """
+    expense = models.ForeignKey(Expense, on_delete=models.CASCADE, related_name='search_tokens')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    token = models.CharField(max_length=64)
+    weight = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ['expense', 'token']
+        indexes = [
+            models.Index(fields=['user', 'token']),
+        ]
+
+    def __str__(self):
+        return f"{self.token} ({self.weight})"
@@ -0,0 +1,113 @@
+"""
+Pagination for the expense list.
+
+The default remains limit/offset. Clients opt into keyset pagination with
+`?pagination=cursor` and then follow the `next` link, which carries an
+opaque `cursor`. Keyset pages are ordered by (-expense_date, -created_at,
+id) and filter on the last row seen instead of using OFFSET, so deep pages
+cost the same as the first one and rows inserted while paging don't shift
+or repeat results. The total count is only computed when `count=true`.
+Keyset pages always use that order, so `ordering` is rejected with a 400
+rather than silently ignored.
+"""
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ExpensePagination(LimitOffsetPagination):
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    keyset_ordering = ('-expense_date', '-created_at', 'id')
+    max_cursor_limit = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering_param = api_settings.ORDERING_PARAM
+        if request.query_params.get(ordering_param):
+            raise ValidationError({ordering_param: [
+                f"Not supported with {self.mode_query_param}=cursor; keyset pages are ordered by "
+                f"{','.join(self.keyset_ordering)}."
+            ]})
+
+        self.request = request
+        self.limit = min(self.get_limit(request), self.max_cursor_limit)
+        queryset = queryset.order_by(*self.keyset_ordering)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.count()
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            expense_date, created_at, pk = position
+            queryset = queryset.filter(
+                Q(expense_date__lt=expense_date)
+                | Q(expense_date=expense_date, created_at__lt=created_at)
+                | Q(expense_date=expense_date, created_at=created_at, id__gt=pk)
+            )
+
+        rows = list(queryset[:self.limit + 1])
+        self.next_position = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            # Rows are model instances or values_list(named=True) tuples
+            self.next_position = (last.expense_date, last.created_at, last.id)
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        payload = {'next': self.get_next_link()}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position):
+        expense_date, created_at, pk = position
+        raw = json.dumps([expense_date.isoformat(), created_at.isoformat(), str(pk)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw_date, raw_created_at, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            expense_date, created_at = parse_date(raw_date), parse_datetime(raw_created_at)
+            pk = uuid.UUID(pk)
+        except (AttributeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if expense_date is None or created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return expense_date, created_at, pk
@@ -0,0 +1,116 @@
+"""
+Spend report over a year, a quarter, a month or a custom date range.
+
+Every period is turned into an inclusive `day` range before querying, so
+the filter is a plain range over the (user, day, category) unique index
+of ExpenseRollup rather than a function of the date column. The report
+is then one grouped query: a row per category with its total and count
+over the range and, through conditional aggregation (SUM ... FILTER),
+its total and count for every month of the range. The overall totals,
+category breakdown, monthly trend and averages are all derived from
+those rows in Python, at most EXPENSE_REPORT_MAX_MONTHS months wide.
+"""
+import calendar
+import re
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Q, Sum
+
+from .models import ExpenseRollup
+from .timeseries import bucket_starts
+
+CENT = Decimal('0.01')
+QUARTER = re.compile(r'^(\d{4})-Q([1-4])$')
+
+
+def last_day(year, month):
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def year_range(year):
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def quarter_range(value):
+    """Parse YYYY-Qn into the first and last day of that quarter."""
+    match = QUARTER.match(value)
+    if not match:
+        raise ValueError(f'Invalid quarter {value!r}; use YYYY-Q1 to YYYY-Q4.')
+    year, quarter = int(match[1]), int(match[2])
+    return date(year, 3 * quarter - 2, 1), last_day(year, 3 * quarter)
+
+
+def month_range(value):
+    """The first and last day of the month containing `value`."""
+    return value.replace(day=1), last_day(value.year, value.month)
+
+
+def count_months(start, end):
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def _money(value):
+    # SQLite sums decimals as floats; report whole cents on every backend
+    return Decimal(value or 0).quantize(CENT)
+
+
+def _average(total, divisor):
+    return (total / divisor).quantize(CENT) if divisor else Decimal('0')
+
+
+def build_report(user_id, start, end):
+    """Totals, per-category breakdown, monthly trend and averages for expenses dated start..end."""
+    months = list(bucket_starts('month', start, end))
+    monthly = {}
+    for index, month in enumerate(months):
+        monthly[f'm{index}_spend'] = Sum('total', filter=Q(month=month))
+        monthly[f'm{index}_expenses'] = Sum('count', filter=Q(month=month))
+    rows = list(
+        ExpenseRollup.objects
+        .filter(user_id=user_id, day__gte=start, day__lte=end)
+        .values('category')
+        .annotate(spend=Sum('total'), expenses=Sum('count'), **monthly)
+        .order_by()
+    )
+
+    total = _money(sum((row['spend'] for row in rows), Decimal('0')))
+    count = sum(row['expenses'] for row in rows)
+    trend = [
+        {
+            'month': month,
+            'total': _money(sum((row[f'm{index}_spend'] or 0 for row in rows), Decimal('0'))),
+            'count': sum(row[f'm{index}_expenses'] or 0 for row in rows),
+        }
+        for index, month in enumerate(months)
+    ]
+    breakdown = sorted(
+        (
+            {
+                # Uncategorised spend is stored under ''
+                'category': row['category'] or None,
+                'total': _money(row['spend']),
+                'count': row['expenses'],
+                'share': (row['spend'] * 100 / total).quantize(Decimal('0.1')) if total else Decimal('0'),
+                'average': _average(row['spend'], row['expenses']),
+            }
+            for row in rows
+        ),
+        key=lambda item: (-item['total'], item['category'] or ''),
+    )
+    days = (end - start).days + 1
+    return {
+        'from_date': start,
+        'to_date': end,
+        'currency': settings.BASE_CURRENCY,
+        'total_spend': total,
+        'count': count,
+        'averages': {
+            'per_expense': _average(total, count),
+            'per_day': _average(total, days),
+            'per_month': _average(total, len(months)),
+        },
+        'breakdown': breakdown,
+        'monthly': trend,
+    }
@@ -0,0 +1,191 @@
+"""
+Maintenance of the ExpenseRollup table.
+
+Every write to Expense is turned into a set of deltas keyed by
+(user_id, day, category) and applied with single-row UPDATEs, so the
+summary endpoint only ever aggregates a bounded number of rollup rows
+per month instead of the user's full expense history. Totals are in the
+base currency (Expense.reporting_amount).
+
+Code paths that bypass model signals (bulk_create, queryset.update, ...)
+must submit deltas themselves, and `rebuild` can always be used to
+recompute the table from raw Expense rows. Inside a `batch()` block,
+deltas (including those from signals) are merged and applied once when
+the block exits, so bulk writes touch each rollup row only once.
+
+The same deltas also keep the per-month BudgetSpend table current (see
+apps.budgets.spend).
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.budgets import spend
+from .models import Expense, ExpenseRollup
+
+_active_batch = ContextVar('expense_rollup_batch', default=None)
+
+
+def _as_decimal(value):
+    return Expense._meta.get_field('amount').to_python(value) or Decimal('0')
+
+
+def _as_date(value):
+    return Expense._meta.get_field('expense_date').to_python(value)
+
+
+def expense_key(user_id, expense_date, category):
+    return (user_id, _as_date(expense_date), category or '')
+
+
+def new_deltas():
+    return defaultdict(lambda: [Decimal('0'), 0])
+
+
+def add_expense(deltas, user_id, expense_date, category, amount, sign=1):
+    """Accumulate the effect of adding (sign=1) or removing (sign=-1) one expense."""
+    entry = deltas[expense_key(user_id, expense_date, category)]
+    entry[0] += sign * _as_decimal(amount)
+    entry[1] += sign
+    return deltas
+
+
+@contextmanager
+def batch():
+    """Collect deltas submitted inside the block and apply them on exit."""
+    deltas = _active_batch.get()
+    if deltas is not None:
+        # Nested: the outermost block applies everything
+        yield deltas
+        return
+    deltas = new_deltas()
+    token = _active_batch.set(deltas)
+    try:
+        yield deltas
+    finally:
+        _active_batch.reset(token)
+    apply_deltas(deltas)
+
+
+def submit(deltas):
+    """Apply deltas now, or merge them into the active batch if there is one."""
+    pending = _active_batch.get()
+    if pending is None:
+        apply_deltas(deltas)
+        return
+    for key, (amount, count) in deltas.items():
+        entry = pending[key]
+        entry[0] += amount
+        entry[1] += count
+
+
+def apply_deltas(deltas):
+    """Apply accumulated deltas to the rollup and budget spend tables."""
+    for (user_id, day, category), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+        with transaction.atomic():
+            _apply_one(user_id, day, category, amount, count)
+    spend.apply_deltas(spend.month_deltas(deltas))
+
+
+def _apply_one(user_id, day, category, amount, count):
+    rows = ExpenseRollup.objects.filter(user_id=user_id, day=day, category=category)
+    updated = rows.update(total=F('total') + amount, count=F('count') + count)
+    if not updated:
+        if count <= 0:
+            # Nothing to subtract from; the table is out of sync and needs a rebuild.
+            return
+        try:
+            with transaction.atomic():
+                ExpenseRollup.objects.create(
+                    user_id=user_id,
+                    month=day.replace(day=1),
+                    day=day,
+                    category=category,
+                    total=amount,
+                    count=count,
+                )
+        except IntegrityError:
+            # Created concurrently by another writer
+            rows.update(total=F('total') + amount, count=F('count') + count)
+    elif count < 0:
+        rows.filter(count__lte=0).delete()
+
+
+def _expected_rows(user_ids=None):
+    queryset = Expense.objects.all()
+    if user_ids is not None:
+        queryset = queryset.filter(user_id__in=user_ids)
+    return (
+        queryset
+        .annotate(rollup_category=Coalesce('category', Value('')))
+        .values('user_id', 'expense_date', 'rollup_category')
+        .annotate(total=Sum(Coalesce('amount_base', 'amount')), count=Count('id'))
+        .order_by()
+    )
+
+
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recompute rollups, and budget spend from them, from raw Expense rows.
+    Returns the number of rollup rows written.
+    """
+    written = 0
+    with transaction.atomic():
+        existing = ExpenseRollup.objects.all()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+        existing.delete()
+
+        batch = []
+        for row in _expected_rows(user_ids).iterator(chunk_size=batch_size):
+            day = row['expense_date']
+            batch.append(ExpenseRollup(
+                user_id=row['user_id'],
+                month=day.replace(day=1),
+                day=day,
+                category=row['rollup_category'],
+                total=row['total'],
+                count=row['count'],
+            ))
+            if len(batch) >= batch_size:
+                ExpenseRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            ExpenseRollup.objects.bulk_create(batch)
+            written += len(batch)
+        spend.rebuild(user_ids, batch_size)
+    return written
+
+
+def verify(user_ids=None):
+    """
+    Compare rollups against raw Expense rows. Returns a list of
+    (key, expected, actual) tuples for every mismatching key, where
+    expected/actual are (total, count) pairs or None when missing.
+    """
+    expected = {
+        (row['user_id'], row['expense_date'], row['rollup_category']): (row['total'], row['count'])
+        for row in _expected_rows(user_ids).iterator()
+    }
+    actual_qs = ExpenseRollup.objects.all()
+    if user_ids is not None:
+        actual_qs = actual_qs.filter(user_id__in=user_ids)
+    actual = {
+        (row['user_id'], row['day'], row['category']): (row['total'], row['count'])
+        for row in actual_qs.values('user_id', 'day', 'category', 'total', 'count').iterator()
+    }
+
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        exp, act = expected.get(key), actual.get(key)
+        if exp != act:
+            mismatches.append((key, exp, act))
+    return mismatches
@@ -0,0 +1,180 @@
+"""
+Full-text search over expense titles and notes.
+
+`?search=` is split into words; an expense matches when every word
+prefixes a word of its title or notes (so "coff star" finds "Starbucks
+coffee"), within the requesting user's expenses only. Results are ranked
+with title matches above notes matches, unless the client asked for an
+explicit `ordering`.
+
+Two interchangeable index implementations:
+
+* PostgreSQL: a stored generated `search_vector` tsvector column with a
+  GIN index (migration 0006), queried with to_tsquery prefix terms and
+  ranked by ts_rank. The database maintains it on every write.
+* Anything else (SQLite in tests and benchmarks): the ExpenseSearchToken
+  inverted index, one row per distinct word and expense, maintained by
+  the expense signals and the bulk write paths. Each word is a range scan
+  on the (user, token) index.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import BooleanField, Case, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Expense, ExpenseSearchToken
+
+TOKEN_RE = re.compile(r'\w+')
+TOKEN_MAX_LENGTH = ExpenseSearchToken._meta.get_field('token').max_length
+# Indexed fields and their weight; PostgreSQL uses labels A and B for these.
+WEIGHTS = (('title', 2), ('notes', 1))
+MAX_TERMS = 8
+# Upper bound for prefix range scans: no code point sorts after it.
+_RANGE_END = chr(0x10FFFF)
+
+
+def uses_tsvector(using=None):
+    return connections[using or Expense.objects.db].vendor == 'postgresql'
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return [token[:TOKEN_MAX_LENGTH] for token in TOKEN_RE.findall(text.lower())]
+
+
+def parse_query(query):
+    """Return the distinct search terms of a query string, at most MAX_TERMS of them."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    return terms[:MAX_TERMS]
+
+
+def expense_tokens(title, notes):
+    """Map each word of an expense to its highest field weight."""
+    tokens = {}
+    for (field, weight), text in zip(WEIGHTS, (title, notes)):
+        for token in tokenize(text):
+            tokens[token] = max(weight, tokens.get(token, 0))
+    return tokens
+
+
+def _token_rows(expense_id, user_id, title, notes):
+    return [
+        ExpenseSearchToken(expense_id=expense_id, user_id=user_id, token=token, weight=weight)
+        for token, weight in expense_tokens(title, notes).items()
+    ]
+
+
+def index_expenses(expenses, batch_size=None):
+    """(Re)build the token index for the given saved expenses."""
+    if uses_tsvector():
+        return
+    batch_size = batch_size or settings.EXPENSE_BULK_BATCH_SIZE
+    expenses = list(expenses)
+    with transaction.atomic():
+        for start in range(0, len(expenses), batch_size):
+            chunk = expenses[start:start + batch_size]
+            ExpenseSearchToken.objects.filter(expense_id__in=[expense.pk for expense in chunk]).delete()
+            rows = []
+            for expense in chunk:
+                rows.extend(_token_rows(expense.pk, expense.user_id, expense.title, expense.notes))
+            ExpenseSearchToken.objects.bulk_create(rows, batch_size=batch_size)
+
+
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recompute the token index from raw Expense rows. Returns the number of
+    token rows written (always 0 on PostgreSQL, which needs no rebuild).
+    """
+    if uses_tsvector():
+        return 0
+    written = 0
+    with transaction.atomic():
+        existing = ExpenseSearchToken.objects.all()
+        expenses = Expense.objects.order_by()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+            expenses = expenses.filter(user_id__in=user_ids)
+        existing.delete()
+
+        batch = []
+        for row in expenses.values_list('pk', 'user_id', 'title', 'notes').iterator(chunk_size=batch_size):
+            batch.extend(_token_rows(*row))
+            if len(batch) >= batch_size:
+                ExpenseSearchToken.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            ExpenseSearchToken.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def _tsvector_search(queryset, terms):
+    column = f'"{Expense._meta.db_table}"."search_vector"'
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    return queryset.filter(
+        RawSQL(f"{column} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f"ts_rank({column}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+    )
+
+
+def _prefix(term):
+    return {'token__gte': term, 'token__lt': term + _RANGE_END}
+
+
+def _token_index_search(queryset, terms, user_id):
+    tokens = ExpenseSearchToken.objects.filter(user_id=user_id)
+    for term in terms:
+        queryset = queryset.filter(pk__in=tokens.filter(**_prefix(term)).values('expense_id'))
+
+    # Field weight first, then a bonus for exact words: "tea" ranks a "Tea"
+    # title above "Team lunch", and both above a notes-only match. Not
+    # filtered on user, so it is a lookup on the (expense, token) index.
+    matching = Q()
+    for term in terms:
+        matching |= Q(**_prefix(term))
+    rank = (
+        ExpenseSearchToken.objects.filter(matching, expense_id=OuterRef('pk'))
+        .annotate(score=Case(
+            When(token__in=terms, then=F('weight') * 2 + 1), default=F('weight') * 2, output_field=IntegerField()
+        ))
+        .values('expense_id')
+        .annotate(total=Sum('score'))
+        .values('total')
+    )
+    return queryset.annotate(search_rank=Coalesce(Subquery(rank), 0, output_field=FloatField()))
+
+
+def search_expenses(queryset, query, user_id):
+    """
+    Filter a user's expense queryset down to matches for `query`, annotated
+    with `search_rank` (higher is better). Blank queries match everything.
+    """
+    terms = parse_query(query)
+    if not terms:
+        return queryset
+    if uses_tsvector(queryset.db):
+        return _tsvector_search(queryset, terms)
+    return _token_index_search(queryset, terms, user_id)
+
+
+class ExpenseSearchFilter(BaseFilterBackend):
+    """
+    `?search=` backed by the search index. Must come after OrderingFilter:
+    without an explicit `ordering` parameter, results are sorted by rank.
+    """
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        searched = search_expenses(queryset, query, request.user.pk)
+        if searched is queryset or request.query_params.get(self.ordering_param):
+            return searched
+        return searched.order_by('-search_rank', *(queryset.query.order_by or Expense._meta.ordering))
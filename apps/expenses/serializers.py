@@ -1,10 +1,68 @@
+import uuid
 from rest_framework import serializers
+from apps.common.profiling import TimedSerializerMixin
+from apps.common.serializers import ValuesSerializer
 from .models import Expense
+from . import bulk, reports
+from django.conf import settings
 from django.utils import timezone
 
-class ExpenseSerializer(serializers.ModelSerializer):
+
+def parse_expense_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class ExpenseListSerializer(serializers.ListSerializer):
+    """
+    List-mode serializer used by the bulk endpoint. Creates go through
+    bulk_create and updates through bulk_update (see apps.expenses.bulk).
+    For updates, `instance` is an iterable of expenses and every item in
+    the payload must carry the `id` of one of them.
+    """
+
+    def _instances_by_id(self):
+        if not hasattr(self, '_instance_map'):
+            self._instance_map = {expense.pk: expense for expense in self.instance}
+        return self._instance_map
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        pk = parse_expense_id(data.get('id')) if isinstance(data, dict) else None
+        instance = self._instances_by_id().get(pk)
+        if instance is None:
+            raise serializers.ValidationError({'id': ['Unknown expense.']})
+
+        self.child.instance = instance
+        self.child.initial_data = data
+        attrs = super().run_child_validation(data)
+        attrs['id'] = pk
+        return attrs
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            ids = [item['id'] for item in attrs]
+            if len(ids) != len(set(ids)):
+                raise serializers.ValidationError("Each expense may only appear once.")
+        return attrs
+
+    def create(self, validated_data):
+        return bulk.create_expenses(validated_data)
+
+    def update(self, instance, validated_data):
+        instances_by_id = self._instances_by_id()
+        instances = [instances_by_id[attrs.pop('id')] for attrs in validated_data]
+        return bulk.update_expenses(instances, validated_data)
+
+
+class ExpenseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Expense
+        list_serializer_class = ExpenseListSerializer
         fields = [
             'id', 'title', 'amount', 'currency', 'category', 
             'expense_date', 'notes', 'created_at', 'updated_at'
@@ -27,3 +85,53 @@ class ExpenseSerializer(serializers.ModelSerializer):
         # Ensure user is attached (though view usually handles this via perform_create, 
         # it's good practice or we can pop it from context if needed, but view perform_create is standard)
         return super().create(validated_data)
+
+
+class ExpenseValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Same output as ExpenseSerializer(many=True), from values_list() rows; used for list pages."""
+    serializer_class = ExpenseSerializer
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(choices=['day', 'week', 'month', 'year'], default='month')
+    from_date = serializers.DateField(required=False)
+    to_date = serializers.DateField(required=False)
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    """
+    One period: year=YYYY, quarter=YYYY-Qn, month=YYYY-MM or
+    from_date/to_date (to_date defaults to today); the current year by
+    default. Validates into {'period', 'from_date', 'to_date'}.
+    """
+    year = serializers.IntegerField(required=False, min_value=1, max_value=9999)
+    quarter = serializers.RegexField(reports.QUARTER, required=False)
+    month = serializers.DateField(required=False, input_formats=['%Y-%m'])
+    from_date = serializers.DateField(required=False)
+    to_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        periods = [name for name in ('year', 'quarter', 'month') if name in attrs]
+        custom = 'from_date' in attrs or 'to_date' in attrs
+        if len(periods) + custom > 1:
+            raise serializers.ValidationError("Give only one of year, quarter, month or from_date/to_date.")
+
+        if 'year' in attrs:
+            period, (start, end) = 'year', reports.year_range(attrs['year'])
+        elif 'quarter' in attrs:
+            period, (start, end) = 'quarter', reports.quarter_range(attrs['quarter'])
+        elif 'month' in attrs:
+            period, (start, end) = 'month', reports.month_range(attrs['month'])
+        elif custom:
+            if 'from_date' not in attrs:
+                raise serializers.ValidationError({'from_date': ['Required with to_date.']})
+            period, start, end = 'custom', attrs['from_date'], attrs.get('to_date', timezone.localdate())
+        else:
+            period, (start, end) = 'year', reports.year_range(timezone.localdate().year)
+
+        if start > end:
+            raise serializers.ValidationError({'from_date': ['Must not be after to_date.']})
+        max_months = settings.EXPENSE_REPORT_MAX_MONTHS
+        if reports.count_months(start, end) > max_months:
+            raise serializers.ValidationError(f"The range spans more than {max_months} months.")
+        return {'period': period, 'from_date': start, 'to_date': end}
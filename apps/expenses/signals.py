@@ -0,0 +1,57 @@
+from django.db.models.functions import Coalesce
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.common.cache import invalidate_user
+from . import categories, rollups, search
+from .models import CONVERSION_FIELDS, Expense
+
+
+@receiver(pre_save, sender=Expense)
+def remember_previous_rollup_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._rollup_previous = None
+    if raw:
+        return
+    # Only derive what this save writes (Expense.save adds the derived fields)
+    if update_fields is None or 'category' in update_fields:
+        categories.assign([instance])
+    if update_fields is None or CONVERSION_FIELDS & update_fields:
+        instance.set_amount_base()
+    if instance._state.adding:
+        return
+    instance._rollup_previous = (
+        Expense.objects
+        .filter(pk=instance.pk)
+        .values_list('user_id', 'expense_date', 'category', Coalesce('amount_base', 'amount'))
+        .first()
+    )
+
+
+@receiver(post_save, sender=Expense)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = rollups.new_deltas()
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous:
+        rollups.add_expense(deltas, *previous, sign=-1)
+    rollups.add_expense(
+        deltas, instance.user_id, instance.expense_date, instance.category, instance.reporting_amount
+    )
+    rollups.submit(deltas)
+    invalidate_user(instance.user_id, 'expenses')
+
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or {'title', 'notes'} & set(update_fields):
+        search.index_expenses([instance])
+
+
+@receiver(post_delete, sender=Expense)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    deltas = rollups.add_expense(
+        rollups.new_deltas(),
+        instance.user_id, instance.expense_date, instance.category, instance.reporting_amount,
+        sign=-1,
+    )
+    rollups.submit(deltas)
+    invalidate_user(instance.user_id, 'expenses')
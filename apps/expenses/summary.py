@@ -0,0 +1,74 @@
+"""
+Building blocks of the expense summary, shared by the sync and async views.
+
+`SummaryQueries` holds the (lazy) querysets over the rollup table and
+budgets; the views evaluate them with the sync or async ORM and hand the
+results to `build_summary`.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import F, Sum
+
+from apps.budgets.models import Budget
+from .models import ExpenseRollup
+
+TOTALS = {'total': Sum('total'), 'count': Sum('count')}
+
+
+def parse_month(value):
+    """Parse an optional YYYY-MM string into the first day of that month."""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+class SummaryQueries:
+    def __init__(self, user_id, month=None):
+        self.rollups = ExpenseRollup.objects.filter(user_id=user_id)
+        if month:
+            self.rollups = self.rollups.filter(month=month)
+
+        # Group by category
+        self.by_category = self.rollups.values('category').annotate(**TOTALS).order_by('-total')
+        self.budgets = Budget.objects.filter(user_id=user_id).values_list('category', 'amount')
+        # Group by date for timeline
+        self.timeline = self.rollups.values(expense_date=F('day')).annotate(
+            total=Sum('total')
+        ).order_by('expense_date')
+
+
+def build_summary(totals, by_category, budgets, timeline):
+    budget_map = dict(budgets)
+
+    # Merge expenses and budgets
+    breakdown = []
+    processed_categories = set()
+
+    for item in by_category:
+        cat = item['category']
+        if not cat: continue # Skip uncategorised spend
+        processed_categories.add(cat)
+        item['budget'] = budget_map.get(cat, 0)
+        breakdown.append(item)
+
+    # Add categories with budgets but no expenses
+    for cat, amount in budget_map.items():
+        if cat not in processed_categories:
+            breakdown.append({
+                'category': cat,
+                'total': 0,
+                'count': 0,
+                'budget': amount
+            })
+
+    # Sort by total spending desc, then category
+    breakdown.sort(key=lambda x: (-x['total'], x['category']))
+
+    return {
+        "total_spend": totals['total'] or 0,
+        "currency": settings.BASE_CURRENCY,
+        "breakdown": breakdown,
+        "timeline": list(timeline),
+        "count": totals['count'] or 0
+    }
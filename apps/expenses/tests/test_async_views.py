@@ -0,0 +1,104 @@
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.expenses import async_views
+from apps.expenses.models import Expense
+from apps.budgets.models import Budget
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestAsyncExpenseViews:
+    def setup_method(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.other = User.objects.create_user(email='other@example.com', password='password123', is_email_verified=True)
+        for day in range(1, 6):
+            Expense.objects.create(user=self.user, title=f'Item {day}', amount=day * 10, expense_date=f'2023-10-0{day}', category='Food')
+        Expense.objects.create(user=self.user, title='Bus', amount=3, expense_date='2023-09-30', category='Transport')
+        Expense.objects.create(user=self.other, title='Other', amount=99, expense_date='2023-10-01', category='Food')
+        Budget.objects.create(user=self.user, category='Food', amount=200)
+
+        self.factory = AsyncRequestFactory()
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def call(self, view, path, params=None, **headers):
+        request = self.factory.get(path, params or {}, headers={**self.auth, **headers})
+        return async_to_sync(view)(request)
+
+    def test_list_matches_sync_viewset(self):
+        params = {'limit': 2, 'offset': 1, 'category': 'Food', 'ordering': 'amount'}
+        url = reverse('expense-list')
+        response = self.call(async_views.expense_list, url, params)
+        expected = self.client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == json.loads(expected.content)
+        assert response['ETag'] == expected['ETag']
+
+    def test_list_fields_match_sync_viewset(self):
+        url = reverse('expense-list')
+        for params in ({'fields': 'amount,id'}, {'fields': 'amount,bogus'}):
+            response = self.call(async_views.expense_list, url, params)
+            expected = self.client.get(url, params)
+            assert response.status_code == expected.status_code
+            assert json.loads(response.content) == json.loads(expected.content)
+
+    def test_list_returns_304_for_matching_etag(self):
+        url = reverse('expense-list')
+        etag = self.call(async_views.expense_list, url)['ETag']
+        response = self.call(async_views.expense_list, url, **{'If-None-Match': etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_summary_matches_sync_viewset(self):
+        url = reverse('expense-summary')
+        for params in ({}, {'month': '2023-10'}):
+            response = self.call(async_views.expense_summary, url, params)
+            assert response.status_code == status.HTTP_200_OK
+            assert json.loads(response.content) == json.loads(self.client.get(url, params).content)
+
+        response = self.call(async_views.expense_summary, url, {'month': 'October'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_summary_shares_the_sync_cache_and_validators(self, django_assert_num_queries):
+        url = reverse('expense-summary')
+        params = {'month': '2023-10'}
+        expected = self.client.get(url, params)
+        with django_assert_num_queries(1):  # authentication only: the sync view's entry is reused
+            response = self.call(async_views.expense_summary, url, params)
+        assert json.loads(response.content) == json.loads(expected.content)
+        assert response['ETag'] == expected['ETag']
+        response = self.call(async_views.expense_summary, url, params, **{'If-None-Match': expected['ETag']})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        Expense.objects.create(user=self.user, title='Late', amount=7, expense_date='2023-10-09', category='Food')
+        response = self.call(async_views.expense_summary, url, params, **{'If-None-Match': expected['ETag']})
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content)['total_spend'] == json.loads(expected.content)['total_spend'] + 7
+
+    def test_export_streams_filtered_csv(self):
+        async def export(request):
+            response = await async_views.expense_export(request)
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        request = self.factory.get(reverse('expense-export'), {'from_date': '2023-10-01'}, headers=self.auth)
+        response, content = async_to_sync(export)(request)
+        assert response.status_code == status.HTTP_200_OK
+        lines = content.decode().strip().splitlines()
+        assert len(lines) == 6  # header + five October rows
+        assert 'Other' not in ''.join(lines)
+
+    def test_requires_authentication_and_verified_email(self):
+        url = reverse('expense-list')
+        response = async_to_sync(async_views.expense_list)(self.factory.get(url))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        unverified = User.objects.create_user(email='new@example.com', password='password123')
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(unverified)}'}
+        assert self.call(async_views.expense_summary, reverse('expense-summary')).status_code == status.HTTP_403_FORBIDDEN
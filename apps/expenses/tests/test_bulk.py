@@ -0,0 +1,76 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense, ExpenseRollup
+from apps.expenses import rollups
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestBulkExpenses:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('expense-bulk')
+
+    def rows(self, count):
+        return [
+            {'title': f'Row {i}', 'amount': '10.00', 'category': 'Food', 'expense_date': '2023-10-01'}
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self, settings):
+        settings.EXPENSE_BULK_BATCH_SIZE = 7
+        response = self.client.post(self.url, self.rows(25), format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 25
+        assert Expense.objects.filter(user=self.user).count() == 25
+        rollup = ExpenseRollup.objects.get(user=self.user, day=date(2023, 10, 1), category='Food')
+        assert (rollup.total, rollup.count) == (Decimal('250.00'), 25)
+
+    def test_bulk_create_reports_row_errors_and_writes_nothing(self):
+        rows = self.rows(3)
+        rows[1]['amount'] = '-5'
+        rows[2]['expense_date'] = '2999-01-01'
+        response = self.client.post(self.url, rows, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        details = response.data['error']['details']
+        assert set(details) == {1, 2}
+        assert 'amount' in details[1] and 'expense_date' in details[2]
+        assert not Expense.objects.exists()
+
+    def test_bulk_create_rejects_oversized_payload(self, settings):
+        settings.EXPENSE_BULK_MAX_ROWS = 2
+        response = self.client.post(self.url, self.rows(3), format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_update_and_delete(self):
+        other = User.objects.create_user(email='other@example.com', password='password123', is_email_verified=True)
+        mine = [
+            Expense.objects.create(user=self.user, title=f'Row {i}', amount=10, expense_date=date(2023, 10, 1), category='Food')
+            for i in range(3)
+        ]
+        theirs = Expense.objects.create(user=other, title='Theirs', amount=10, expense_date=date(2023, 10, 1))
+
+        response = self.client.patch(self.url, [
+            {'id': str(mine[0].id), 'amount': '25.00'},
+            {'id': str(mine[1].id), 'category': 'Travel'},
+        ], format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 2
+        mine[0].refresh_from_db()
+        assert mine[0].amount == Decimal('25.00') and mine[0].updated_at > mine[0].created_at
+
+        # Other users' expenses are unknown ids
+        response = self.client.patch(self.url, [{'id': str(theirs.id), 'amount': '1.00'}], format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.delete(self.url, [str(mine[2].id), str(theirs.id)], format='json')
+        assert response.data['deleted'] == 1
+        assert Expense.objects.filter(pk=theirs.pk).exists()
+        assert rollups.verify() == []
@@ -0,0 +1,79 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.budgets.models import Budget
+from apps.expenses.models import Category, Expense
+from apps.expenses import categories
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestCategories:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+
+    def add(self, category, amount=10, user=None):
+        return Expense.objects.create(
+            user=user or self.user, title='Item', amount=amount, expense_date='2023-10-01', category=category
+        )
+
+    def test_spellings_share_one_category(self):
+        first = self.add('Eating  Out')
+        second = self.add(' eating out')
+        third = self.add('EATING OUT')
+        assert Category.objects.filter(user=self.user).count() == 1
+        assert {e.category for e in (first, second, third)} == {'Eating Out'}
+        assert first.category_ref_id == second.category_ref_id == third.category_ref_id
+
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        assert self.add('eating out', user=other).category_ref_id != first.category_ref_id
+        assert categories.normalize('  Eating\tOUT ') == 'eating out'
+
+    def test_filter_is_case_insensitive_and_uses_the_category_key(self, django_assert_max_num_queries):
+        self.add('Food')
+        self.add('food')
+        self.add('Travel')
+        response = self.client.get(reverse('expense-list'), {'category': 'FOOD'})
+        assert response.data['count'] == 2
+        assert self.client.get(reverse('expense-list'), {'category': 'Unknown'}).data['count'] == 0
+
+        with django_assert_max_num_queries(10) as captured:
+            self.client.get(reverse('expense-list'), {'category': 'food'})
+        sql = ' '.join(query['sql'] for query in captured.captured_queries)
+        assert '"category_ref_id" =' in sql
+        assert 'LIKE' not in sql and 'UPPER' not in sql
+
+    def test_summary_merges_spellings_with_budgets(self):
+        Budget.objects.create(user=self.user, category='food', amount=100)
+        self.add('Food', amount=10)
+        self.add('FOOD', amount=5)
+        breakdown = self.client.get(reverse('expense-summary')).data['breakdown']
+        assert len(breakdown) == 1
+        assert breakdown[0]['category'] == 'food'
+        assert breakdown[0]['count'] == 2
+        assert float(breakdown[0]['budget']) == 100
+
+    def test_budgets_are_unique_per_category_regardless_of_case(self):
+        response = self.client.post(reverse('budget-list'), {'category': 'Rent', 'amount': '500.00'})
+        assert response.status_code == status.HTTP_201_CREATED
+        response = self.client.post(reverse('budget-list'), {'category': ' rent', 'amount': '400.00'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_writes_resolve_categories_in_one_pass(self):
+        self.add('Food')
+        rows = [{'title': f'Item {i}', 'amount': '1.00', 'expense_date': '2023-10-02', 'category': c}
+                for i, c in enumerate(['food', 'FOOD', 'Books', 'books'])]
+        response = self.client.post(reverse('expense-bulk'), rows, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(Category.objects.values_list('name', flat=True)) == ['Books', 'Food']
+        assert set(Expense.objects.values_list('category', flat=True)) == {'Books', 'Food'}
+
+        expense = Expense.objects.filter(category='Books').first()
+        patch = [{'id': str(expense.pk), 'category': 'food'}]
+        assert self.client.patch(reverse('expense-bulk'), patch, format='json').status_code == status.HTTP_200_OK
+        expense.refresh_from_db()
+        assert (expense.category, expense.category_ref.name) == ('Food', 'Food')
@@ -69,6 +69,21 @@ class TestExpenses:
         assert b'Lunch' in content
         assert b'10.00' in content
 
+    def test_csv_export_streams_filtered_rows_in_chunks(self, settings):
+        settings.EXPENSE_EXPORT_BUFFER_SIZE = 256
+        for i in range(20):
+            Expense.objects.create(user=self.user, title=f'Item {i}', amount=10, expense_date=date(2023, 10, 1 + i), category='Food')
+        Expense.objects.create(user=self.user, title='Taxi', amount=20, expense_date=date(2023, 10, 2), category='Transport')
+
+        response = self.client.get(reverse('expense-export'), {'category': 'food'})
+        assert response.streaming
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 1
+        lines = b"".join(chunks).decode().splitlines()
+        assert lines[0] == 'ID,Date,Title,Amount,Currency,Category,Notes'
+        assert len(lines) == 21
+        assert not any('Taxi' in line for line in lines)
+
     def test_user_expense_isolation(self):
         other_user = User.objects.create_user(email='other@example.com', password='password123', is_email_verified=True)
         Expense.objects.create(user=other_user, title='Secret', amount=100, expense_date=date(2023, 10, 1))
@@ -0,0 +1,126 @@
+import io
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense, ExpenseRollup
+from apps.expenses import importers
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+CSV_STATEMENT = b"""Date,Description,Amount,Currency,Memo
+2023-10-01,Coffee Shop,-4.50,USD,
+02/10/2023,Grocery Store,"-1,234.00",USD,weekly shop
+2023-10-03,Bad Row,abc,USD,
+"""
+
+OFX_STATEMENT = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>EUR
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20231005120000<TRNAMT>-12.30<FITID>A1<NAME>Bakery<MEMO>Bread</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20231006<TRNAMT>1000.00<FITID>A2<NAME>Salary</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20231007<TRNAMT>-12.30<FITID>A3<NAME>Bakery</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+@pytest.mark.django_db
+class TestStatementImport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('expense-import-statement')
+
+    def upload(self, name, content, **extra):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, content), **extra}, format='multipart')
+
+    def test_csv_import_and_reimport_is_deduplicated(self):
+        response = self.upload('statement.csv', CSV_STATEMENT)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 2
+        assert response.data['invalid'] == 1
+        assert response.data['errors'][0]['row'] == 4
+
+        grocery = Expense.objects.get(user=self.user, title='Grocery Store')
+        assert grocery.amount == Decimal('1234.00')
+        assert grocery.expense_date == date(2023, 10, 2)
+        assert grocery.notes == 'weekly shop'
+        assert ExpenseRollup.objects.filter(user=self.user).count() == 2
+
+        response = self.upload('statement.csv', CSV_STATEMENT)
+        assert response.data['created'] == 0
+        assert response.data['duplicates'] == 2
+        assert Expense.objects.filter(user=self.user).count() == 2
+
+    def test_csv_missing_columns(self):
+        response = self.upload('statement.csv', b"Foo,Bar\n1,2\n")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_malformed_csv(self):
+        content = b"Date,Description,Amount\n2023-10-01,Coffee,-3.00\n2023-10-02," + b"x" * 200000 + b",-1.00\n"
+        response = self.upload('statement.csv', content)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error']['details']['file'][0].startswith('Line 3: field larger than field limit')
+
+    def test_column_mapping(self):
+        content = b"When,Payee,Total\n2023-10-01,Coffee,3.00\n2023-10-02,Refund,-3.00\n"
+        response = self.upload(
+            'statement.csv', content, amount_sign='positive',
+            mapping='{"expense_date": "When", "title": "Payee", "amount": "Total"}',
+        )
+        assert (response.data['created'], response.data['skipped']) == (1, 1)
+
+    @pytest.mark.parametrize('mapping', ['["Payee"]', '{"title": 5}', '{"title": null}', '{"title": ["Payee"]}'])
+    def test_mapping_must_map_fields_to_column_names(self, mapping):
+        response = self.upload('statement.csv', CSV_STATEMENT, mapping=mapping)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'mapping' in response.data['error']['details']
+
+    def test_csv_credits_are_skipped(self):
+        content = b"Date,Description,Amount\n2023-10-01,Coffee,-3.00\n2023-10-02,Salary,2500.00\n2023-10-03,Refund,+4.50\n"
+        response = self.upload('statement.csv', content)
+        assert (response.data['created'], response.data['skipped'], response.data['invalid']) == (1, 2, 0)
+        assert list(Expense.objects.filter(user=self.user).values_list('title', flat=True)) == ['Coffee']
+
+    def test_csv_debit_column(self):
+        content = b"Date,Description,Paid out,Paid in\n2023-10-01,Coffee,3.00,\n2023-10-02,Salary,,2500.00\n"
+        response = self.upload('statement.csv', content)
+        assert (response.data['created'], response.data['skipped']) == (1, 1)
+        assert Expense.objects.get(user=self.user).amount == Decimal('3.00')
+
+    def test_comma_decimal_separator(self):
+        content = 'Date,Description,Amount\n01.10.2023,Bäckerei,"-1,50"\n02.10.2023,Miete,"-1.234,56"\n'.encode()
+        response = self.upload('statement.csv', content, decimal_separator=',')
+        assert response.data['created'] == 2
+        amounts = Expense.objects.filter(user=self.user).order_by('expense_date').values_list('amount', flat=True)
+        assert list(amounts) == [Decimal('1.50'), Decimal('1234.56')]
+
+        response = self.upload('statement.csv', content, decimal_separator=';')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ofx_parses_across_read_boundaries(self):
+        rows = list(importers.iter_ofx(io.BytesIO(OFX_STATEMENT), read_size=7))
+        assert [number for number, _ in rows] == [1, 2, 3]
+        debit = rows[0][1]
+        assert (debit['title'], debit['currency'], debit['reference']) == ('Bakery', 'EUR', 'A1')
+        assert rows[1][1] is None
+
+    def test_ofx_import_command(self, tmp_path):
+        path = tmp_path / 'statement.ofx'
+        path.write_bytes(OFX_STATEMENT)
+        call_command('import_statement', self.user.email, str(path), stdout=io.StringIO())
+        call_command('import_statement', self.user.email, str(path), stdout=io.StringIO())
+
+        # Same content on different days and FITIDs are distinct; the credit is skipped
+        expenses = Expense.objects.filter(user=self.user).order_by('expense_date')
+        assert [(e.expense_date, e.amount, e.currency) for e in expenses] == [
+            (date(2023, 10, 5), Decimal('12.30'), 'EUR'),
+            (date(2023, 10, 7), Decimal('12.30'), 'EUR'),
+        ]
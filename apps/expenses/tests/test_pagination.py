@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse('expense-list')
+        # Two expenses per day so pages have to break ties on created_at/id
+        for i in range(10):
+            Expense.objects.create(user=self.user, title=f'Item {i}', amount=10, expense_date=date(2023, 10, 1 + i // 2))
+
+    def fetch_all(self, first_params):
+        titles, url, params = [], self.list_url, first_params
+        while url:
+            response = self.client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            titles.extend(row['title'] for row in response.data['results'])
+            url, params = response.data['next'], None
+        return titles
+
+    def test_cursor_pages_follow_model_ordering_without_count(self):
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'limit': 3})
+        assert 'count' not in response.data
+        assert len(response.data['results']) == 3
+
+        titles = self.fetch_all({'pagination': 'cursor', 'limit': 3})
+        expected = list(
+            Expense.objects.filter(user=self.user)
+            .order_by('-expense_date', '-created_at', 'id')
+            .values_list('title', flat=True)
+        )
+        assert titles == expected
+
+    def test_count_is_opt_in(self):
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'limit': 3, 'count': 'true'})
+        assert response.data['count'] == 10
+
+    def test_inserts_during_paging_do_not_shift_pages(self):
+        first = self.client.get(self.list_url, {'pagination': 'cursor', 'limit': 4})
+        seen = [row['title'] for row in first.data['results']]
+        Expense.objects.create(user=self.user, title='Newest', amount=5, expense_date=date(2023, 10, 31))
+
+        url = first.data['next']
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['title'] for row in response.data['results'])
+            url = response.data['next']
+        assert len(seen) == len(set(seen)) == 10
+        assert 'Newest' not in seen
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_ordering_is_rejected_with_cursor_pagination(self):
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'ordering': 'amount'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ordering' in response.data['error']['details']
+        assert self.client.get(self.list_url, {'ordering': 'amount'}).status_code == status.HTTP_200_OK
@@ -0,0 +1,118 @@
+import pytest
+from django.db.models import Q, Sum
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense, ExpenseRollup
+from apps.expenses.reports import build_report, quarter_range
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestReport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('expense-report')
+        for day, amount, category in [
+            ('2023-01-02', 10, 'Food'), ('2023-01-31', 30, 'Travel'), ('2023-03-15', 20, 'Food'),
+            ('2023-04-01', 5, ''), ('2023-12-31', 15, 'Food'), ('2024-01-01', 100, 'Food'),
+        ]:
+            Expense.objects.create(user=self.user, title='Item', amount=amount, expense_date=day, category=category)
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        Expense.objects.create(user=other, title='Other', amount=99, expense_date='2023-01-02', category='Food')
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return response.data
+
+    def test_year_report(self):
+        data = self.get(year=2023)
+        assert (data['period'], data['from_date'], data['to_date']) == ('year', date(2023, 1, 1), date(2023, 12, 31))
+        assert (data['total_spend'], data['count']) == (Decimal('80'), 5)
+        assert data['averages'] == {
+            'per_expense': Decimal('16.00'), 'per_day': Decimal('0.22'), 'per_month': Decimal('6.67'),
+        }
+        assert [(row['category'], row['total'], row['count'], row['share']) for row in data['breakdown']] == [
+            ('Food', Decimal('45'), 3, Decimal('56.2')),
+            ('Travel', Decimal('30'), 1, Decimal('37.5')),
+            (None, Decimal('5'), 1, Decimal('6.2')),
+        ]
+        assert data['breakdown'][0]['average'] == Decimal('15.00')
+        monthly = [(row['month'].month, row['total'], row['count']) for row in data['monthly']]
+        assert len(monthly) == 12
+        assert monthly[:4] == [(1, Decimal('40'), 2), (2, Decimal('0'), 0), (3, Decimal('20'), 1), (4, Decimal('5'), 1)]
+        assert monthly[11] == (12, Decimal('15'), 1)
+
+    def test_quarter_month_and_custom_ranges(self):
+        data = self.get(quarter='2023-Q1')
+        assert (data['from_date'], data['to_date']) == (date(2023, 1, 1), date(2023, 3, 31))
+        assert (data['total_spend'], data['count'], len(data['monthly'])) == (Decimal('60'), 3, 3)
+
+        data = self.get(month='2023-01')
+        assert (data['to_date'], data['total_spend']) == (date(2023, 1, 31), Decimal('40'))
+
+        data = self.get(from_date='2023-12-31', to_date='2024-01-01')
+        assert data['period'] == 'custom'
+        assert [(row['month'], row['total']) for row in data['monthly']] == [
+            (date(2023, 12, 1), Decimal('15')), (date(2024, 1, 1), Decimal('100')),
+        ]
+        assert data['averages']['per_day'] == Decimal('57.50')
+
+    def test_empty_range(self):
+        data = self.get(year=2020)
+        assert (data['total_spend'], data['count'], data['breakdown']) == (Decimal('0'), 0, [])
+        assert data['averages']['per_expense'] == Decimal('0')
+
+    @pytest.mark.parametrize('params', [
+        {'quarter': '2023-Q5'},
+        {'month': '2023-13'},
+        {'year': 2023, 'month': '2023-01'},
+        {'to_date': '2023-01-01'},
+        {'from_date': '2023-02-01', 'to_date': '2023-01-01'},
+        {'from_date': '2020-01-01', 'to_date': '2023-01-01'},
+    ])
+    def test_validation(self, params):
+        assert self.client.get(self.url, params).status_code == status.HTTP_400_BAD_REQUEST
+
+    @override_settings(EXPENSE_REPORT_MAX_MONTHS=48)
+    def test_defaults_to_the_current_year_and_honours_the_month_cap(self):
+        assert self.get()['period'] == 'year'
+        assert self.get(from_date='2020-01-01', to_date='2023-03-31')['total_spend'] == Decimal('60')
+
+    def test_report_is_one_query(self, django_assert_num_queries):
+        start, end = quarter_range('2023-Q1')
+        with django_assert_num_queries(1):
+            build_report(self.user.pk, start, end)
+
+    def test_responses_are_cached_until_a_write(self, django_assert_num_queries):
+        self.get(year=2023)
+        with django_assert_num_queries(0):
+            self.get(year=2023)
+        Expense.objects.create(user=self.user, title='Late', amount=3, expense_date='2023-02-10', category='Food')
+        assert self.get(year=2023)['total_spend'] == Decimal('83')
+
+
+@pytest.mark.django_db
+class TestReportQueryPlan:
+    def plan(self, queryset):
+        return queryset.values('category').annotate(
+            spend=Sum('total'), january=Sum('total', filter=Q(month=date(2023, 1, 1))),
+        ).explain()
+
+    def test_date_range_searches_the_rollup_index(self):
+        plan = self.plan(ExpenseRollup.objects.filter(user_id=1, day__gte=date(2023, 1, 1), day__lte=date(2023, 3, 31)))
+        assert 'SEARCH' in plan
+        assert '(user_id=? AND day>? AND day<?)' in plan
+
+    def test_extracting_from_the_date_only_searches_by_user(self):
+        # A filter on a function of the column (here the month number) can't seek on day
+        plan = self.plan(ExpenseRollup.objects.filter(user_id=1, day__month=1))
+        assert '(user_id=?)' in plan
+        assert 'day>?' not in plan
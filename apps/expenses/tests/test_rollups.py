@@ -0,0 +1,66 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense, ExpenseRollup
+from apps.expenses import rollups
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestExpenseRollups:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+
+    def rollup(self, day, category):
+        return ExpenseRollup.objects.get(user=self.user, day=day, category=category)
+
+    def test_create_update_delete_keep_rollups_in_sync(self):
+        lunch = Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1), category='Food')
+        Expense.objects.create(user=self.user, title='Dinner', amount='20.50', expense_date=date(2023, 10, 1), category='Food')
+        row = self.rollup(date(2023, 10, 1), 'Food')
+        assert (row.total, row.count, row.month) == (Decimal('30.50'), 2, date(2023, 10, 1))
+
+        # Moving an expense to another day and category moves its contribution
+        lunch.expense_date = date(2023, 10, 3)
+        lunch.category = None
+        lunch.amount = Decimal('12.00')
+        lunch.save()
+        assert self.rollup(date(2023, 10, 1), 'Food').total == Decimal('20.50')
+        assert self.rollup(date(2023, 10, 3), '').total == Decimal('12.00')
+
+        lunch.delete()
+        assert not ExpenseRollup.objects.filter(user=self.user, day=date(2023, 10, 3)).exists()
+        assert rollups.verify([self.user.id]) == []
+
+    def test_summary_reads_from_rollups(self):
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1), category='Food')
+        Expense.objects.create(user=self.user, title='Taxi', amount=5, expense_date=date(2023, 10, 2))
+        # A rollup-only change is visible to summary, proving it doesn't touch raw rows
+        ExpenseRollup.objects.filter(user=self.user, category='Food').update(total=99)
+
+        response = self.client.get(reverse('expense-summary'), {'month': '2023-10'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_spend'] == Decimal('104')
+        assert response.data['count'] == 2
+        assert [row['category'] for row in response.data['breakdown']] == ['Food']
+        assert [row['expense_date'] for row in response.data['timeline']] == [date(2023, 10, 1), date(2023, 10, 2)]
+
+    def test_rebuild_and_verify_command(self):
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1), category='Food')
+        Expense.objects.create(user=self.user, title='Taxi', amount=5, expense_date=date(2023, 10, 2), category='Transport')
+        ExpenseRollup.objects.filter(user=self.user, category='Food').delete()
+
+        with pytest.raises(CommandError):
+            call_command('expense_rollups', '--verify')
+
+        call_command('expense_rollups', '--user', self.user.email)
+        call_command('expense_rollups', '--verify')
+        assert ExpenseRollup.objects.filter(user=self.user).count() == 2
@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense, ExpenseSearchToken
+from apps.expenses import search
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestExpenseSearch:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('expense-list')
+
+    def add(self, title, notes=None, user=None, expense_date='2023-10-01'):
+        return Expense.objects.create(
+            user=user or self.user, title=title, notes=notes, amount=10, expense_date=expense_date, category='Food'
+        )
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [row['title'] for row in response.data['results']]
+
+    def test_prefix_matching_requires_every_term(self):
+        self.add('Starbucks coffee')
+        self.add('Coffee beans', notes='From the market')
+        self.add('Train ticket')
+        assert sorted(self.titles(search='coff')) == ['Coffee beans', 'Starbucks coffee']
+        assert self.titles(search='coff star') == ['Starbucks coffee']
+        assert self.titles(search='MARKET') == ['Coffee beans']
+        assert self.titles(search='tea') == []
+        assert len(self.titles(search='  ')) == 3
+
+    def test_results_are_ranked_unless_ordering_is_given(self):
+        self.add('Groceries', notes='tea and biscuits', expense_date='2023-10-05')
+        self.add('Team lunch', expense_date='2023-10-04')
+        self.add('Tea', expense_date='2023-10-01')
+        # Exact title word, then title prefix, then notes
+        assert self.titles(search='tea') == ['Tea', 'Team lunch', 'Groceries']
+        assert self.titles(search='tea', ordering='-expense_date') == ['Groceries', 'Team lunch', 'Tea']
+
+    def test_search_is_scoped_to_the_user(self):
+        other = User.objects.create_user(email='other@example.com', password='password123', is_email_verified=True)
+        self.add('Shared word', user=other)
+        self.add('Shared word')
+        assert self.titles(search='shared') == ['Shared word']
+
+    def test_index_follows_writes(self):
+        expense = self.add('Old title')
+        expense.title = 'New title'
+        expense.save()
+        assert self.titles(search='old') == []
+        assert self.titles(search='new') == ['New title']
+
+        response = self.client.patch(reverse('expense-bulk'), [{'id': str(expense.pk), 'notes': 'receipt lost'}], format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert self.titles(search='receipt') == ['New title']
+
+        rows = [{'title': 'Bulk taxi', 'amount': '5.00', 'expense_date': '2023-10-02'}]
+        assert self.client.post(reverse('expense-bulk'), rows, format='json').status_code == status.HTTP_201_CREATED
+        assert self.titles(search='taxi') == ['Bulk taxi']
+
+        expense.delete()
+        assert not ExpenseSearchToken.objects.filter(expense_id=expense.pk).exists()
+
+    def test_rebuild(self):
+        self.add('Coffee', notes='with cake')
+        ExpenseSearchToken.objects.all().delete()
+        call_command('expense_search_index')
+        assert sorted(ExpenseSearchToken.objects.values_list('token', 'weight')) == [('cake', 1), ('coffee', 2), ('with', 1)]
+        assert search.parse_query('a b a c') == ['a', 'b', 'c']
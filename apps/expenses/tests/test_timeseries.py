@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.expenses.models import Expense
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestTimeseries:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('expense-timeseries')
+        for day, amount in [('2023-01-02', 10), ('2023-01-08', 5), ('2023-01-09', 7), ('2023-03-15', 20), ('2024-02-29', 1)]:
+            Expense.objects.create(user=self.user, title='Item', amount=amount, expense_date=day, category='Food')
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        Expense.objects.create(user=other, title='Other', amount=99, expense_date='2023-01-02', category='Food')
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return response.data
+
+    def series(self, data):
+        return [(row['period'], Decimal(str(row['total'])), row['count']) for row in data['results']]
+
+    def test_month_buckets_include_empty_periods(self):
+        data = self.get(bucket='month', from_date='2023-01-20', to_date='2023-04-30')
+        assert data['from_date'] == date(2023, 1, 1)
+        assert self.series(data) == [
+            (date(2023, 1, 1), Decimal('22'), 3),
+            (date(2023, 2, 1), Decimal('0'), 0),
+            (date(2023, 3, 1), Decimal('20'), 1),
+            (date(2023, 4, 1), Decimal('0'), 0),
+        ]
+
+    def test_week_day_and_year_buckets(self):
+        weeks = self.get(bucket='week', from_date='2023-01-02', to_date='2023-01-15')
+        # Weeks start on Monday: Jan 2-8 and Jan 9-15
+        assert self.series(weeks) == [(date(2023, 1, 2), Decimal('15'), 2), (date(2023, 1, 9), Decimal('7'), 1)]
+
+        days = self.get(bucket='day', from_date='2023-01-08', to_date='2023-01-09')
+        assert self.series(days) == [(date(2023, 1, 8), Decimal('5'), 1), (date(2023, 1, 9), Decimal('7'), 1)]
+
+        years = self.get(bucket='year', from_date='2023-06-01', to_date='2024-12-31')
+        assert self.series(years) == [(date(2023, 1, 1), Decimal('42'), 4), (date(2024, 1, 1), Decimal('1'), 1)]
+
+    def test_defaults_and_validation(self):
+        data = self.get()
+        assert data['bucket'] == 'month'
+        assert len(data['results']) == 12
+
+        assert self.client.get(self.url, {'bucket': 'hour'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.get(self.url, {'from_date': '2023-02-01', 'to_date': '2023-01-01'}).status_code == status.HTTP_400_BAD_REQUEST
+        response = self.client.get(self.url, {'bucket': 'day', 'from_date': '2000-01-01', 'to_date': '2023-01-01'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_responses_are_cached_until_a_write(self, django_assert_num_queries):
+        params = {'bucket': 'month', 'from_date': '2023-01-01', 'to_date': '2023-03-31'}
+        self.get(**params)
+        with django_assert_num_queries(0):
+            self.get(**params)
+        Expense.objects.create(user=self.user, title='Late', amount=3, expense_date='2023-02-10', category='Food')
+        assert self.series(self.get(**params))[1] == (date(2023, 2, 1), Decimal('3'), 1)
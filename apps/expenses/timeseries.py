@@ -0,0 +1,106 @@
+"""
+Spend over time in day, week, month or year buckets.
+
+Buckets are computed in the database from the ExpenseRollup table (one
+row per user, day and category) rather than from raw expenses:
+day and month buckets group on the stored `day` and `month` columns,
+weeks and years on TruncWeek/TruncYear over `day`. Past buckets are thus
+read from already-aggregated rows, and every bucket in the range is
+returned, with zeros for periods without spend, up to
+EXPENSE_TIMESERIES_MAX_BUCKETS.
+"""
+from datetime import date, timedelta
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek, TruncYear
+from django.utils import timezone
+
+from .models import ExpenseRollup
+
+BUCKETS = {
+    'day': F('day'),
+    'week': TruncWeek('day'),
+    'month': F('month'),
+    'year': TruncYear('day'),
+}
+# Buckets returned when no from_date is given
+DEFAULT_SPAN = {'day': 30, 'week': 12, 'month': 12, 'year': 5}
+
+
+def bucket_start(bucket, value):
+    if bucket == 'week':
+        return value - timedelta(days=value.weekday())
+    if bucket == 'month':
+        return value.replace(day=1)
+    if bucket == 'year':
+        return value.replace(month=1, day=1)
+    return value
+
+
+def next_bucket(bucket, start):
+    if bucket == 'day':
+        return start + timedelta(days=1)
+    if bucket == 'week':
+        return start + timedelta(weeks=1)
+    if bucket == 'month':
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return date(start.year + 1, 1, 1)
+
+
+def previous_bucket(bucket, start):
+    if bucket == 'day':
+        return start - timedelta(days=1)
+    if bucket == 'week':
+        return start - timedelta(weeks=1)
+    if bucket == 'month':
+        return bucket_start('month', start - timedelta(days=1))
+    return date(start.year - 1, 1, 1)
+
+
+def bucket_starts(bucket, start, end):
+    """All bucket start dates from the bucket containing `start` to the one containing `end`."""
+    current = bucket_start(bucket, start)
+    while current <= end:
+        yield current
+        current = next_bucket(bucket, current)
+
+
+def default_range(bucket, start=None, end=None):
+    """Fill in a missing end (today) and start (DEFAULT_SPAN buckets back from end)."""
+    end = end or timezone.localdate()
+    if start is None:
+        start = bucket_start(bucket, end)
+        for _ in range(DEFAULT_SPAN[bucket] - 1):
+            start = previous_bucket(bucket, start)
+    return start, end
+
+
+def count_buckets(bucket, start, end, limit):
+    """Number of buckets in the range, counting at most limit + 1."""
+    count = 0
+    for _ in bucket_starts(bucket, start, end):
+        count += 1
+        if count > limit:
+            break
+    return count
+
+
+def series(user_id, bucket, start, end):
+    """Return [{period, total, count}] for every bucket between start and end, inclusive."""
+    rows = (
+        ExpenseRollup.objects
+        .filter(user_id=user_id, day__gte=bucket_start(bucket, start), day__lte=end)
+        .annotate(period=BUCKETS[bucket])
+        .values('period')
+        .annotate(total=Sum('total'), count=Sum('count'))
+        .order_by('period')
+    )
+    found = {row['period']: row for row in rows}
+    return [
+        {
+            'period': period,
+            'total': found[period]['total'] if period in found else 0,
+            'count': found[period]['count'] if period in found else 0,
+        }
+        for period in bucket_starts(bucket, start, end)
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import ExpenseViewSet
@@ -8,3 +9,13 @@ router.register(r'', ExpenseViewSet, basename='expense')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.EXPENSES_ASYNC_VIEWS:
+    from . import async_views
+
+    # Matched before the router; the route names stay the same for reverse().
+    urlpatterns = [
+        path('', async_views.expense_list, name='expense-list'),
+        path('summary/', async_views.expense_summary, name='expense-summary'),
+        path('export/', async_views.expense_export, name='expense-export'),
+    ] + urlpatterns
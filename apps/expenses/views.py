@@ -1,158 +1,253 @@
-import csv
+import json
+import uuid
 from datetime import datetime
-from decimal import Decimal
-from django.db.models import Sum, Count, F
-from django.http import HttpResponse, StreamingHttpResponse
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common import metrics
+from apps.common.cache import cached_response
+from apps.common.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from apps.common.fieldsets import SparseFieldsMixin
 from apps.common.permissions import IsEmailVerified
+from apps.common.serializers import ValuesListMixin
+from apps.jobs import queue
+from apps.jobs.serializers import JobSerializer
+from apps.users.authentication import UserScopedJWTAuthentication
 from .models import Expense
-from .serializers import ExpenseSerializer
-from .serializers import ExpenseSerializer
+from .serializers import (
+    ExpenseSerializer, ExpenseValuesSerializer, ReportQuerySerializer, TimeseriesQuerySerializer, parse_expense_id,
+)
+from . import bulk, importers, reports, timeseries
+from .exports import iter_csv
 from .filters import ExpenseFilter
-from apps.budgets.models import Budget
+from .pagination import ExpensePagination
+from .search import ExpenseSearchFilter
+from .summary import TOTALS, SummaryQueries, build_summary, parse_month
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(
+    SparseFieldsMixin, ConditionalListMixin, ValuesListMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
     serializer_class = ExpenseSerializer
+    values_serializer = ExpenseValuesSerializer()
+    # Keyset pagination reads these from every row
+    sparse_fields_required = ('id', 'expense_date', 'created_at')
+    authentication_classes = [UserScopedJWTAuthentication]
     permission_classes = [IsAuthenticated, IsEmailVerified]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, ExpenseSearchFilter]
     filterset_class = ExpenseFilter
+    pagination_class = ExpensePagination
     ordering_fields = ['expense_date', 'amount', 'created_at']
     ordering = ['-expense_date']
 
     def get_queryset(self):
-        return Expense.objects.filter(user=self.request.user)
+        return Expense.objects.filter(user_id=self.request.user.pk)
+
+    def use_conditional_list(self, request):
+        # The validator needs a COUNT(*), which keyset pages exist to avoid
+        return not self.paginator.use_keyset(request)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
     @action(detail=False, methods=['get'])
+    @cached_response('expenses', 'budgets')
     def summary(self, request):
         """
         Get monthly summary of expenses.
         Query param: month=YYYY-MM
+        Reads from the precomputed ExpenseRollup table rather than raw expenses,
+        and is cached per user until their expenses or budgets change.
         """
-        month_str = request.query_params.get('month')
-        queryset = self.get_queryset()
-
-        if month_str:
-            try:
-                date = datetime.strptime(month_str, '%Y-%m')
-                queryset = queryset.filter(
-                    expense_date__year=date.year,
-                    expense_date__month=date.month
-                )
-            except ValueError:
-                return Response(
-                    {"error": "Invalid month format. Use YYYY-MM"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Aggregate totals
-        total_spend = queryset.aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Group by category
-        by_category_qs = queryset.values('category').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')
-
-        # Get budgets
-        budgets = Budget.objects.filter(user=request.user)
-        budget_map = {b.category: b.amount for b in budgets}
-
-        # Merge expenses and budgets
-        breakdown = []
-        processed_categories = set()
-
-        for item in by_category_qs:
-            cat = item['category']
-            if not cat: continue # Skip None category if any
-            processed_categories.add(cat)
-            item['budget'] = budget_map.get(cat, 0)
-            breakdown.append(item)
-        
-        # Add categories with budgets but no expenses
-        for cat, amount in budget_map.items():
-            if cat not in processed_categories:
-                breakdown.append({
-                    'category': cat,
-                    'total': 0,
-                    'count': 0,
-                    'budget': amount
-                })
-        
-        # Sort by total spending desc, then category
-        breakdown.sort(key=lambda x: (-x['total'], x['category']))
-
-        # Group by date for timeline
-        timeline = queryset.values('expense_date').annotate(
-            total=Sum('amount')
-        ).order_by('expense_date')
+        try:
+            month = parse_month(request.query_params.get('month'))
+        except ValueError:
+            return Response(
+                {"error": "Invalid month format. Use YYYY-MM"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queries = SummaryQueries(request.user.pk, month)
+        return Response(build_summary(
+            totals=queries.rollups.aggregate(**TOTALS),
+            by_category=list(queries.by_category),
+            budgets=list(queries.budgets),
+            timeline=list(queries.timeline),
+        ))
+
+    @action(detail=False, methods=['get'])
+    @cached_response('expenses')
+    def timeseries(self, request):
+        """
+        Spend per period.
+        Query params: bucket=day|week|month|year (default month),
+        from_date=YYYY-MM-DD, to_date=YYYY-MM-DD (default: today, and a
+        bucket-dependent span back from to_date).
+        """
+        params = TimeseriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        bucket = params.validated_data['bucket']
+        start, end = timeseries.default_range(
+            bucket, params.validated_data.get('from_date'), params.validated_data.get('to_date')
+        )
+        if start > end:
+            raise ValidationError({'from_date': ['Must not be after to_date.']})
+        max_buckets = settings.EXPENSE_TIMESERIES_MAX_BUCKETS
+        if timeseries.count_buckets(bucket, start, end, max_buckets) > max_buckets:
+            raise ValidationError(
+                {'bucket': [f'The range spans more than {max_buckets} {bucket} buckets; use a shorter range or a larger bucket.']}
+            )
 
         return Response({
-            "total_spend": total_spend,
-            "currency": "USD", 
-            "breakdown": breakdown,
-            "timeline": timeline,
-            "count": queryset.count()
+            'bucket': bucket,
+            'from_date': timeseries.bucket_start(bucket, start),
+            'to_date': end,
+            'currency': settings.BASE_CURRENCY,
+            'results': timeseries.series(request.user.pk, bucket, start, end),
         })
 
     @action(detail=False, methods=['get'])
-    def export(self, request):
+    @cached_response('expenses')
+    def report(self, request):
         """
-        Stream CSV export of expenses.
-        Respects filters (from=YYYY-MM-DD, to=YYYY-MM-DD).
+        Spend report for one period.
+        Query params: year=YYYY, quarter=YYYY-Q1..Q4, month=YYYY-MM, or
+        from_date=YYYY-MM-DD with optional to_date (default: this year).
+        Totals, category breakdown with shares, monthly trend and averages,
+        from a single query over the daily rollups.
         """
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="expenses_{datetime.now().strftime("%Y%m%d")}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Date', 'Title', 'Amount', 'Currency', 'Category', 'Notes'])
-        
-        expenses = queryset.values_list(
-            'id', 'expense_date', 'title', 'amount', 'currency', 'category', 'notes'
+        params = ReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        period = params.validated_data
+        return Response({
+            'period': period['period'],
+            **reports.build_report(request.user.pk, period['from_date'], period['to_date']),
+        })
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def bulk(self, request):
+        """
+        Bulk write endpoint, all-or-nothing in one transaction.
+        POST: list of expenses to create.
+        PATCH: list of partial updates, each with the expense "id".
+        DELETE: list of expense ids.
+        Invalid rows are reported by their index in the payload.
+        """
+        items = request.data
+        max_rows = settings.EXPENSE_BULK_MAX_ROWS
+        if not isinstance(items, list) or not items or len(items) > max_rows:
+            raise ValidationError(f"Expected a non-empty list of at most {max_rows} items.")
+
+        if request.method == 'DELETE':
+            ids = [parse_expense_id(item) for item in items]
+            invalid = {index: ["Invalid expense id."] for index, pk in enumerate(ids) if pk is None}
+            if invalid:
+                raise ValidationError(invalid)
+            return Response({"deleted": bulk.delete_expenses(request.user.pk, ids)})
+
+        if request.method == 'PATCH':
+            ids = {parse_expense_id(item.get('id')) for item in items if isinstance(item, dict)}
+            instances = self.get_queryset().filter(pk__in=ids - {None})
+            serializer = self.get_serializer(instances, data=items, many=True, partial=True)
+            serializer.is_valid(raise_exception=True)
+            return Response({"updated": len(serializer.save())})
+
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+        expenses = serializer.save(user_id=request.user.pk)
+        return Response(
+            {"created": len(expenses), "ids": [expense.pk for expense in expenses]},
+            status=status.HTTP_201_CREATED
         )
-        
-        for expense in expenses:
-            writer.writerow(expense)
-            
-        return response
 
-class Echo:
-    """An object that implements just the write method of the file-like interface."""
-    def write(self, value):
-        """Write the value by returning it, instead of storing in a buffer."""
-        return value
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_statement(self, request):
+        """
+        Import a CSV or OFX bank statement uploaded as `file`.
+        Optional fields: format=csv|ofx (defaults to the file extension),
+        date_format (strptime pattern for CSV dates), decimal_separator
+        ('.' or ',', for CSV amounts), amount_sign (negative|positive: the
+        sign of spend in a signed CSV amount column; other rows are skipped
+        as credits), currency (default for rows without one), mapping (JSON
+        object of field -> CSV column). Rows already imported before are
+        skipped as duplicates.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['No statement file was uploaded.']})
+
+        try:
+            mapping = json.loads(request.data.get('mapping') or '{}')
+            if not isinstance(mapping, dict):
+                raise ValueError
+            if not all(isinstance(field, str) and isinstance(column, str) for field, column in mapping.items()):
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'mapping': ['Expected a JSON object of field -> column.']})
+
+        options = {}
+        if request.data.get('date_format'):
+            options['date_formats'] = [request.data['date_format']]
+        if request.data.get('currency'):
+            options['default_currency'] = request.data['currency']
+        for name, choices in [('decimal_separator', importers.DECIMAL_SEPARATORS), ('amount_sign', importers.AMOUNT_SIGNS)]:
+            if request.data.get(name):
+                if request.data[name] not in choices:
+                    raise ValidationError({name: [f"Expected one of: {' '.join(choices)}."]})
+                options[name] = request.data[name]
+
+        try:
+            fmt = importers.detect_format(upload.name, request.data.get('format'))
+            result = importers.import_statement(request.user.pk, upload.file, fmt, mapping, **options)
+        except importers.StatementError as exc:
+            raise ValidationError({'file': [str(exc)]})
+        return Response(result.as_dict())
 
-class StreamingExpenseViewSet(ExpenseViewSet):
-    """
-    Alternative implementation for streaming large CSVs if needed.
-    """
     @action(detail=False, methods=['get'])
-    def export_stream(self, request):
+    def export(self, request):
+        """
+        Stream CSV export of expenses.
+        Respects filters (from_date=YYYY-MM-DD, to_date=YYYY-MM-DD, ...).
+        """
         queryset = self.filter_queryset(self.get_queryset())
-        
-        pseudo_buffer = Echo()
-        writer = csv.writer(pseudo_buffer)
-        
-        def rows():
-            yield writer.writerow(['ID', 'Date', 'Title', 'Amount', 'Currency', 'Category', 'Notes'])
-            for expense in queryset.iterator():
-                yield writer.writerow([
-                    str(expense.id),
-                    str(expense.expense_date),
-                    expense.title,
-                    str(expense.amount),
-                    expense.currency,
-                    expense.category,
-                    expense.notes
-                ])
-                
-        response = StreamingHttpResponse(rows(), content_type='text/csv')
+
+        metrics.EXPORTS.inc()
+        response = StreamingHttpResponse(iter_csv(queryset), content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="expenses_{datetime.now().strftime("%Y%m%d")}.csv"'
         return response
+
+    @action(detail=False, methods=['post'], url_path='export/file')
+    def export_file(self, request):
+        """
+        Export to a file in the background; takes the same filters as export.
+        Returns the job, whose `download` link is set once the file is written.
+        An Idempotency-Key header makes retried requests return the same job.
+        """
+        # Validate the filters now rather than in the worker
+        self.filter_queryset(self.get_queryset())
+
+        user_id = request.user.pk
+        key = request.headers.get('Idempotency-Key')
+        job = queue.enqueue(
+            'expenses.export_csv',
+            {
+                'user_id': str(user_id),
+                'query': request.query_params.urlencode(),
+                'name': f'exports/{user_id}/expenses_{datetime.now().strftime("%Y%m%d")}_{uuid.uuid4().hex}.csv',
+            },
+            user_id=user_id,
+            key=f'expenses.export_csv:{user_id}:{key}' if key else None,
+        )
+        metrics.EXPORTS.inc()
+        serializer = JobSerializer(job, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers={
+            'Location': reverse('job-detail', args=[job.pk], request=request),
+        })
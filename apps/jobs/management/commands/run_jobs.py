@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs import queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs. Start one process per worker; they share the job table safely. "
+        "With --burst, exit once no job is due."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true', help='Exit when the queue is empty.')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to sleep when idle.')
+
+    def handle(self, *args, **options):
+        worker = queue.worker_name()
+        poll_interval = options['poll_interval'] or settings.JOBS_POLL_INTERVAL
+        self.stdout.write(f"Worker {worker} started")
+        total = 0
+        while True:
+            # Like a request boundary: drop connections that are broken or past CONN_MAX_AGE
+            close_old_connections()
+            ran = queue.run_pending(worker, limit=100)
+            total += ran
+            if not ran:
+                if options['burst']:
+                    break
+                time.sleep(poll_interval)
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} jobs"))
@@ -0,0 +1,191 @@
+"""
+A small database-backed job queue.
+
+Handlers are registered by name in an app's jobs.py:
+
+    @queue.register('users.send_verification_email')
+    def send_verification_email(user_id): ...
+
+and enqueued with JSON-serializable keyword arguments, usually with
+`enqueue_on_commit` so the job only exists once the data it refers to is
+committed. `run_jobs` worker processes claim due jobs with a
+compare-and-set UPDATE, so any number of workers can share the table on
+any database. A claim is a lease of JOBS_LEASE_SECONDS; handlers that
+may run longer call `renew_lease()` as they make progress. If a worker
+dies mid-job, the lease runs out and another worker claims the job
+again, so handlers must be safe to run more than once. A failing job is
+retried with exponential backoff (JOBS_RETRY_DELAY, doubled per attempt)
+until `max_attempts`, then marked failed; so is a job whose lease runs
+out on its last attempt.
+"""
+import contextvars
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+handlers = {}
+
+# {'pk', 'worker', 'renew_at'} for the job this worker is running
+_running = contextvars.ContextVar('running_job', default=None)
+
+
+class LeaseLost(Exception):
+    """The running job's lease was taken over by another worker."""
+
+
+def register(kind):
+    def decorator(func):
+        handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, *, user_id=None, key=None, delay=None, max_attempts=None):
+    """Create a job, or return the existing one with the same idempotency `key`."""
+    if kind not in handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    fields = {
+        'kind': kind,
+        'payload': payload or {},
+        'user_id': user_id,
+        'run_after': timezone.now() + (delay or timedelta()),
+        'max_attempts': max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+    job, _ = Job.objects.get_or_create(idempotency_key=key, defaults=fields)
+    return job
+
+
+def enqueue_on_commit(kind, payload=None, **options):
+    """Enqueue once the current transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: enqueue(kind, payload, **options))
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _claimable(now):
+    return (
+        Q(status=Job.Status.QUEUED, run_after__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts'))
+    )
+
+
+def _lease_until(now):
+    return now + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+
+
+def fail_abandoned(now=None):
+    """Fail jobs whose lease ran out on their last attempt, e.g. because they keep killing the worker."""
+    now = now or timezone.now()
+    return Job.objects.filter(
+        status=Job.Status.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.Status.FAILED, finished_at=now, locked_by='', locked_until=None,
+        last_error='The lease ran out on the last attempt: the worker stopped before the job finished.',
+    )
+
+
+def claim(worker, batch=10):
+    """Lease one due job to `worker` and return it, or None when there is none."""
+    now = timezone.now()
+    fail_abandoned(now)
+    candidates = (
+        Job.objects.filter(_claimable(now))
+        .order_by('run_after')
+        .values_list('pk', flat=True)[:batch]
+    )
+    for pk in candidates:
+        # Compare-and-set: only one worker's UPDATE still matches
+        claimed = Job.objects.filter(_claimable(now), pk=pk).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker,
+            locked_until=_lease_until(now),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def renew_lease():
+    """
+    Extend the lease of the job being run, if half of it has passed since
+    the last renewal; a no-op outside a job. Raises LeaseLost when another
+    worker has claimed the job meanwhile, so the handler stops.
+    """
+    running = _running.get()
+    if running is None:
+        return
+    now = timezone.now()
+    if now < running['renew_at']:
+        return
+    renewed = Job.objects.filter(
+        pk=running['pk'], status=Job.Status.RUNNING, locked_by=running['worker'],
+    ).update(locked_until=_lease_until(now))
+    if not renewed:
+        raise LeaseLost(f"Job {running['pk']} is no longer leased to {running['worker']}")
+    running['renew_at'] = now + timedelta(seconds=settings.JOBS_LEASE_SECONDS / 2)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run(job, worker):
+    """Run a claimed job and record the outcome, unless its lease was lost to another worker."""
+    handler = handlers.get(job.kind)
+    renew_at = timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS / 2)
+    token = _running.set({'pk': job.pk, 'worker': worker, 'renew_at': renew_at})
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for {job.kind}")
+        result = handler(**job.payload)
+    except LeaseLost:
+        logger.warning("Job %s (%s) lost its lease to another worker", job.pk, job.kind)
+        return False
+    except Exception:
+        logger.exception("Job %s (%s) failed, attempt %s of %s", job.pk, job.kind, job.attempts, job.max_attempts)
+        now = timezone.now()
+        update = {'last_error': traceback.format_exc(), 'locked_by': '', 'locked_until': None}
+        if job.attempts >= job.max_attempts:
+            update.update(status=Job.Status.FAILED, finished_at=now)
+        else:
+            update.update(status=Job.Status.QUEUED, run_after=now + retry_delay(job.attempts))
+    else:
+        update = {
+            'status': Job.Status.SUCCEEDED, 'result': result, 'finished_at': timezone.now(),
+            'locked_by': '', 'locked_until': None,
+        }
+    finally:
+        _running.reset(token)
+    saved = Job.objects.filter(pk=job.pk, locked_by=worker).update(**update)
+    for field, value in update.items():
+        setattr(job, field, value)
+    return bool(saved)
+
+
+def run_pending(worker=None, limit=None):
+    """Run due jobs until none is left (or `limit` have run); return how many ran."""
+    worker = worker or worker_name()
+    count = 0
+    while limit is None or count < limit:
+        job = claim(worker)
+        if job is None:
+            break
+        run(job, worker)
+        count += 1
+    return count
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+from .models import Job
+
+class JobSerializer(serializers.ModelSerializer):
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'status', 'attempts', 'download', 'created_at', 'finished_at']
+        read_only_fields = fields
+
+    def get_download(self, job):
+        # Jobs that wrote a file (e.g. expense exports) expose it once they succeed
+        if job.status != Job.Status.SUCCEEDED or not (job.result or {}).get('file'):
+            return None
+        return reverse('job-download', args=[job.pk], request=self.context.get('request'))
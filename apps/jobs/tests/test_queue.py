@@ -0,0 +1,149 @@
+import time
+import pytest
+from datetime import date, timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.jobs import queue
+from apps.jobs.models import Job
+from apps.expenses.models import Expense
+
+User = get_user_model()
+
+calls = []
+
+@queue.register('tests.flaky')
+def flaky(fail_times, value):
+    calls.append(value)
+    if len(calls) <= fail_times:
+        raise RuntimeError('boom')
+    return {'value': value}
+
+@queue.register('tests.long')
+def long_running(steps, takeover=False):
+    for step in range(steps):
+        time.sleep(0.06)
+        if takeover and step == 1:
+            Job.objects.filter(status=Job.Status.RUNNING).update(locked_by='worker-b')
+        queue.renew_lease()
+    # Past the original lease by now: only renewals keep other workers off
+    return {'taken_over': queue.claim('worker-b') is not None}
+
+@pytest.mark.django_db
+class TestQueue:
+    def setup_method(self):
+        calls.clear()
+
+    def test_idempotency_key_returns_the_first_job(self):
+        first = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 1}, key='once')
+        second = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 2}, key='once')
+        assert first.pk == second.pk
+        assert Job.objects.count() == 1
+        with pytest.raises(ValueError):
+            queue.enqueue('tests.unknown')
+
+    def test_claim_is_exclusive_and_expired_leases_are_reclaimed(self):
+        job = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 1})
+        assert queue.claim('worker-a').pk == job.pk
+        assert queue.claim('worker-b') is None
+
+        # worker-a died: once its lease runs out, worker-b takes over and worker-a can't record a result
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = queue.claim('worker-b')
+        assert reclaimed.attempts == 2
+        assert queue.run(job, 'worker-a') is False
+        assert queue.run(reclaimed, 'worker-b') is True
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.result == {'value': 1}
+
+    def test_lease_running_out_on_the_last_attempt_fails_the_job(self):
+        job = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 1}, max_attempts=2)
+        for worker in ['worker-a', 'worker-b']:
+            # Each worker dies mid-job, e.g. killed for running out of memory
+            assert queue.claim(worker).pk == job.pk
+            Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        assert queue.claim('worker-c') is None
+        job.refresh_from_db()
+        assert (job.status, job.attempts, job.locked_by) == (Job.Status.FAILED, 2, '')
+        assert 'lease ran out' in job.last_error
+
+    def test_long_jobs_renew_their_lease(self, settings):
+        settings.JOBS_LEASE_SECONDS = 0.1
+        job = queue.enqueue('tests.long', {'steps': 4})
+        assert queue.run(queue.claim('worker-a'), 'worker-a') is True
+        job.refresh_from_db()
+        assert (job.status, job.result) == (Job.Status.SUCCEEDED, {'taken_over': False})
+        assert queue.renew_lease() is None  # outside a job
+
+        # Renewing after another worker took the job over stops the handler
+        job = queue.enqueue('tests.long', {'steps': 4, 'takeover': True})
+        claimed = queue.claim('worker-a')
+        assert queue.run(claimed, 'worker-a') is False
+        job.refresh_from_db()
+        assert (job.status, job.locked_by) == (Job.Status.RUNNING, 'worker-b')
+
+    def test_failures_retry_with_backoff_then_fail(self, settings):
+        settings.JOBS_RETRY_DELAY = 10
+        job = queue.enqueue('tests.flaky', {'fail_times': 5, 'value': 1}, max_attempts=2)
+        assert queue.run_pending() == 1
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+        assert 'RuntimeError: boom' in job.last_error
+        assert job.run_after > timezone.now() + timedelta(seconds=5)
+        # Not due yet
+        assert queue.run_pending() == 0
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        assert queue.run_pending() == 1
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 2
+
+    def test_enqueue_on_commit_waits_for_the_transaction(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            queue.enqueue_on_commit('tests.flaky', {'fail_times': 0, 'value': 1})
+            assert not Job.objects.exists()
+        callbacks[0]()
+        assert Job.objects.count() == 1
+
+@pytest.mark.django_db
+class TestExportJob:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, title='Lunch', amount=10, expense_date=date(2023, 10, 1), category='Food')
+        Expense.objects.create(user=self.user, title='Taxi', amount=20, expense_date=date(2023, 10, 2), category='Transport')
+
+    def test_export_to_file_and_download(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        url = reverse('expense-export-file') + '?category=food'
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY='abc')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == 'queued'
+        assert response.data['download'] is None
+        assert response.headers['Location'].endswith(reverse('job-detail', args=[response.data['id']]))
+        # Retried with the same key: same job
+        assert self.client.post(url, HTTP_IDEMPOTENCY_KEY='abc').data['id'] == response.data['id']
+
+        assert queue.run_pending() == 1
+        job = self.client.get(reverse('job-detail', args=[response.data['id']])).data
+        assert job['status'] == 'succeeded'
+        download = self.client.get(job['download'])
+        assert download.status_code == status.HTTP_200_OK
+        content = b''.join(download.streaming_content).decode()
+        assert 'Lunch' in content and 'Taxi' not in content
+        assert download['Content-Disposition'].startswith('attachment; filename="expenses_')
+
+    def test_jobs_are_private_and_filters_validated(self):
+        response = self.client.post(reverse('expense-export-file') + '?from_date=nope')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        job = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 1})
+        assert self.client.get(reverse('job-detail', args=[job.pk])).status_code == status.HTTP_404_NOT_FOUND
+        mine = queue.enqueue('tests.flaky', {'fail_times': 0, 'value': 1}, user_id=self.user.pk)
+        assert self.client.get(reverse('job-download', args=[mine.pk])).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,31 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+
+from apps.common.permissions import IsEmailVerified
+from apps.users.authentication import UserScopedJWTAuthentication
+from .models import Job
+from .serializers import JobSerializer
+
+class JobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Status of the user's background jobs, and the files they produced."""
+    serializer_class = JobSerializer
+    authentication_classes = [UserScopedJWTAuthentication]
+    permission_classes = [IsAuthenticated, IsEmailVerified]
+
+    def get_queryset(self):
+        return Job.objects.filter(user_id=self.request.user.pk)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        name = (job.result or {}).get('file') if job.status == Job.Status.SUCCEEDED else None
+        if not name or not default_storage.exists(name):
+            raise NotFound("No file is available for this job.")
+        return FileResponse(
+            default_storage.open(name, 'rb'), as_attachment=True,
+            filename=job.result.get('filename') or name.rsplit('/', 1)[-1],
+        )
@@ -0,0 +1,97 @@
+"""
+JWT authentication for user-scoped API views.
+
+With JWT_STATELESS_USER enabled, `request.user` is built from the access
+token's claims (user id and email_verified flag, see
+CustomTokenObtainPairSerializer) instead of loading the User row on every
+request. Views using it must only rely on `request.user.pk` and the
+flags below, never on a model instance.
+
+Revocation: each process keeps a short-TTL cache of the user's
+(is_active, is_email_verified) state, refreshed with one small query at
+most every JWT_STATELESS_USER_TTL seconds. A deactivated user is
+therefore locked out within that window and a newly verified user is
+let in without logging in again. Entries for users saved in this process
+are dropped immediately (see apps.users.signals). A TTL of 0 trusts the
+claims alone until the access token expires.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+EMAIL_VERIFIED_CLAIM = 'email_verified'
+
+
+class ClaimsUser(TokenUser):
+    """A TokenUser that also carries the email verification flag."""
+
+    def __init__(self, token, is_email_verified):
+        super().__init__(token)
+        self.is_email_verified = is_email_verified
+
+
+class UserStateCache:
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, ttl):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        state = (
+            get_user_model().objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list('is_active', 'is_email_verified')
+            .first()
+        )
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {key: value for key, value in self._entries.items() if value[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[user_id] = (now + ttl, state)
+        return state
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_states = UserStateCache()
+
+
+class UserScopedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_USER:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        is_email_verified = bool(validated_token.get(EMAIL_VERIFIED_CLAIM, False))
+        if settings.JWT_STATELESS_USER_TTL > 0:
+            state = user_states.get(user_id, settings.JWT_STATELESS_USER_TTL)
+            if state is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            is_active, is_email_verified = state
+            if not is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsUser(validated_token, is_email_verified)
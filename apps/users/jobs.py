@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+
+from apps.jobs import queue
+from .models import EmailVerificationToken, User
+from .tokens import generate_verification_token
+
+
+@queue.register('users.send_verification_email')
+def send_verification_email(user_id):
+    """Replace the user's unused verification tokens with a new one and email its link."""
+    user = User.objects.filter(pk=user_id, is_email_verified=False).first()
+    if user is None:
+        return {'sent': False}
+
+    with transaction.atomic():
+        EmailVerificationToken.objects.filter(user=user, used_at__isnull=True).delete()
+        raw_token, _ = generate_verification_token(user)
+
+    verification_link = f"{settings.FRONTEND_URL}/verify-email?token={raw_token}"
+    send_mail(
+        "Verify your email",
+        f"Click here: {verification_link}",
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+    )
+    return {'sent': True}
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.tokens import purge_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired and used email verification tokens in small batches. "
+        "Safe to run while the site is serving; schedule it e.g. hourly with cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = purge_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} verification tokens"))
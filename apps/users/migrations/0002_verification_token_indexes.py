@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:15
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_hashes(apps, schema_editor):
+    # Keep the newest token for any hash seen twice, so the unique index can be built
+    EmailVerificationToken = apps.get_model('users', 'EmailVerificationToken')
+    duplicated = (
+        EmailVerificationToken.objects.values('token_hash')
+        .annotate(n=Count('id')).filter(n__gt=1).values_list('token_hash', flat=True)
+    )
+    for token_hash in duplicated:
+        tokens = EmailVerificationToken.objects.filter(token_hash=token_hash).order_by('-created_at')
+        keep = tokens.values_list('id', flat=True).first()
+        tokens.exclude(id=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_hashes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='token_hash',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(fields=['expires_at'], name='users_token_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(condition=models.Q(('used_at__isnull', False)), fields=['used_at'], name='users_token_used_idx'),
+        ),
+    ]
@@ -51,7 +51,8 @@ class User(AbstractUser):
 class EmailVerificationToken(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='verification_tokens')
-    token_hash = models.CharField(max_length=255)
+    # Unique: verification looks tokens up by hash
+    token_hash = models.CharField(max_length=255, unique=True)
     expires_at = models.DateTimeField()
     used_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -59,4 +60,7 @@ class EmailVerificationToken(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['user', 'expires_at']),
+            # For purge_verification_tokens
+            models.Index(fields=['expires_at'], name='users_token_expires_idx'),
+            models.Index(fields=['used_at'], name='users_token_used_idx', condition=models.Q(used_at__isnull=False)),
         ]
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .authentication import EMAIL_VERIFIED_CLAIM
 
 User = get_user_model()
 
@@ -10,6 +14,9 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ('id', 'email', 'first_name', 'last_name', 'is_email_verified', 'theme_preference', 'date_joined')
         read_only_fields = ('id', 'email', 'is_email_verified', 'date_joined')
 
+# One shared instance: its fields are built once rather than on every login
+user_serializer = UserSerializer()
+
 class SignupSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
     
@@ -21,14 +28,35 @@ class SignupSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Lets UserScopedJWTAuthentication authorize without loading the user
+        token[EMAIL_VERIFIED_CLAIM] = user.is_email_verified
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
-        
-        # Add extra user data to response
-        data.update({
-            'user': UserSerializer(self.user).data
-        })
-        
+        data['user'] = user_serializer.to_representation(self.user)
+        return data
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refreshes the email_verified claim from the database on every token refresh."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        user_id = self.token_class(attrs['refresh'], verify=False).payload.get(api_settings.USER_ID_CLAIM)
+        is_email_verified = bool(
+            User.objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list('is_email_verified', flat=True)
+            .first()
+        )
+        for key, token_class in (('access', AccessToken), ('refresh', RefreshToken)):
+            if key in data:
+                token = token_class(data[key])
+                token[EMAIL_VERIFIED_CLAIM] = is_email_verified
+                data[key] = str(token)
         return data
 
 class EmailVerificationSerializer(serializers.Serializer):
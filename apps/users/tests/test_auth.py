@@ -1,9 +1,12 @@
+import io
 import pytest
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from apps.jobs import queue
 from apps.users.models import EmailVerificationToken
+from apps.users.serializers import UserSerializer
 
 User = get_user_model()
 
@@ -15,19 +18,25 @@ class TestAuth:
         self.verify_url = reverse('verify_email')
         self.login_url = reverse('token_obtain_pair')
 
-    def test_signup_creates_user_and_token(self):
+    def test_signup_creates_user_and_token(self, django_capture_on_commit_callbacks, mailoutbox):
         payload = {
             'email': 'test@example.com',
             'password': 'password123',
             'first_name': 'Test',
             'last_name': 'User'
         }
-        response = self.client.post(self.signup_url, payload)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(self.signup_url, payload)
         assert response.status_code == status.HTTP_201_CREATED
         
         user = User.objects.get(email='test@example.com')
         assert not user.is_email_verified
+        # The token and email come from the background job
+        assert not EmailVerificationToken.objects.filter(user=user).exists()
+        assert queue.run_pending() == 1
         assert EmailVerificationToken.objects.filter(user=user).exists()
+        assert len(mailoutbox) == 1
+        assert 'verify-email?token=' in mailoutbox[0].body
 
     def test_verify_email(self):
         # Create user + token
@@ -54,3 +63,79 @@ class TestAuth:
         assert 'access' in response.data
         assert 'refresh' in response.data
         assert response.data['user']['email'] == 'login@example.com'
+        assert response.data['user'] == UserSerializer(user).data
+
+    def test_login_rehashes_passwords_from_older_hashers(self, settings):
+        settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.PBKDF2PasswordHasher']
+        user = User.objects.create_user(email='old@example.com', password='password123', is_email_verified=True)
+        assert user.password.startswith('pbkdf2_sha256$')
+
+        settings.PASSWORD_HASHERS = [
+            'apps.users.hashers.TunedArgon2PasswordHasher',
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        ]
+        settings.ARGON2_MEMORY_COST = 1024
+        response = self.client.post(self.login_url, {'email': 'old@example.com', 'password': 'password123'})
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith('argon2$argon2id$v=19$m=1024,t=2,p=1$')
+
+        # New cost parameters rehash again on the next login
+        settings.ARGON2_MEMORY_COST = 2048
+        self.client.post(self.login_url, {'email': 'old@example.com', 'password': 'password123'})
+        user.refresh_from_db()
+        assert '$m=2048,' in user.password
+
+    def test_auth_endpoints_are_throttled(self, settings):
+        from django.core.cache import cache
+        cache.clear()
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+            'login': '2/minute', 'signup': '1/minute', 'resend_verification': '1/minute',
+        }}
+        for _ in range(2):
+            assert self.client.post(self.login_url, {'email': 'x@example.com', 'password': 'wrong'}).status_code == status.HTTP_401_UNAUTHORIZED
+        response = self.client.post(self.login_url, {'email': 'x@example.com', 'password': 'wrong'})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        resend_url = reverse('resend_verification')
+        assert self.client.post(resend_url, {'email': 'x@example.com'}).status_code == status.HTTP_200_OK
+        assert self.client.post(resend_url, {'email': 'x@example.com'}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        cache.clear()
+
+    def test_spoofed_forwarded_for_does_not_reset_the_throttle(self, settings):
+        from django.core.cache import cache
+        cache.clear()
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'login': '2/minute'}}
+        credentials = {'email': 'x@example.com', 'password': 'wrong'}
+        for n in range(2):
+            self.client.post(self.login_url, credentials, HTTP_X_FORWARDED_FOR=f'10.0.0.{n}')
+        response = self.client.post(self.login_url, credentials, HTTP_X_FORWARDED_FOR='10.0.0.99')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        # Behind one proxy, the address it appended is the client; what the client sent is ignored
+        cache.clear()
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        for spoofed in ['1.1.1.1', '2.2.2.2']:
+            self.client.post(self.login_url, credentials, HTTP_X_FORWARDED_FOR=f'{spoofed}, 203.0.113.7')
+        response = self.client.post(self.login_url, credentials, HTTP_X_FORWARDED_FOR='3.3.3.3, 203.0.113.7')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert self.client.post(self.login_url, credentials, HTTP_X_FORWARDED_FOR='203.0.113.8').status_code == status.HTTP_401_UNAUTHORIZED
+        cache.clear()
+
+@pytest.mark.django_db
+class TestVerificationTokens:
+    def test_purge_deletes_expired_and_used_tokens_in_batches(self):
+        from datetime import timedelta
+        from django.core.management import call_command
+        from django.utils import timezone
+        from apps.users.tokens import generate_verification_token
+
+        user = User.objects.create_user(email='purge@example.com', password='password123')
+        live = [generate_verification_token(user)[1] for _ in range(2)]
+        expired = [generate_verification_token(user)[1] for _ in range(3)]
+        used = generate_verification_token(user)[1]
+        EmailVerificationToken.objects.filter(pk__in=[t.pk for t in expired]).update(expires_at=timezone.now() - timedelta(minutes=1))
+        EmailVerificationToken.objects.filter(pk=used.pk).update(used_at=timezone.now())
+
+        call_command('purge_verification_tokens', '--batch-size', '2', stdout=io.StringIO())
+        assert set(EmailVerificationToken.objects.values_list('pk', flat=True)) == {t.pk for t in live}
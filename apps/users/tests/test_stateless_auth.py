@@ -0,0 +1,72 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.users.authentication import user_states
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+    def setup_method(self):
+        user_states.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', password='password123', is_email_verified=True)
+        self.budgets_url = reverse('budget-list')
+
+    def login(self, email='user@example.com'):
+        response = self.client.post(reverse('token_obtain_pair'), {'email': email, 'password': 'password123'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_user_scoped_requests_skip_the_user_query(self, settings, django_assert_num_queries):
+        self.login()
+        self.client.get(self.budgets_url)
+
+        settings.JWT_STATELESS_USER = False
+        with django_assert_num_queries(1):
+            assert self.client.get(self.budgets_url).status_code == status.HTTP_200_OK
+
+        settings.JWT_STATELESS_USER = True
+        self.client.get(self.budgets_url)  # fills the per-process user state cache
+        with django_assert_num_queries(0):
+            assert self.client.get(self.budgets_url).status_code == status.HTTP_200_OK
+
+    def test_writes_work_with_claims_user(self, settings):
+        settings.JWT_STATELESS_USER = True
+        self.login()
+        response = self.client.post(reverse('expense-list'), {
+            'title': 'Lunch', 'amount': '10.00', 'expense_date': '2023-10-01', 'category': 'Food'
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        assert self.user.expenses.count() == 1
+        assert self.client.get(reverse('expense-summary')).data['count'] == 1
+
+    def test_deactivation_and_verification_are_picked_up(self, settings):
+        settings.JWT_STATELESS_USER = True
+        unverified = User.objects.create_user(email='new@example.com', password='password123')
+        self.login('new@example.com')
+        assert self.client.get(self.budgets_url).status_code == status.HTTP_403_FORBIDDEN
+
+        # Saving the user drops the cached state, so the stale claim is overridden
+        unverified.is_email_verified = True
+        unverified.save()
+        assert self.client.get(self.budgets_url).status_code == status.HTTP_200_OK
+
+        unverified.is_active = False
+        unverified.save()
+        assert self.client.get(self.budgets_url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_updates_verified_claim(self, settings):
+        settings.JWT_STATELESS_USER = True
+        settings.JWT_STATELESS_USER_TTL = 0
+        unverified = User.objects.create_user(email='new@example.com', password='password123')
+        tokens = self.login('new@example.com')
+        assert self.client.get(self.budgets_url).status_code == status.HTTP_403_FORBIDDEN
+
+        unverified.is_email_verified = True
+        unverified.save()
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        assert self.client.get(self.budgets_url).status_code == status.HTTP_200_OK
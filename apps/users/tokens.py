@@ -1,6 +1,7 @@
 import hashlib
 import secrets
 from datetime import timedelta
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings
 from .models import EmailVerificationToken
@@ -47,3 +48,18 @@ def mark_token_used(token_obj):
     user.is_email_verified = True
     user.save()
     return user
+
+def purge_tokens(batch_size=5000, now=None):
+    """
+    Delete expired and used tokens, `batch_size` rows per DELETE so no
+    statement holds locks for long. Returns the number deleted.
+    """
+    now = now or timezone.now()
+    deleted = 0
+    for stale in (Q(expires_at__lt=now), Q(used_at__isnull=False)):
+        while True:
+            ids = list(EmailVerificationToken.objects.filter(stale).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += EmailVerificationToken.objects.filter(id__in=ids).delete()[0]
+    return deleted
@@ -1,10 +1,10 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     SignupView, 
     VerifyEmailView, 
     ResendVerificationView, 
     CustomTokenObtainPairView,
+    CustomTokenRefreshView,
     MeView,
     UserPreferencesView
 )
@@ -14,7 +14,7 @@ urlpatterns = [
     path('verify-email/', VerifyEmailView.as_view(), name='verify_email'),
     path('resend-verification/', ResendVerificationView.as_view(), name='resend_verification'),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('me/', MeView.as_view(), name='me'),
     path('preferences/', UserPreferencesView.as_view(), name='user_preferences'),
 ]
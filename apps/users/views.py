@@ -2,46 +2,42 @@ from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.db import transaction
 from django.conf import settings
-from django.core.mail import send_mail  # In prod, use task queue
 
-from .models import User, EmailVerificationToken
+from apps.common import metrics
+from apps.common.conditional import make_etag, not_modified, set_validators
+from apps.common.throttling import SharedScopedRateThrottle
+from apps.jobs import queue
+from .models import User
 from .serializers import (
     SignupSerializer, 
     UserSerializer, 
     CustomTokenObtainPairSerializer, 
+    CustomTokenRefreshSerializer,
     EmailVerificationSerializer,
     ResendVerificationSerializer,
     UserPreferenceSerializer
 )
-from .tokens import generate_verification_token, verify_token, mark_token_used
+from .tokens import verify_token, mark_token_used
 
 class SignupView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = SignupSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [SharedScopedRateThrottle]
+    throttle_scope = 'signup'
 
     @transaction.atomic
     def perform_create(self, serializer):
         user = serializer.save()
-        # Generate token
-        raw_token, token_obj = generate_verification_token(user)
-        
-        # Send email (In real app, this should be async/Celery)
-        # We mock the link for now
-        verification_link = f"http://localhost:5173/verify-email?token={raw_token}"
-        print(f"------------\nVERIFICATION LINK: {verification_link}\n------------")
-        
-        # In a real setup, actually send the email
-        # send_mail(
-        #     "Verify your email",
-        #     f"Click here: {verification_link}",
-        #     settings.DEFAULT_FROM_EMAIL,
-        #     [user.email],
-        #     fail_silently=True,
-        # )
+        transaction.on_commit(metrics.SIGNUPS.inc)
+        # Token and email are made by a background job, once the user is committed
+        queue.enqueue_on_commit(
+            'users.send_verification_email', {'user_id': str(user.pk)},
+            key=f'users.send_verification_email:signup:{user.pk}',
+        )
 
 class VerifyEmailView(APIView):
     permission_classes = [AllowAny]
@@ -62,6 +58,8 @@ class VerifyEmailView(APIView):
 class ResendVerificationView(APIView):
     permission_classes = [AllowAny]
     serializer_class = ResendVerificationSerializer
+    throttle_classes = [SharedScopedRateThrottle]
+    throttle_scope = 'resend_verification'
 
     def post(self, request):
         email = request.data.get('email')
@@ -75,26 +73,29 @@ class ResendVerificationView(APIView):
         if user.is_email_verified:
             return Response({'success': True, 'message': 'Already verified'})
             
-        # Invalidate old tokens
-        EmailVerificationToken.objects.filter(user=user, used_at__isnull=True).delete()
-        
-        # Generate new
-        raw_token, token_obj = generate_verification_token(user)
-        
-        verification_link = f"http://localhost:5173/verify-email?token={raw_token}"
-        print(f"------------\nRESEND VERIFICATION LINK: {verification_link}\n------------")
-        
+        # The job replaces any unused token with a new one
+        queue.enqueue('users.send_verification_email', {'user_id': str(user.pk)})
         return Response({'success': True, 'message': 'Verification email sent'})
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [SharedScopedRateThrottle]
+    throttle_scope = 'login'
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        user = request.user
+        etag = make_etag(user.pk, user.updated_at)
+        last_modified = int(user.updated_at.timestamp())
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response(UserSerializer(user).data)
+        return set_validators(response, etag, last_modified)
 
 class UserPreferencesView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,25 @@
+"""
+Gunicorn settings: `gunicorn -c config/gunicorn.py config.wsgi:application`.
+
+With PROMETHEUS_MULTIPROC_DIR set, workers write their metrics to files
+in that directory (see apps.common.metrics). It is emptied when the
+master starts, and a dead worker's live gauges are dropped when it exits.
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            os.remove(os.path.join(path, name))
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
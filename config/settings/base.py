@@ -36,10 +36,14 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.expenses',
     'apps.budgets',
+    'apps.currencies',
+    'apps.jobs',
     'apps.common',
 ]
 
 MIDDLEWARE = [
+    'apps.common.profiling.ProfilingMiddleware',
+    'apps.common.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -76,6 +80,31 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': env.db('DATABASE_URL', default='postgres://postgres:postgres@db:5432/expense_tracker')
 }
+# Reuse a connection across requests for up to DB_CONN_MAX_AGE seconds (0: close after every
+# request), checking it is still usable before a request reuses it. Under ASGI, prefer DB_POOL.
+DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+# PostgreSQL only (Django 5.1+): a psycopg connection pool per process, replacing persistent connections.
+if env.bool('DB_POOL', default=False):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+        'timeout': env.int('DB_POOL_TIMEOUT', default=10),
+    }
+
+# Cache
+# e.g. filecache:///var/tmp/django_cache or rediscache://host:6379/1. It holds the response
+# cache's version stamps, so every process that writes data (all workers, management commands,
+# scripts) must share it: use Redis across hosts. locmemcache:// is only safe with a single
+# worker and no out-of-process writers, since other processes never see its invalidations.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='filecache:///var/tmp/django_cache'),
+}
+
+# Per-user response cache (see apps.common.cache)
+RESPONSE_CACHE_ALIAS = env('RESPONSE_CACHE_ALIAS', default='default')
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
 
 
 # Password validation
@@ -96,6 +125,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing profile: "argon2" (argon2id with the costs below) or "pbkdf2" (Django's default).
+# Hashes made by any listed hasher still verify, and are rehashed with the profile's hasher (or
+# its current costs) at the user's next login.
+PASSWORD_HASHER_PROFILE = env('PASSWORD_HASHER_PROFILE', default='argon2')
+ARGON2_TIME_COST = env.int('ARGON2_TIME_COST', default=2)
+ARGON2_MEMORY_COST = env.int('ARGON2_MEMORY_COST', default=19 * 1024)  # KiB
+ARGON2_PARALLELISM = env.int('ARGON2_PARALLELISM', default=1)
+PASSWORD_HASHERS = {
+    'argon2': [
+        'apps.users.hashers.TunedArgon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+    'pbkdf2': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'apps.users.hashers.TunedArgon2PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+}[PASSWORD_HASHER_PROFILE]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -115,6 +166,15 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Files written by background jobs (e.g. expense exports)
+MEDIA_ROOT = env('MEDIA_ROOT', default=os.path.join(BASE_DIR, 'media'))
+
+# Email: printed to the console unless configured
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='no-reply@localhost')
+# Frontend base URL used in links sent by email
+FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:5173')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -123,6 +183,11 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
 
 # REST Framework
+# Render and parse JSON with orjson (apps.common.renderers/parsers); same output
+# as DRF's stdlib-json classes, which False switches back to.
+FAST_JSON = env.bool('FAST_JSON', default=True)
+JSON_RENDERER = 'apps.common.renderers.ORJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer'
+JSON_PARSER = 'apps.common.parsers.ORJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -135,11 +200,33 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
         'rest_framework.filters.SearchFilter',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'apps.common.exceptions.custom_exception_handler',
+    'LIST_SERIALIZER_ERRORS_AS_DICT': True,
+    # Per client IP, for views using apps.common.throttling.SharedScopedRateThrottle
+    'DEFAULT_THROTTLE_RATES': {
+        'login': env('THROTTLE_LOGIN_RATE', default='10/minute'),
+        'signup': env('THROTTLE_SIGNUP_RATE', default='20/hour'),
+        'resend_verification': env('THROTTLE_RESEND_VERIFICATION_RATE', default='5/hour'),
+    },
+    # Reverse proxies in front of the app. Throttles key on the client address
+    # the outermost trusted proxy appended to X-Forwarded-For; with 0 they use
+    # REMOTE_ADDR and ignore the header, which clients can set to anything.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
+# Cache holding throttle history; use a shared backend when running several workers.
+THROTTLE_CACHE_ALIAS = env('THROTTLE_CACHE_ALIAS', default='default')
 
 # JWT
 SIMPLE_JWT = {
@@ -147,11 +234,63 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
 }
+# Build request.user for expense/budget views from token claims instead of a
+# users-table query; the user's active/verified state is rechecked at most
+# every JWT_STATELESS_USER_TTL seconds per process (see apps.users.authentication).
+JWT_STATELESS_USER = env.bool('JWT_STATELESS_USER', default=False)
+JWT_STATELESS_USER_TTL = env.int('JWT_STATELESS_USER_TTL', default=30)
 
 # CORS
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=['http://localhost:5173'])
 CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=['http://localhost:5173'])
 
+# Expenses
+# Rows fetched per server-side cursor round trip, and bytes buffered before
+# each write, when streaming CSV exports.
+EXPENSE_EXPORT_CHUNK_SIZE = env.int('EXPENSE_EXPORT_CHUNK_SIZE', default=2000)
+EXPENSE_EXPORT_BUFFER_SIZE = env.int('EXPENSE_EXPORT_BUFFER_SIZE', default=64 * 1024)
+# Rows accepted per /api/expenses/bulk/ request, and rows per INSERT/UPDATE batch.
+EXPENSE_BULK_MAX_ROWS = env.int('EXPENSE_BULK_MAX_ROWS', default=5000)
+EXPENSE_BULK_BATCH_SIZE = env.int('EXPENSE_BULK_BATCH_SIZE', default=500)
+# Per-view query count and latency histograms, read at /api/health/profile/.
+REQUEST_PROFILING = env.bool('REQUEST_PROFILING', default=True)
+REQUEST_PROFILING_MAX_VIEWS = env.int('REQUEST_PROFILING_MAX_VIEWS', default=200)
+# Also report the request's figures in a Server-Timing response header.
+REQUEST_PROFILING_SERVER_TIMING = env.bool('REQUEST_PROFILING_SERVER_TIMING', default=False)
+# Seconds a health check result is reused, so frequent probes don't reconnect (0: check every time).
+HEALTH_CHECK_CACHE_SECONDS = env.int('HEALTH_CHECK_CACHE_SECONDS', default=10)
+# When set, /metrics requires "Authorization: Bearer <token>".
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+# Background jobs (python manage.py run_jobs): attempts before a job is marked failed, first retry
+# delay in seconds (doubled on each further attempt), how long a claim lasts before another worker
+# may take the job over, and the idle poll interval.
+JOBS_MAX_ATTEMPTS = env.int('JOBS_MAX_ATTEMPTS', default=5)
+JOBS_RETRY_DELAY = env.int('JOBS_RETRY_DELAY', default=30)
+JOBS_LEASE_SECONDS = env.int('JOBS_LEASE_SECONDS', default=600)
+JOBS_POLL_INTERVAL = env.float('JOBS_POLL_INTERVAL', default=2.0)
+# Most buckets one /api/expenses/timeseries/ response may contain.
+EXPENSE_TIMESERIES_MAX_BUCKETS = env.int('EXPENSE_TIMESERIES_MAX_BUCKETS', default=400)
+# Most months one /api/expenses/report/ range may span (one pair of aggregates each).
+EXPENSE_REPORT_MAX_MONTHS = env.int('EXPENSE_REPORT_MAX_MONTHS', default=36)
+# Serve the expense list, summary and export GETs from async views. ASGI only:
+# under WSGI, Django buffers async streaming responses in memory.
+EXPENSES_ASYNC_VIEWS = env.bool('EXPENSES_ASYNC_VIEWS', default=False)
+# Statement imports: rows per dedupe/INSERT batch, and accepted CSV date formats.
+EXPENSE_IMPORT_BATCH_SIZE = env.int('EXPENSE_IMPORT_BATCH_SIZE', default=1000)
+EXPENSE_IMPORT_DATE_FORMATS = env.list(
+    'EXPENSE_IMPORT_DATE_FORMATS', default=['%Y-%m-%d', '%d/%m/%Y', '%d.%m.%Y', '%Y/%m/%d']
+)
+
+# Currencies
+# Currency that Expense.amount_base, rollups and summaries are expressed in,
+# and the number of (currency, date) rates cached per process.
+BASE_CURRENCY = env('BASE_CURRENCY', default='USD').upper()
+EXCHANGE_RATE_CACHE_SIZE = env.int('EXCHANGE_RATE_CACHE_SIZE', default=4096)
+
+# Budgets
+# Percentages of a budget whose crossing records a BudgetAlertEvent.
+BUDGET_ALERT_THRESHOLDS = env.list('BUDGET_ALERT_THRESHOLDS', cast=int, default=[50, 80, 100])
+
 # Spectacular
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Expense Tracker API',
@@ -1,13 +1,16 @@
 from django.contrib import admin
 from django.urls import path, include
+from apps.common.metrics import metrics_view
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/auth/', include('apps.users.urls')),
     path('api/expenses/', include('apps.expenses.urls')),
     path('api/budgets/', include('apps.budgets.urls')),
+    path('api/jobs/', include('apps.jobs.urls')),
     path('api/health/', include('apps.common.urls')),
 ]
@@ -0,0 +1,44 @@
+"""
+Queries per request with and without JWT_STATELESS_USER.
+
+Requests carry a real access token; each endpoint is called once to warm
+caches before counting.
+
+    python -m scripts.benchmarks.auth_queries
+"""
+from scripts.benchmarks import harness
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.users.authentication import user_states  # noqa: E402
+
+ENDPOINTS = [
+    ('expense-list', {'limit': 20}),
+    ('expense-summary', {}),
+    ('budget-list', {}),
+]
+
+
+def main():
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, 1000)
+        client = APIClient()
+        tokens = client.post(reverse('token_obtain_pair'), {'email': user.email, 'password': 'password123'}).data
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        for stateless in (False, True):
+            user_states.clear()
+            with override_settings(JWT_STATELESS_USER=stateless):
+                for name, params in ENDPOINTS:
+                    client.get(reverse(name), params)
+                    with CaptureQueriesContext(connection) as queries:
+                        client.get(reverse(name), params)
+                    harness.emit('auth_queries', stateless=stateless, endpoint=name, queries=len(queries))
+
+
+if __name__ == '__main__':
+    main()
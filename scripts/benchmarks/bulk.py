@@ -0,0 +1,54 @@
+"""
+Rows per second for per-row POST /api/expenses/ versus POST /api/expenses/bulk/.
+
+Both paths go through the full request cycle with a real JWT, so the
+per-row numbers include token decoding, the user lookup, permission
+checks and validation for every row.
+
+    python -m scripts.benchmarks.bulk --rows 2000
+"""
+import argparse
+
+from scripts.benchmarks import harness
+
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from apps.expenses.models import Expense  # noqa: E402
+
+
+def payload(count):
+    return [
+        {'title': f'Row {i}', 'amount': f'{10 + i % 90}.50', 'category': harness.CATEGORIES[i % 5],
+         'currency': 'USD', 'expense_date': '2024-01-15', 'notes': 'Imported from statement'}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        rows = payload(args.rows)
+
+        with harness.timer() as elapsed:
+            for row in rows:
+                assert client.post(reverse('expense-list'), row, format='json').status_code == 201
+        harness.emit('bulk', mode='per_row', rows=args.rows, seconds=round(elapsed['seconds'], 3),
+                     rows_per_second=round(args.rows / elapsed['seconds']))
+
+        Expense.objects.all().delete()
+        with harness.timer() as elapsed:
+            assert client.post(reverse('expense-bulk'), rows, format='json').status_code == 201
+        harness.emit('bulk', mode='bulk', rows=args.rows, seconds=round(elapsed['seconds'], 3),
+                     rows_per_second=round(args.rows / elapsed['seconds']))
+
+
+if __name__ == '__main__':
+    main()
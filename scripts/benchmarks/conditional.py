@@ -0,0 +1,51 @@
+"""
+Latency of a full expense list page versus a 304 revalidation.
+
+    python -m scripts.benchmarks.conditional --rows 20000 --limit 100 --repeat 200
+"""
+import argparse
+import statistics
+import time
+
+from scripts.benchmarks import harness
+
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+
+def sample(client, url, params, repeat, **headers):
+    timings, status_code, size = [], None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, params, **headers)
+        timings.append(time.perf_counter() - start)
+        status_code, size = response.status_code, len(response.content)
+    return status_code, size, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, args.rows)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url, params = reverse('expense-list'), {'limit': args.limit}
+        etag = client.get(url, params)['ETag']
+
+        for mode, headers in (('full', {}), ('not_modified', {'HTTP_IF_NONE_MATCH': etag})):
+            status_code, size, timings = sample(client, url, params, args.repeat, **headers)
+            harness.emit(
+                'conditional', mode=mode, status=status_code, rows=args.rows, limit=args.limit, bytes=size,
+                p50_ms=round(statistics.median(timings) * 1000, 2),
+                mean_ms=round(statistics.fmean(timings) * 1000, 2),
+            )
+
+
+if __name__ == '__main__':
+    main()
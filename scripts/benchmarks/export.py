@@ -0,0 +1,65 @@
+"""
+Peak Python memory of the CSV export at increasing row counts.
+
+Compares the routed streaming export (/api/expenses/export/) with a
+buffered variant that materialises the whole CSV, which is what the
+previous HttpResponse-based implementation did. The streaming peak
+should stay flat while the buffered peak grows with the row count.
+
+    python -m scripts.benchmarks.export --sizes 10000,100000,1000000
+"""
+import argparse
+import tracemalloc
+
+from scripts.benchmarks import harness
+
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.expenses.exports import iter_csv  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+
+
+def measure(consume):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    with harness.timer() as elapsed:
+        size = consume()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, elapsed['seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    with harness.test_database():
+        user = harness.make_user()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('expense-export')
+
+        def streamed():
+            response = client.get(url)
+            return sum(len(chunk) for chunk in response.streaming_content)
+
+        def buffered():
+            return len(''.join(iter_csv(Expense.objects.filter(user=user))))
+
+        loaded = 0
+        for size in sizes:
+            harness.add_expenses(user, size - loaded, start=loaded)
+            loaded = size
+            for mode, consume in (('streaming', streamed), ('buffered', buffered)):
+                nbytes, peak, seconds = measure(consume)
+                harness.emit(
+                    'export', mode=mode, rows=size, bytes=nbytes,
+                    peak_kib=round(peak / 1024), seconds=round(seconds, 3),
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Full expense list pages versus sparse fieldsets, on rows with long notes.
+
+Gives --rows expenses a --notes-bytes note each, then compares
+GET /api/expenses/?limit=--limit with and without
+fields=id,amount,expense_date: response size and request p50, plus
+the time to fetch one page of rows with the list's column selection.
+
+    python -m scripts.benchmarks.fieldsets --rows 20000 --notes-bytes 2000
+"""
+import argparse
+import statistics
+import time
+
+from scripts.benchmarks import harness
+
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.common.cache import invalidate_user  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.views import ExpenseViewSet  # noqa: E402
+
+MODES = {'all_fields': None, 'sparse': 'id,amount,expense_date'}
+
+
+def p50_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--notes-bytes', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, args.rows)
+        Expense.objects.filter(user=user).update(notes='n' * args.notes_bytes)
+        invalidate_user(user.pk, 'expenses')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('expense-list')
+
+        queryset = Expense.objects.filter(user=user).order_by('-expense_date')
+        for mode, fields in MODES.items():
+            params = {'limit': args.limit, **({'fields': fields} if fields else {})}
+            response = client.get(url, params)
+            assert response.status_code == 200
+            values_serializer = ExpenseViewSet.values_serializer
+            if fields:
+                values_serializer = values_serializer.restrict(fields.split(','), keep=ExpenseViewSet.sparse_fields_required)
+            harness.emit(
+                'fieldsets', mode=mode, rows=args.rows, limit=args.limit, bytes=len(response.content),
+                p50_ms=p50_ms(lambda: client.get(url, params), args.repeat),
+                page_fetch_p50_ms=p50_ms(lambda: list(values_serializer.values(queryset)[:args.limit]), args.repeat),
+            )
+
+if __name__ == '__main__':
+    main()
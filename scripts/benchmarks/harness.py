@@ -0,0 +1,87 @@
+"""
+Shared setup for the benchmark scripts in this package.
+
+Run benchmarks from the repository root as modules, e.g.
+
+    python -m scripts.benchmarks.export --sizes 10000,100000
+
+Each benchmark runs against a throwaway test database created through
+Django's test-database machinery, so it never touches real data. The
+default settings are the SQLite test settings; to benchmark PostgreSQL
+run with DJANGO_SETTINGS_MODULE=config.settings.base and DATABASE_URL
+pointing at a server where the test database may be created.
+"""
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+CATEGORIES = ['Food', 'Transport', 'Utilities', 'Entertainment', 'Health']
+
+
+@contextlib.contextmanager
+def test_database():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_user(email='bench@example.com'):
+    return get_user_model().objects.create_user(email=email, password='password123', is_email_verified=True)
+
+
+def add_expenses(user, count, start=0, batch_size=5000):
+    """Bulk insert `count` synthetic expenses for `user` and refresh its rollups."""
+    from apps.expenses import rollups
+    from apps.expenses.models import Expense
+
+    today = date.today()
+    batch = []
+    for i in range(start, start + count):
+        batch.append(Expense(
+            user=user,
+            title=f"Expense {i}",
+            amount=Decimal(10 + i % 190) + Decimal(i % 100) / 100,
+            currency='USD',
+            category=CATEGORIES[i % len(CATEGORIES)],
+            expense_date=today - timedelta(days=i % 730),
+            notes=f"Synthetic benchmark row {i}",
+        ))
+        if len(batch) >= batch_size:
+            Expense.objects.bulk_create(batch)
+            batch = []
+    Expense.objects.bulk_create(batch)
+    rollups.rebuild([user.id])
+
+
+@contextlib.contextmanager
+def timer():
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['seconds'] = time.perf_counter() - start
+
+
+def emit(benchmark, **fields):
+    """Write one machine-readable result line to stdout."""
+    print(json.dumps({'benchmark': benchmark, **fields}, default=str), flush=True)
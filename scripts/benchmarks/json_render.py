@@ -0,0 +1,90 @@
+"""
+JSON rendering and parsing: DRF's stdlib-json classes versus orjson.
+
+Renders a list page payload of --rows expenses (as ExpenseValuesSerializer
+produces it), the same rows as raw values (UUID, Decimal, date and
+datetime objects left to the encoder), and a year-long summary timeline;
+then parses a bulk create body of --rows expenses. Checks that both
+renderers produce the same bytes.
+
+    python -m scripts.benchmarks.json_render --rows 10000
+"""
+import argparse
+import io
+import time
+from datetime import date, timedelta
+
+from scripts.benchmarks import harness
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.common.parsers import ORJSONParser  # noqa: E402
+from apps.common.renderers import ORJSONRenderer  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.serializers import ExpenseValuesSerializer  # noqa: E402
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def payloads(user, rows):
+    serializer = ExpenseValuesSerializer()
+    queryset = Expense.objects.filter(user=user).order_by('-expense_date')
+    page = serializer.values(queryset)[:rows]
+    today = date.today()
+    return {
+        'list_page': {'count': rows, 'next': None, 'previous': None, 'results': serializer.to_representation(page)},
+        'raw_values': list(queryset.values()[:rows]),
+        'summary_timeline': {
+            'timeline': [
+                {'date': today - timedelta(days=day), 'category': category, 'total': f'{day % 97}.50'}
+                for day in range(365) for category in harness.CATEGORIES
+            ],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, args.rows)
+
+        for name, data in payloads(user, args.rows).items():
+            rendered = JSONRenderer().render(data)
+            assert ORJSONRenderer().render(data) == rendered, f'{name}: output differs'
+            stdlib = best_of(lambda: JSONRenderer().render(data), args.repeat)
+            fast = best_of(lambda: ORJSONRenderer().render(data), args.repeat)
+            harness.emit(
+                'json_render', payload=name, bytes=len(rendered), identical=True,
+                stdlib_ms=round(stdlib * 1000, 2), orjson_ms=round(fast * 1000, 2), speedup=round(stdlib / fast, 1),
+            )
+
+        body = JSONRenderer().render([
+            {'title': f'Expense {i}', 'amount': f'{10 + i % 90}.25', 'currency': 'USD', 'category': 'Food',
+             'expense_date': '2024-01-31', 'notes': 'Café'}
+            for i in range(args.rows)
+        ])
+        context = {'encoding': 'utf-8'}
+        assert ORJSONParser().parse(io.BytesIO(body), parser_context=context) == JSONParser().parse(io.BytesIO(body), parser_context=context)
+        stdlib = best_of(lambda: JSONParser().parse(io.BytesIO(body), parser_context=context), args.repeat)
+        fast = best_of(lambda: ORJSONParser().parse(io.BytesIO(body), parser_context=context), args.repeat)
+        harness.emit(
+            'json_parse', payload='bulk_create', bytes=len(body),
+            stdlib_ms=round(stdlib * 1000, 2), orjson_ms=round(fast * 1000, 2), speedup=round(stdlib / fast, 1),
+        )
+
+
+if __name__ == '__main__':
+    main()
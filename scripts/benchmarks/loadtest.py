@@ -0,0 +1,99 @@
+"""
+Throughput and latency of a running server under concurrent GETs.
+
+Unlike the other benchmarks this one does not set up Django; it drives an
+already running server so WSGI and ASGI deployments can be compared on
+the same database. Seed some data, log in to get an access token, then
+start one of:
+
+    gunicorn config.wsgi:application -w 4 --bind 127.0.0.1:8000
+    EXPENSES_ASYNC_VIEWS=true gunicorn config.asgi:application -w 4 \\
+        -k uvicorn_worker.UvicornWorker --bind 127.0.0.1:8000
+
+and run, once per server:
+
+    python -m scripts.benchmarks.loadtest --token "$ACCESS" --label wsgi \\
+        --paths "/api/expenses/?limit=50,/api/expenses/summary/" --concurrency 1,8,32,64
+
+Each concurrency level prints one JSON line with requests/s and
+p50/p99 latency in milliseconds.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def worker(base, paths, headers, deadline, latencies, errors, lock):
+    connection = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(path)
+    connection.close()
+
+
+def run(base, paths, headers, concurrency, duration):
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker, base, paths, headers, deadline, latencies, errors, lock)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--token', required=True, help='JWT access token')
+    parser.add_argument('--paths', default='/api/expenses/?limit=50,/api/expenses/summary/')
+    parser.add_argument('--concurrency', default='1,8,32,64')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per concurrency level')
+    parser.add_argument('--label', default='server')
+    args = parser.parse_args()
+
+    base = urlsplit(args.url)
+    paths = [path for path in args.paths.split(',') if path]
+    headers = {'Authorization': f'Bearer {args.token}', 'Connection': 'keep-alive'}
+
+    for concurrency in (int(value) for value in args.concurrency.split(',')):
+        latencies, errors = run(base, paths, headers, concurrency, args.duration)
+        print(json.dumps({
+            'benchmark': 'loadtest',
+            'label': args.label,
+            'concurrency': concurrency,
+            'requests_per_s': round(len(latencies) / args.duration, 1),
+            'p50_ms': round(percentile(latencies, 0.5) or 0, 2),
+            'p99_ms': round(percentile(latencies, 0.99) or 0, 2),
+            'errors': len(errors),
+        }), flush=True)
+
+
+if __name__ == '__main__':
+    main()
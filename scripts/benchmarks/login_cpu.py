@@ -0,0 +1,66 @@
+"""
+CPU time per login for each password hasher profile.
+
+Logs one user in --logins times through POST /api/auth/login/ with
+throttling off and reports process CPU time per login. Also checks that
+a PBKDF2 hash is upgraded to Argon2 by the first login under the argon2
+profile.
+
+    python -m scripts.benchmarks.login_cpu --logins 50
+"""
+import argparse
+import statistics
+import time
+
+from scripts.benchmarks import harness
+
+from django.conf import settings  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+PROFILES = {
+    'pbkdf2': ['django.contrib.auth.hashers.PBKDF2PasswordHasher', 'apps.users.hashers.TunedArgon2PasswordHasher'],
+    'argon2': ['apps.users.hashers.TunedArgon2PasswordHasher', 'django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+}
+
+
+def login(client, email):
+    response = client.post(reverse('token_obtain_pair'), {'email': email, 'password': 'password123'})
+    assert response.status_code == 200, response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=50)
+    args = parser.parse_args()
+
+    rates = {scope: None for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']}
+    client = APIClient()
+    with harness.test_database(), override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+        for profile, hashers in PROFILES.items():
+            with override_settings(PASSWORD_HASHERS=hashers):
+                user = harness.make_user(f'{profile}@example.com')
+                login(client, user.email)
+                cpu, wall = [], []
+                for _ in range(args.logins):
+                    cpu_start, wall_start = time.process_time(), time.perf_counter()
+                    login(client, user.email)
+                    cpu.append((time.process_time() - cpu_start) * 1000)
+                    wall.append((time.perf_counter() - wall_start) * 1000)
+                harness.emit(
+                    'login_cpu', profile=profile, logins=args.logins,
+                    cpu_ms=round(statistics.median(cpu), 1), wall_p50_ms=round(statistics.median(wall), 1),
+                    logins_per_cpu_second=round(1000 / statistics.median(cpu), 1),
+                )
+
+        with override_settings(PASSWORD_HASHERS=PROFILES['pbkdf2']):
+            user = harness.make_user('upgrade@example.com')
+        with override_settings(PASSWORD_HASHERS=PROFILES['argon2']):
+            login(client, user.email)
+            user.refresh_from_db()
+        harness.emit('login_rehash', before='pbkdf2_sha256', after=user.password.split('$', 2)[1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+The expense report: one grouped rollup query versus a query per figure.
+
+Gives one user --rows expenses over two years, then times a one-year
+report built by apps.expenses.reports (a single conditional aggregation
+over the daily rollups) against the same figures computed the usual way:
+a total, a breakdown and one query per month, each filtering expenses
+with __year/__month lookups. Checks that both give the same totals.
+
+    python -m scripts.benchmarks.report --rows 200000
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+from scripts.benchmarks import harness
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count, Sum  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.reports import build_report, year_range  # noqa: E402
+
+
+def per_figure(user_id, year):
+    expenses = Expense.objects.filter(user_id=user_id, expense_date__year=year)
+    totals = expenses.aggregate(total=Sum('amount'), count=Count('id'))
+    breakdown = list(expenses.values('category').annotate(total=Sum('amount'), count=Count('id')).order_by())
+    monthly = [expenses.filter(expense_date__month=month).aggregate(total=Sum('amount')) for month in range(1, 13)]
+    return totals, breakdown, monthly
+
+
+def measure(function, repeat):
+    with CaptureQueriesContext(connection) as captured:
+        result = function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return result, len(captured), round(statistics.median(timings) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, args.rows)
+        year = date.today().year - 1
+
+        report, report_queries, report_ms = measure(lambda: build_report(user.pk, *year_range(year)), args.repeat)
+        (totals, _, monthly), naive_queries, naive_ms = measure(lambda: per_figure(user.pk, year), args.repeat)
+        cents = Decimal('0.01')
+        assert report['total_spend'] == totals['total'].quantize(cents) and report['count'] == totals['count']
+        assert [row['total'] for row in report['monthly']] == [(row['total'] or 0).quantize(cents) for row in monthly]
+
+        harness.emit('report', approach='per_figure', rows=args.rows, queries=naive_queries, p50_ms=naive_ms)
+        harness.emit('report', approach='rollup_single_query', rows=args.rows, queries=report_queries, p50_ms=report_ms)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Indexed expense search versus an icontains scan over title and notes.
+
+Loads --rows expenses for one user (plus the same number spread over
+other users, so per-user scoping matters) with titles and notes drawn
+from a small vocabulary, builds the search index, then times each query
+both ways through the ORM. With the default SQLite settings that is the
+token index; with PostgreSQL settings (see harness) the GIN-indexed
+search_vector.
+
+    python -m scripts.benchmarks.search --rows 1000000
+"""
+import argparse
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from scripts.benchmarks import harness
+
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from apps.expenses import search  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+
+WORDS = [
+    'coffee', 'lunch', 'dinner', 'taxi', 'train', 'groceries', 'market', 'rent', 'electricity', 'water',
+    'internet', 'phone', 'gym', 'cinema', 'books', 'pharmacy', 'doctor', 'flight', 'hotel', 'fuel',
+    'parking', 'insurance', 'gift', 'charity', 'subscription', 'music', 'games', 'clothes', 'shoes', 'repairs',
+]
+QUERIES = ['coffee', 'pharm', 'taxi airport', 'insurance renewal', 'gift charity split', 'zebra']
+
+
+def load(user, rows, seed):
+    rng = random.Random(seed)
+    today = date.today()
+    batch = []
+    for i in range(rows):
+        words = rng.sample(WORDS, 2)
+        batch.append(Expense(
+            user=user,
+            title=f"{words[0].title()} {words[1]}",
+            notes=rng.choice(['', 'airport', 'renewal', 'paid by card', 'split with friends']),
+            amount=Decimal(10 + i % 190),
+            category=harness.CATEGORIES[i % len(harness.CATEGORIES)],
+            expense_date=today - timedelta(days=i % 730),
+        ))
+        if len(batch) >= 5000:
+            Expense.objects.bulk_create(batch)
+            batch = []
+    Expense.objects.bulk_create(batch)
+
+
+def best_of(runs, func):
+    timings = []
+    for _ in range(runs):
+        with harness.timer() as elapsed:
+            result = func()
+        timings.append(elapsed['seconds'])
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        other = harness.make_user('other@example.com')
+        load(user, args.rows, seed=1)
+        load(other, args.rows, seed=2)
+        with harness.timer() as indexing:
+            tokens = search.rebuild()
+            # Planner statistics, as a long-lived database would have them. On PostgreSQL,
+            # VACUUM also merges the GIN pending list (as autovacuum would after a bulk
+            # load); until then every tsvector query scans all the rows just inserted.
+            connection.cursor().execute('VACUUM ANALYZE' if search.uses_tsvector() else 'ANALYZE')
+        harness.emit('search_index', rows=args.rows * 2, tokens=tokens, seconds=round(indexing['seconds'], 2))
+
+        expenses = Expense.objects.filter(user=user)
+        for query in QUERIES:
+            def scan():
+                matches = expenses
+                for term in search.parse_query(query):
+                    matches = matches.filter(Q(title__icontains=term) | Q(notes__icontains=term))
+                return matches.count(), list(matches[:args.limit])
+
+            def indexed():
+                matches = search.search_expenses(expenses, query, user.pk)
+                return matches.count(), list(matches.order_by('-search_rank', '-expense_date')[:args.limit])
+
+            scan_seconds, (scan_count, _) = best_of(args.runs, scan)
+            index_seconds, (index_count, _) = best_of(args.runs, indexed)
+            harness.emit(
+                'search', rows=args.rows, query=query, matches=index_count, icontains_matches=scan_count,
+                icontains_ms=round(scan_seconds * 1000, 1), indexed_ms=round(index_seconds * 1000, 1),
+            )
+
+
+if __name__ == '__main__':
+    main()
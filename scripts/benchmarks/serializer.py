@@ -0,0 +1,69 @@
+"""
+Rows per second through ExpenseSerializer versus ExpenseValuesSerializer.
+
+Each pass reads --rows expenses and serializes them, once from model
+instances with ExpenseSerializer(many=True) and once from values_list()
+rows with ExpenseValuesSerializer. Reported both with the fetch, since
+skipping model instances is part of the saving, and for serialization
+alone over rows fetched beforehand. Both outputs must render to the same
+JSON bytes.
+
+    python -m scripts.benchmarks.serializer --rows 50000
+"""
+import argparse
+import time
+
+from scripts.benchmarks import harness
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.serializers import ExpenseSerializer, ExpenseValuesSerializer  # noqa: E402
+
+values_serializer = ExpenseValuesSerializer()
+MODES = {
+    'model_serializer': (
+        lambda queryset: queryset.all(),
+        lambda rows: ExpenseSerializer(rows, many=True).data,
+    ),
+    'values_serializer': (
+        values_serializer.values,
+        values_serializer.to_representation,
+    ),
+}
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        harness.add_expenses(user, args.rows)
+        queryset = Expense.objects.filter(user=user).order_by('-expense_date', 'id')
+
+        rendered = {name: JSONRenderer().render(serialize(fetch(queryset))) for name, (fetch, serialize) in MODES.items()}
+        assert rendered['model_serializer'] == rendered['values_serializer'], 'JSON output differs'
+        for name, (fetch, serialize) in MODES.items():
+            with_fetch = best_of(lambda: serialize(fetch(queryset)), args.repeat)
+            rows = list(fetch(queryset))
+            alone = best_of(lambda: serialize(rows), args.repeat)
+            harness.emit(
+                'serializer', mode=name, rows=args.rows, identical_json=True,
+                rows_per_second=round(args.rows / with_fetch), serialize_only_rows_per_second=round(args.rows / alone),
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Repeatable benchmark suite over a synthetic dataset.
+
+Generates --users users with --expenses-per-user expenses each (see
+scripts/synthetic.py), then times a fixed set of API requests as the
+first user. The user's response cache is invalidated before every
+request, so cached endpoints are measured computing their response.
+Each scenario prints one JSON line. --output writes all results with
+the run's metadata to a JSON file; --baseline compares against such a
+file and exits with status 1 when a scenario's p50 got slower by more
+than --tolerance.
+
+    python -m scripts.benchmarks.suite --users 10 --expenses-per-user 100000 --output suite.json
+    python -m scripts.benchmarks.suite --users 10 --expenses-per-user 100000 --baseline suite.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+from scripts.benchmarks import harness
+
+import django  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.common.cache import invalidate_user  # noqa: E402
+from scripts import synthetic  # noqa: E402
+
+
+def scenarios(today):
+    year_ago = (today - timedelta(days=365)).isoformat()
+    return [
+        ('list', 'expense-list', {'limit': 50}),
+        ('list_offset_10k', 'expense-list', {'limit': 50, 'offset': 10000}),
+        ('list_keyset', 'expense-list', {'pagination': 'cursor', 'limit': 50}),
+        ('filter_category', 'expense-list', {'category': 'food', 'limit': 50}),
+        ('filter_date_amount', 'expense-list', {'from_date': year_ago, 'min_amount': 50, 'limit': 50}),
+        ('search', 'expense-list', {'search': 'coffee', 'limit': 50}),
+        ('summary', 'expense-summary', {}),
+        ('timeseries_month', 'expense-timeseries', {'bucket': 'month'}),
+        ('budgets', 'budget-list', {}),
+        ('export', 'expense-export', {'from_date': year_ago}),
+    ]
+
+
+def fetch(client, url, params):
+    response = client.get(url, params)
+    assert response.status_code == 200, (url, response.status_code)
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def run_scenario(client, user_id, url, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        invalidate_user(user_id, 'expenses', 'budgets')
+        start = time.perf_counter()
+        size = fetch(client, url, params)
+        timings.append((time.perf_counter() - start) * 1000)
+    invalidate_user(user_id, 'expenses', 'budgets')
+    with CaptureQueriesContext(connection) as queries:
+        fetch(client, url, params)
+    timings.sort()
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[max(0, int(len(timings) * 0.95) - 1)], 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'queries': len(queries.captured_queries),
+        'bytes': size,
+    }
+
+
+def metadata(args, counts, seconds):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'dataset': {**counts, 'seed': args.seed, 'category_skew': args.category_skew, 'currencies': args.currencies},
+        'generate_seconds': round(seconds, 1),
+        'repeat': args.repeat,
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as baseline_file:
+        baseline = {row['scenario']: row for row in json.load(baseline_file)['results']}
+    regressions = []
+    for row in results:
+        before = baseline.get(row['scenario'])
+        if not before or not before['p50_ms']:
+            continue
+        change = row['p50_ms'] / before['p50_ms'] - 1
+        harness.emit(
+            'suite_compare', scenario=row['scenario'], baseline_p50_ms=before['p50_ms'], p50_ms=row['p50_ms'],
+            change=f'{change:+.1%}', queries_before=before['queries'], queries=row['queries'],
+        )
+        if change > tolerance:
+            regressions.append(row['scenario'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--expenses-per-user', type=int, default=20000)
+    parser.add_argument('--category-skew', type=float, default=1.0)
+    parser.add_argument('--currencies', default='USD:80,EUR:15,GBP:5')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', help='Comma-separated scenario names.')
+    parser.add_argument('--output', help='Write results and run metadata to this JSON file.')
+    parser.add_argument('--baseline', help='Compare with a JSON file written by --output.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p50 slowdown, as a fraction.')
+    args = parser.parse_args()
+
+    with harness.test_database():
+        with harness.timer() as generating:
+            counts = synthetic.generate(
+                users=args.users, expenses_per_user=args.expenses_per_user, category_skew=args.category_skew,
+                currencies=synthetic.parse_mix(args.currencies), seed=args.seed,
+            )
+        connection.cursor().execute('ANALYZE')
+        harness.emit('suite_dataset', **counts, seconds=round(generating['seconds'], 1))
+
+        user = synthetic.make_users(1, synthetic.EMAIL_PATTERN)[0]
+        client = APIClient()
+        client.force_authenticate(user=user)
+        wanted = set(args.only.split(',')) if args.only else None
+        results = []
+        for name, route, params in scenarios(date.today()):
+            if wanted and name not in wanted:
+                continue
+            row = {'scenario': name, **run_scenario(client, user.pk, reverse(route), params, args.repeat)}
+            harness.emit('suite', **row)
+            results.append(row)
+        run = metadata(args, counts, generating['seconds'])
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'run': run, 'results': results}, output, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"p50 regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
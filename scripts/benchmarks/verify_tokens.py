@@ -0,0 +1,110 @@
+"""
+Email verification token lookup with and without the token_hash index.
+
+Inserts --rows tokens (a tenth of them expired), times verify_token()
+for random existing tokens, drops the unique index on token_hash and
+times it again, then times purge_verification_tokens.
+
+    python -m scripts.benchmarks.verify_tokens --rows 10000000
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import uuid
+from datetime import timedelta
+
+from scripts.benchmarks import harness
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.users.models import EmailVerificationToken  # noqa: E402
+from apps.users.tokens import purge_tokens, verify_token  # noqa: E402
+
+
+def raw_token(i):
+    return f'benchmark-token-{i}'
+
+
+def load(user, rows, batch_size=50_000):
+    """
+    Insert tokens with COPY on PostgreSQL and executemany elsewhere; the
+    ORM's per-object overhead dominates at this size.
+    """
+    meta = EmailVerificationToken._meta
+    columns = ['id', 'user_id', 'token_hash', 'expires_at', 'created_at']
+    prep = {name: meta.get_field(name.removesuffix('_id')).get_db_prep_value for name in columns}
+    now = timezone.now()
+    user_id = prep['user_id'](user.pk, connection)
+    live = prep['expires_at'](now + timedelta(hours=24), connection)
+    expired = prep['expires_at'](now - timedelta(hours=1), connection)
+    created = prep['created_at'](now, connection)
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        connection.ops.quote_name(meta.db_table), ', '.join(columns), ', '.join(['%s'] * len(columns)),
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, rows, batch_size):
+            batch = [
+                (
+                    prep['id'](uuid.uuid4(), connection), user_id,
+                    hashlib.sha256(raw_token(i).encode()).hexdigest(),
+                    expired if i % 10 == 0 else live, created,
+                )
+                for i in range(start, min(start + batch_size, rows))
+            ]
+            with transaction.atomic():
+                if connection.vendor == 'postgresql':
+                    copy_sql = 'COPY {} ({}) FROM STDIN'.format(connection.ops.quote_name(meta.db_table), ', '.join(columns))
+                    with cursor.cursor.copy(copy_sql) as copy:
+                        for row in batch:
+                            copy.write_row(row)
+                else:
+                    cursor.executemany(sql, batch)
+
+
+def time_lookups(rows, lookups):
+    rng = random.Random(1)
+    timings = []
+    for _ in range(lookups):
+        i = rng.randrange(rows)
+        with harness.timer() as elapsed:
+            token = verify_token(raw_token(i))
+        assert (token is None) == (i % 10 == 0)
+        timings.append(elapsed['seconds'] * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--lookups', type=int, default=200)
+    parser.add_argument('--scan-lookups', type=int, default=5)
+    args = parser.parse_args()
+
+    with harness.test_database():
+        user = harness.make_user()
+        with harness.timer() as loading:
+            load(user, args.rows)
+        harness.emit('verify_tokens_load', rows=args.rows, seconds=round(loading['seconds'], 1))
+
+        p50, worst = time_lookups(args.rows, args.lookups)
+        harness.emit('verify_tokens', rows=args.rows, index=True, p50_ms=round(p50, 3), max_ms=round(worst, 3))
+
+        field = EmailVerificationToken._meta.get_field('token_hash')
+        unindexed = field.clone()
+        unindexed.set_attributes_from_name('token_hash')
+        unindexed.model = EmailVerificationToken
+        unindexed._unique = False
+        with connection.schema_editor() as editor:
+            editor.alter_field(EmailVerificationToken, field, unindexed)
+        p50, worst = time_lookups(args.rows, args.scan_lookups)
+        harness.emit('verify_tokens', rows=args.rows, index=False, p50_ms=round(p50, 3), max_ms=round(worst, 3))
+
+        with harness.timer() as purging:
+            deleted = purge_tokens()
+        harness.emit('purge_tokens', rows=args.rows, deleted=deleted, seconds=round(purging['seconds'], 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,51 @@
+"""
+Seed the database with the demo user and, optionally, synthetic data.
+
+    python scripts/seed.py
+    python scripts/seed.py --users 100 --expenses-per-user 100000 --category-skew 1.2 \
+        --days 1095 --currencies USD:70,EUR:20,GBP:10
+
+Synthetic users are user0@example.com, user1@example.com, ... with the
+password "password123". See scripts/synthetic.py for how rows are made.
+"""
+import argparse
 import os
 import sys
+import time
+
 import django
-import random
-from datetime import timedelta
-from django.utils import timezone
-from decimal import Decimal
 
 # Setup Django environment
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.base")
 django.setup()
 
-from django.contrib.auth import get_user_model
-from apps.expenses.models import Expense
+from django.contrib.auth import get_user_model  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from scripts import synthetic  # noqa: E402
 
 User = get_user_model()
 
-def run_seed():
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Seed the demo user and optional synthetic data.")
+    parser.add_argument('--users', type=int, default=0, help='Synthetic users to create (default: none).')
+    parser.add_argument('--expenses-per-user', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=730, help='Spread expense dates over this many past days.')
+    parser.add_argument('--category-skew', type=float, default=1.0, help='Zipf exponent; 0 spreads categories evenly.')
+    parser.add_argument('--categories', type=int, default=len(synthetic.CATEGORIES))
+    parser.add_argument('--currencies', default='USD:1', help='Currency mix, e.g. USD:70,EUR:20,GBP:10.')
+    parser.add_argument('--budgets-per-user', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-search-index', action='store_true', help='Leave the search token index unbuilt.')
+    return parser
+
+
+def run_seed(argv=None):
+    args = build_parser().parse_args(argv)
     print("Seeding data...")
-    
+
     # Create Demo User
     email = "demo@example.com"
     if not User.objects.filter(email=email).exists():
@@ -34,32 +61,35 @@ def run_seed():
         user = User.objects.get(email=email)
         print(f"User {email} already exists")
 
-    # Create Expenses
-    categories = ['Food', 'Transport', 'Utilities', 'Entertainment', 'Health']
-    
-    # Clear existing expenses for demo user to avoid duplicates on re-run
-    # Expense.objects.filter(user=user).delete() 
-    
     if Expense.objects.filter(user=user).count() < 5:
         print("Creating expenses...")
-        for i in range(20):
-            date = timezone.now().date() - timedelta(days=random.randint(0, 30))
-            category = random.choice(categories)
-            amount = Decimal(random.randint(10, 200)) + Decimal(random.randint(0, 99)) / 100
-            
-            Expense.objects.create(
-                user=user,
-                title=f"{category} expense {i+1}",
-                amount=amount,
-                currency="USD",
-                category=category,
-                expense_date=date,
-                notes=f"Notes for expense {i+1}"
-            )
+        synthetic.generate(
+            users=1, email_pattern=email, expenses_per_user=20, days=31, category_count=5,
+            category_skew=0, budgets_per_user=0, seed=args.seed,
+        )
         print("Created 20 expenses")
     else:
         print("Expenses already exist")
 
+    if args.users:
+        start = time.perf_counter()
+        counts = synthetic.generate(
+            users=args.users,
+            expenses_per_user=args.expenses_per_user,
+            days=args.days,
+            category_skew=args.category_skew,
+            category_count=args.categories,
+            currencies=synthetic.parse_mix(args.currencies),
+            budgets_per_user=args.budgets_per_user,
+            batch_size=args.batch_size,
+            seed=args.seed,
+            search_index=not args.skip_search_index,
+            log=print,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"Created {counts['expenses']} expenses for {counts['users']} users in {elapsed:.1f}s "
+              f"({counts['expenses'] / elapsed:,.0f} rows/s)")
+
     print("Seeding complete.")
 
 if __name__ == "__main__":
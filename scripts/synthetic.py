@@ -0,0 +1,171 @@
+"""
+Synthetic users, expenses and budgets for seeding and benchmarks.
+
+Expenses are built in memory and written in batches, with COPY on
+PostgreSQL and bulk_create elsewhere; categories and base-currency
+amounts are filled in the same way the write paths do. Rollups, budget
+spend and, unless skipped, the search token index are then rebuilt once
+for the generated users, instead of being maintained row by row. Row contents (not ids) are deterministic
+for a given seed.
+
+Needs configured Django settings; see scripts/seed.py for the command
+line.
+"""
+import random
+import uuid
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.budgets.models import Budget
+from apps.common.cache import invalidate_user
+from apps.currencies.rates import rate_for
+from apps.expenses import categories, rollups, search
+from apps.expenses.models import Expense
+
+CATEGORIES = [
+    'Food', 'Transport', 'Utilities', 'Entertainment', 'Health', 'Rent',
+    'Shopping', 'Travel', 'Education', 'Insurance', 'Gifts', 'Subscriptions',
+]
+WORDS = [
+    'coffee', 'lunch', 'dinner', 'taxi', 'train', 'groceries', 'market', 'electricity', 'water', 'internet',
+    'phone', 'gym', 'cinema', 'books', 'pharmacy', 'doctor', 'flight', 'hotel', 'fuel', 'parking',
+]
+NOTES = ['', '', '', 'paid by card', 'split with friends', 'reimbursable', 'monthly']
+CENT = Decimal('0.01')
+EMAIL_PATTERN = 'user{n}@example.com'
+
+
+def parse_mix(text):
+    """Parse "USD:70,EUR:20,GBP:10" into [('USD', 70.0), ('EUR', 20.0), ('GBP', 10.0)]."""
+    mix = []
+    for part in text.split(','):
+        code, _, weight = part.partition(':')
+        mix.append((code.strip().upper(), float(weight or 1)))
+    return mix
+
+
+def category_weights(count, skew):
+    """Zipf-like weights: with skew s the k-th category is 1/k^s as frequent as the first (0: uniform)."""
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def make_users(count, email_pattern, password='password123'):
+    """Return `count` users, creating the missing ones with one bulk insert and a single password hash."""
+    User = get_user_model()
+    emails = [email_pattern.format(n=n) for n in range(count)]
+    existing = {user.email: user for user in User.objects.filter(email__in=emails)}
+    encoded = make_password(password)
+    missing = [
+        User(email=email, password=encoded, is_email_verified=True)
+        for email in emails if email not in existing
+    ]
+    User.objects.bulk_create(missing, batch_size=1000)
+    existing.update((user.email, user) for user in User.objects.filter(email__in=[u.email for u in missing]))
+    return [existing[email] for email in emails]
+
+
+def write_expenses(rows):
+    """
+    Insert expenses given as dicts of field attnames to values: with COPY
+    on PostgreSQL, skipping model instances altogether, and bulk_create
+    elsewhere. COPY is several times faster than a multi-row INSERT.
+    """
+    if connection.vendor != 'postgresql':
+        Expense.objects.bulk_create([Expense(**row) for row in rows])
+        return
+    fields = Expense._meta.concrete_fields
+    now = timezone.now()
+    defaults = {'fingerprint': None, 'created_at': now, 'updated_at': now}
+    sql = 'COPY {} ({}) FROM STDIN'.format(
+        connection.ops.quote_name(Expense._meta.db_table),
+        ', '.join(connection.ops.quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor, cursor.cursor.copy(sql) as copy:
+        for row in rows:
+            row = {**defaults, **row}
+            copy.write_row([row[field.attname] for field in fields])
+
+
+def generate(
+    users=1, expenses_per_user=1000, days=730, category_skew=1.0, currencies=(('USD', 1),),
+    category_count=len(CATEGORIES), budgets_per_user=3, batch_size=10000, seed=0,
+    email_pattern=EMAIL_PATTERN, search_index=True, log=None,
+):
+    """
+    Create `users` users with `expenses_per_user` expenses each, spread
+    uniformly over the last `days` days, plus budgets for each user's
+    `budgets_per_user` most frequent categories. Returns row counts.
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    names = CATEGORIES[:category_count]
+    weights = category_weights(len(names), category_skew)
+    codes, currency_weights = zip(*currencies)
+    log = log or (lambda message: None)
+
+    people = make_users(users, email_pattern)
+    user_ids = [user.pk for user in people]
+    # Weights are decreasing, so the first categories are each user's most frequent
+    budget_names = names[:budgets_per_user]
+    budgets = []
+    written = 0
+    # rate_for() does not cache misses, so remember every (currency, day) here
+    known_rates = {}
+    for user in people:
+        resolved = categories.resolve(user.pk, names)
+        refs = {name: resolved[categories.normalize(name)] for name in names}
+        budgets.extend(
+            Budget(
+                user_id=user.pk, category=name, category_ref=refs[name],
+                amount=Decimal(200 + 100 * rank), currency=codes[0],
+            )
+            for rank, name in enumerate(budget_names)
+        )
+        pending = expenses_per_user
+        while pending:
+            size = min(batch_size, pending)
+            picked = rng.choices(names, weights, k=size)
+            picked_currencies = rng.choices(codes, currency_weights, k=size)
+            batch = []
+            for name, currency in zip(picked, picked_currencies):
+                category = refs[name]
+                day = today - timedelta(days=rng.randrange(days))
+                amount = Decimal(rng.lognormvariate(3, 1)).quantize(CENT) + CENT
+                if (currency, day) not in known_rates:
+                    known_rates[currency, day] = rate_for(currency, day)
+                rate = known_rates[currency, day]
+                batch.append({
+                    'id': uuid.uuid4(),
+                    'user_id': user.pk,
+                    'title': f"{name} {rng.choice(WORDS)}",
+                    'amount': amount,
+                    'currency': currency,
+                    'amount_base': None if rate is None else (amount * rate).quantize(CENT, rounding=ROUND_HALF_UP),
+                    'category': category.name,
+                    'category_ref_id': category.pk,
+                    'expense_date': day,
+                    'notes': rng.choice(NOTES),
+                })
+            with transaction.atomic():
+                write_expenses(batch)
+            pending -= size
+            written += size
+        log(f"{user.email}: {expenses_per_user} expenses")
+
+    # Budgets already present (a re-run) are kept
+    Budget.objects.bulk_create(budgets, ignore_conflicts=True)
+
+    log("Rebuilding rollups and budget spend")
+    rollup_rows = rollups.rebuild(user_ids)
+    tokens = 0
+    if search_index:
+        log("Rebuilding the search index")
+        tokens = search.rebuild(user_ids)
+    for user_id in user_ids:
+        invalidate_user(user_id, 'expenses', 'budgets')
+    return {'users': len(people), 'expenses': written, 'budgets': len(budgets), 'rollups': rollup_rows, 'search_tokens': tokens}